@@ -0,0 +1,71 @@
+import { describe, it, expect, beforeAll, afterEach } from 'vitest';
+import Ajv2020 from 'ajv/dist/2020.js';
+import ajvFormats from 'ajv-formats';
+import { mkdtemp, readdir, readFile, rm } from 'fs/promises';
+import { tmpdir } from 'os';
+import { dirname, join, relative } from 'path';
+import { fileURLToPath } from 'url';
+import { readTemplates, syntheticVersions, writeSyntheticCatalog } from './catalog.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const SERVERS_DIR = join(__dirname, '..', 'servers');
+const BUNDLED_SCHEMA = join(__dirname, '..', 'schemas', '2025-12-11', 'nimbletools-server.bundled.schema.json');
+
+/**
+ * Every file under a directory, keyed by relative path
+ */
+async function readTree(root: string): Promise<Map<string, string>> {
+  const files = new Map<string, string>();
+  for (const entry of await readdir(root, { recursive: true, withFileTypes: true })) {
+    if (entry.isFile()) {
+      const path = join(entry.parentPath, entry.name);
+      files.set(relative(root, path), await readFile(path, 'utf-8'));
+    }
+  }
+  return files;
+}
+
+describe('Synthetic catalog', () => {
+  let templates: Awaited<ReturnType<typeof readTemplates>>;
+  const directories: string[] = [];
+
+  beforeAll(async () => {
+    templates = await readTemplates(SERVERS_DIR);
+  });
+
+  afterEach(async () => {
+    await Promise.all(directories.splice(0).map(directory => rm(directory, { recursive: true, force: true })));
+  });
+
+  async function generate(seed: number): Promise<Map<string, string>> {
+    const directory = await mkdtemp(join(tmpdir(), 'synthetic-catalog-'));
+    directories.push(directory);
+    await writeSyntheticCatalog(directory, templates, { count: 25, seed });
+    return readTree(directory);
+  }
+
+  it('should validate against the bundled server schema', async () => {
+    // Same validator setup as scripts/compile-catalog.ts
+    const ajv = new Ajv2020({ allErrors: true, strict: false });
+    ajvFormats(ajv);
+    const validate = ajv.compile(JSON.parse(await readFile(BUNDLED_SCHEMA, 'utf-8')));
+
+    const files = await generate(1);
+    expect(files.size).toBeGreaterThan(25);
+
+    const failures = Array.from(files)
+      .filter(([, content]) => !validate(JSON.parse(content)))
+      .map(([path]) => `${path}: ${JSON.stringify(validate.errors)}`);
+    expect(failures).toEqual([]);
+  });
+
+  it('should produce the same catalog for the same seed', async () => {
+    const first = await generate(42);
+    const second = await generate(42);
+
+    expect(Object.fromEntries(second)).toEqual(Object.fromEntries(first));
+    expect(syntheticVersions(templates, 3, { seed: 43 })).not.toEqual(syntheticVersions(templates, 3, { seed: 42 }));
+  });
+});
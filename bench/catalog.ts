@@ -0,0 +1,229 @@
+/**
+ * Synthetic catalogs for scale and load testing
+ *
+ * Every generated server starts from one of the real definitions in
+ * servers/ (so icons, repository and runtime metadata look like the real
+ * thing) and then varies what drives cost in the API: package count and
+ * registry types (multi-platform mcpb bundles, oci images, npm packages,
+ * remote-only servers), environment variable lists, category, status,
+ * tags and capabilities, and a history of older versions under
+ * versions/. Choices come from a seeded generator, so the same seed and
+ * count always produce the same catalog. Definitions validate against
+ * the bundled server schema.
+ */
+
+import { createHash } from 'crypto';
+import { mkdir, readFile, writeFile } from 'fs/promises';
+import { join } from 'path';
+import { listServerDirectories, SERVER_FILE, VERSIONS_DIR } from '../src/catalog/loader.js';
+
+type Definition = Record<string, any>;
+
+export interface SyntheticCatalogOptions {
+  /** Number of servers */
+  count: number;
+  /** Same seed, same catalog (default 1) */
+  seed?: number;
+  /** Most older versions any one server has under versions/ (default 8) */
+  maxHistory?: number;
+}
+
+// Words used for descriptions and tags
+export const VOCABULARY = [
+  'database', 'search', 'email', 'weather', 'finance', 'calendar',
+  'storage', 'analytics', 'translation', 'monitoring', 'payments', 'maps',
+  'crm', 'documents', 'images', 'news', 'security', 'social',
+  'testing', 'scraping', 'vector', 'messaging', 'devops', 'spreadsheets'
+];
+
+const CATEGORIES = [
+  'ai-ml', 'data-intelligence', 'communication-collaboration',
+  'business-finance', 'developer-tools', 'infrastructure-data'
+];
+
+const PLATFORMS = ['linux-amd64', 'linux-arm64', 'darwin-arm64', 'windows-amd64'];
+
+/**
+ * Name of the i-th synthetic server
+ */
+export function syntheticName(i: number): string {
+  return `ai.nimbletools/synthetic-${String(i).padStart(5, '0')}`;
+}
+
+/**
+ * mulberry32: small, fast and good enough to spread choices evenly
+ */
+function random(seed: number) {
+  let state = seed >>> 0;
+  const next = () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+  return {
+    next,
+    /** Integer in [min, max] */
+    int: (min: number, max: number) => min + Math.floor(next() * (max - min + 1)),
+    pick: <T>(items: readonly T[]): T => items[Math.floor(next() * items.length)],
+    /** `count` distinct items */
+    sample: <T>(items: readonly T[], count: number): T[] => {
+      const pool = items.slice();
+      for (let i = pool.length - 1; i > 0; i--) {
+        const j = Math.floor(next() * (i + 1));
+        [pool[i], pool[j]] = [pool[j], pool[i]];
+      }
+      return pool.slice(0, count);
+    }
+  };
+}
+
+type Random = ReturnType<typeof random>;
+
+/**
+ * The current server.json of every server directory
+ */
+export async function readTemplates(serversDir: string): Promise<Definition[]> {
+  const templates: Definition[] = [];
+  for (const directory of await listServerDirectories(serversDir)) {
+    try {
+      templates.push(JSON.parse(await readFile(join(serversDir, directory, SERVER_FILE), 'utf-8')));
+    } catch {
+      // Not a server directory
+    }
+  }
+  if (templates.length === 0) {
+    throw new Error(`No server definitions found in ${serversDir}`);
+  }
+  return templates;
+}
+
+function environmentVariables(rng: Random, slug: string) {
+  const prefix = slug.toUpperCase().replace(/-/g, '_');
+  return Array.from({ length: rng.int(0, 12) }, (_, i) => {
+    const secret = rng.next() < 0.4;
+    return {
+      name: `${prefix}_${secret ? 'API_KEY' : 'OPTION'}_${i}`,
+      description: `${secret ? 'API key' : 'Setting'} ${i} for ${slug}`,
+      isRequired: rng.next() < 0.3,
+      isSecret: secret
+    };
+  });
+}
+
+/**
+ * How a server is distributed, fixed across its versions: per-platform
+ * mcpb bundles, an oci image, an npm package, or nothing for remote-only
+ * servers. Returns the packages of a given version.
+ */
+function distribution(rng: Random, slug: string, transport: Definition): (version: string) => Definition[] {
+  const env = environmentVariables(rng, slug);
+  const roll = rng.next();
+
+  if (roll < 0.55) {
+    const platforms = rng.sample(PLATFORMS, rng.int(1, PLATFORMS.length));
+    return version => platforms.map(platform => ({
+      registryType: 'mcpb',
+      identifier: `https://github.com/NimbleBrainInc/mcp-${slug}/releases/download/v${version}/mcp-${slug}-v${version}-${platform}.mcpb`,
+      version,
+      fileSha256: createHash('sha256').update(`${slug}@${version}/${platform}`).digest('hex'),
+      transport,
+      environmentVariables: env
+    }));
+  }
+  if (roll < 0.8) {
+    return version => [{
+      registryType: 'oci',
+      identifier: `docker.io/nimbletools/${slug}:${version}`,
+      version,
+      transport: { type: 'stdio' },
+      environmentVariables: env
+    }];
+  }
+  if (roll < 0.95) {
+    return version => [{
+      registryType: 'npm',
+      identifier: `@nimbletools/mcp-${slug}`,
+      version,
+      transport: { type: 'stdio' },
+      environmentVariables: env
+    }];
+  }
+  return () => [];
+}
+
+/**
+ * Versions of one server, oldest first, e.g. 0.1.0, 0.1.1, 0.2.0
+ */
+function versionHistory(rng: Random, maxHistory: number): string[] {
+  // Most servers have a short history, a few have a long one
+  const count = 1 + Math.min(maxHistory, Math.floor(maxHistory * rng.next() ** 3));
+  let [major, minor, patch] = [rng.int(0, 1), rng.int(0, 3), 0];
+  const versions: string[] = [];
+  for (let i = 0; i < count; i++) {
+    versions.push(`${major}.${minor}.${patch}`);
+    const bump = rng.next();
+    if (bump < 0.6) patch++;
+    else if (bump < 0.95) [minor, patch] = [minor + 1, 0];
+    else [major, minor, patch] = [major + 1, 0, 0];
+  }
+  return versions;
+}
+
+/**
+ * Every version of the i-th synthetic server, oldest first
+ */
+export function syntheticVersions(templates: Definition[], i: number, options: Omit<SyntheticCatalogOptions, 'count'> = {}): Definition[] {
+  const rng = random(Math.imul(options.seed ?? 1, 0x9e3779b1) ^ i);
+  const template = templates[i % templates.length];
+  const name = syntheticName(i);
+  const slug = name.split('/')[1];
+  const words = rng.sample(VOCABULARY, rng.int(1, 5));
+  const category = rng.pick(CATEGORIES);
+  const status = rng.next() < 0.8 ? 'active' : rng.pick(['beta', 'deprecated', 'archived']);
+  const capabilities = { tools: true, resources: rng.next() < 0.4, prompts: rng.next() < 0.2 };
+  const packages = distribution(rng, slug, template.packages?.[0]?.transport ?? { type: 'stdio' });
+
+  return versionHistory(rng, options.maxHistory ?? 8).map(version => {
+    const server: Definition = structuredClone(template);
+    server.name = name;
+    server.version = version;
+    server.title = `Synthetic ${i}`;
+    // The schema caps descriptions at 100 characters
+    server.description = `${words.join(', ')}: ${template.description}`.slice(0, 100).trimEnd();
+    server.repository = { url: `https://github.com/NimbleBrainInc/mcp-${slug}`, source: 'github' };
+    server.packages = packages(version);
+    if (server.packages.length === 0) {
+      server.remotes = [{ type: 'streamable-http', url: `https://${slug}.example.com/mcp` }];
+    }
+
+    const meta = (server._meta ??= {})['ai.nimbletools.mcp/v1'] ??= {};
+    meta.runtime ??= 'python:3.13';
+    meta.status = status;
+    meta.capabilities = capabilities;
+    meta.display = { ...meta.display, category, tags: words };
+    return server;
+  });
+}
+
+/**
+ * Write a synthetic catalog under `serversDir`: one directory per server
+ * with the latest version in server.json and older ones in versions/
+ */
+export async function writeSyntheticCatalog(serversDir: string, templates: Definition[], options: SyntheticCatalogOptions): Promise<void> {
+  for (let i = 0; i < options.count; i++) {
+    const versions = syntheticVersions(templates, i, options);
+    const directory = join(serversDir, syntheticName(i).split('/')[1]);
+    const latest = versions.pop()!;
+
+    await mkdir(directory, { recursive: true });
+    await writeFile(join(directory, SERVER_FILE), JSON.stringify(latest, null, 2));
+    if (versions.length > 0) {
+      await mkdir(join(directory, VERSIONS_DIR), { recursive: true });
+      for (const server of versions) {
+        await writeFile(join(directory, VERSIONS_DIR, `${server.version}.json`), JSON.stringify(server, null, 2));
+      }
+    }
+  }
+}
@@ -0,0 +1,99 @@
+/**
+ * Minimal keep-alive HTTP load generator
+ *
+ * Keeps a fixed number of connections busy with back-to-back requests for
+ * a fixed duration (closed-loop, like autocannon) and records the latency
+ * of every response.
+ */
+
+import { Agent, request } from 'http';
+
+export interface LoadOptions {
+  /** Full URL to request */
+  url: string;
+  /** Concurrent keep-alive connections */
+  connections: number;
+  durationMs: number;
+  headers?: Record<string, string>;
+}
+
+export interface LoadResult {
+  requests: number;
+  /** Non-2xx/304 responses and connection errors */
+  errors: number;
+  requestsPerSecond: number;
+  latencyMs: { p50: number; p99: number; max: number; mean: number };
+  /** Average response body size */
+  bytesPerResponse: number;
+}
+
+function percentile(sorted: Float64Array, p: number): number {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+}
+
+const round = (value: number) => Math.round(value * 1000) / 1000;
+
+/**
+ * Issue one request; resolves with the status and body size
+ */
+function send(agent: Agent, url: URL, headers: Record<string, string>): Promise<{ status: number; bytes: number }> {
+  return new Promise((resolve, reject) => {
+    const req = request(url, { agent, headers }, (res) => {
+      let bytes = 0;
+      res.on('data', (chunk: Buffer) => {
+        bytes += chunk.length;
+      });
+      res.on('end', () => resolve({ status: res.statusCode ?? 0, bytes }));
+      res.on('error', reject);
+    });
+    req.on('error', reject);
+    req.end();
+  });
+}
+
+export async function runLoad(options: LoadOptions): Promise<LoadResult> {
+  const url = new URL(options.url);
+  const headers = options.headers ?? {};
+  const agent = new Agent({ keepAlive: true, maxSockets: options.connections });
+  const latencies: number[] = [];
+  let errors = 0;
+  let bytes = 0;
+
+  const start = performance.now();
+  const deadline = start + options.durationMs;
+
+  const connection = async () => {
+    while (performance.now() < deadline) {
+      const sent = performance.now();
+      try {
+        const response = await send(agent, url, headers);
+        latencies.push(performance.now() - sent);
+        bytes += response.bytes;
+        if (response.status >= 400) errors++;
+      } catch {
+        errors++;
+      }
+    }
+  };
+
+  await Promise.all(Array.from({ length: options.connections }, connection));
+  const elapsed = performance.now() - start;
+  agent.destroy();
+
+  const sorted = Float64Array.from(latencies).sort();
+  const total = latencies.reduce((sum, latency) => sum + latency, 0);
+
+  return {
+    requests: latencies.length,
+    errors,
+    requestsPerSecond: Math.round(latencies.length / (elapsed / 1000)),
+    latencyMs: {
+      p50: round(percentile(sorted, 50)),
+      p99: round(percentile(sorted, 99)),
+      max: round(sorted.length > 0 ? sorted[sorted.length - 1] : 0),
+      mean: round(latencies.length > 0 ? total / latencies.length : 0)
+    },
+    bytesPerResponse: latencies.length > 0 ? Math.round(bytes / latencies.length) : 0
+  };
+}
@@ -0,0 +1,189 @@
+#!/usr/bin/env tsx
+
+/**
+ * HTTP load benchmark for the registry API
+ *
+ * For each catalog size, generates a synthetic catalog (see
+ * bench/catalog.ts), starts the API on it in a child process (so load
+ * generation does not compete with it for the event loop) and measures
+ * throughput, latency and memory of the main read routes under keep-alive
+ * load. Progress goes to stderr; results are
+ * written to stdout as JSON so runs can be compared over time.
+ *
+ * Environment:
+ *   BENCH_SIZES        comma-separated catalog sizes (default 10,1000,10000)
+ *   BENCH_DURATION_MS  measured time per route (default 5000)
+ *   BENCH_WARMUP_MS    unmeasured time per route before measuring (default 1000)
+ *   BENCH_CONNECTIONS  concurrent keep-alive connections (default 32)
+ *   BENCH_ROUTES       comma-separated subset of route names to run
+ *   BENCH_OUTPUT       also write the results to this file
+ */
+
+import { fork, type ChildProcess } from 'child_process';
+import { mkdtemp, rm, writeFile } from 'fs/promises';
+import { cpus, tmpdir } from 'os';
+import { dirname, join } from 'path';
+import { fileURLToPath } from 'url';
+import { readTemplates, syntheticName, VOCABULARY, writeSyntheticCatalog } from './catalog.js';
+import { runLoad, type LoadResult } from './load.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const SERVERS_DIR = join(__dirname, '..', 'servers');
+const SERVER_ENTRY = join(__dirname, 'server.ts');
+
+const SIZES = (process.env.BENCH_SIZES || '10,1000,10000').split(',').map(size => parseInt(size, 10)).filter(size => size > 0);
+const DURATION_MS = parseInt(process.env.BENCH_DURATION_MS || '5000', 10);
+const WARMUP_MS = parseInt(process.env.BENCH_WARMUP_MS || '1000', 10);
+const CONNECTIONS = parseInt(process.env.BENCH_CONNECTIONS || '32', 10);
+const ROUTES = process.env.BENCH_ROUTES ? new Set(process.env.BENCH_ROUTES.split(',')) : null;
+
+interface Route {
+  name: string;
+  path: string;
+}
+
+interface RouteResult extends LoadResult {
+  name: string;
+  path: string;
+  /** Server process RSS after the route was measured */
+  rssBytes: number;
+}
+
+interface CatalogResult {
+  servers: number;
+  /** Time from process start of the API to listening, catalog load included */
+  startupMs: number;
+  /** Server process RSS after startup, before any request */
+  idleRssBytes: number;
+  routes: RouteResult[];
+}
+
+type ChildMessage =
+  | { type: 'ready'; port: number; startupMs: number }
+  | { type: 'memory'; rss: number; heapUsed: number };
+
+function log(message: string) {
+  process.stderr.write(`${message}\n`);
+}
+
+function nextMessage<T extends ChildMessage['type']>(child: ChildProcess, type: T): Promise<Extract<ChildMessage, { type: T }>> {
+  return new Promise((resolve, reject) => {
+    const onMessage = (message: ChildMessage) => {
+      if (message.type !== type) return;
+      child.off('message', onMessage);
+      child.off('exit', onExit);
+      resolve(message as Extract<ChildMessage, { type: T }>);
+    };
+    const onExit = (code: number | null) => {
+      child.off('message', onMessage);
+      reject(new Error(`Benchmark server exited with code ${code}`));
+    };
+    child.on('message', onMessage);
+    child.once('exit', onExit);
+  });
+}
+
+async function rss(child: ChildProcess): Promise<number> {
+  const reply = nextMessage(child, 'memory');
+  child.send({ type: 'memory' });
+  return (await reply).rss;
+}
+
+/**
+ * Routes to measure; paginated starts from the second page of a listing
+ */
+async function routes(base: string): Promise<Route[]> {
+  const firstPage = await (await fetch(`${base}/v0.1/servers?limit=20`)).json() as { metadata: { next_cursor?: string } };
+  const cursor = firstPage.metadata.next_cursor;
+
+  const all: Route[] = [
+    { name: 'list', path: '/v0.1/servers' },
+    { name: 'search', path: `/v0.1/servers?search=${VOCABULARY[0]}` },
+    { name: 'paginated', path: cursor ? `/v0.1/servers?limit=20&cursor=${encodeURIComponent(cursor)}` : '/v0.1/servers?limit=20' },
+    { name: 'get', path: `/v0.1/servers/${encodeURIComponent(syntheticName(1))}/versions/latest` },
+    { name: 'schema', path: '/schemas/2025-12-11/nimbletools-server.schema.json' },
+    { name: 'health', path: '/v0.1/health' }
+  ];
+  return ROUTES ? all.filter(route => ROUTES.has(route.name)) : all;
+}
+
+async function benchmarkCatalog(templates: Awaited<ReturnType<typeof readTemplates>>, size: number): Promise<CatalogResult> {
+  const serversDir = await mkdtemp(join(tmpdir(), 'registry-bench-'));
+  let child: ChildProcess | null = null;
+
+  try {
+    await writeSyntheticCatalog(serversDir, templates, { count: size });
+
+    child = fork(SERVER_ENTRY, [], {
+      env: {
+        ...process.env,
+        NODE_ENV: 'test',
+        SERVERS_DIR: serversDir,
+        CATALOG_WATCH: 'false',
+        CATALOG_REFRESH_INTERVAL_MS: '0',
+        SCHEMAS_WATCH: 'false'
+      }
+    });
+    const ready = await nextMessage(child, 'ready');
+    const base = `http://127.0.0.1:${ready.port}`;
+    const result: CatalogResult = { servers: size, startupMs: ready.startupMs, idleRssBytes: await rss(child), routes: [] };
+    log(`\n📊 ${size} servers (startup ${ready.startupMs} ms)`);
+
+    for (const route of await routes(base)) {
+      const url = `${base}${route.path}`;
+      await runLoad({ url, connections: CONNECTIONS, durationMs: WARMUP_MS });
+      const load = await runLoad({ url, connections: CONNECTIONS, durationMs: DURATION_MS });
+      const routeResult = { name: route.name, path: route.path, ...load, rssBytes: await rss(child) };
+      result.routes.push(routeResult);
+
+      log(`   ${route.name.padEnd(10)} ${String(load.requestsPerSecond).padStart(8)} req/s`
+        + `   p50 ${load.latencyMs.p50.toFixed(2).padStart(7)} ms   p99 ${load.latencyMs.p99.toFixed(2).padStart(7)} ms`
+        + `   ${(routeResult.rssBytes / 1024 / 1024).toFixed(0).padStart(5)} MiB`
+        + (load.errors > 0 ? `   ${load.errors} errors` : ''));
+    }
+
+    return result;
+  } finally {
+    if (child && child.exitCode === null) {
+      const exited = new Promise(resolve => child!.once('exit', resolve));
+      child.disconnect();
+      await exited;
+    }
+    await rm(serversDir, { recursive: true, force: true });
+  }
+}
+
+async function benchmark() {
+  const templates = await readTemplates(SERVERS_DIR);
+  const results: CatalogResult[] = [];
+
+  log(`🚀 Registry load benchmark: ${CONNECTIONS} connections, ${DURATION_MS} ms per route`);
+  for (const size of SIZES) {
+    results.push(await benchmarkCatalog(templates, size));
+  }
+
+  const report = {
+    generatedAt: new Date().toISOString(),
+    node: process.version,
+    platform: `${process.platform}-${process.arch}`,
+    cpus: cpus().length,
+    connections: CONNECTIONS,
+    durationMs: DURATION_MS,
+    warmupMs: WARMUP_MS,
+    results
+  };
+
+  const json = JSON.stringify(report, null, 2);
+  if (process.env.BENCH_OUTPUT) {
+    await writeFile(process.env.BENCH_OUTPUT, `${json}\n`);
+    log(`\n✅ Results written to ${process.env.BENCH_OUTPUT}`);
+  }
+  process.stdout.write(`${json}\n`);
+}
+
+benchmark().catch(error => {
+  console.error('❌ Benchmark failed:', error);
+  process.exit(1);
+});
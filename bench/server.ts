@@ -0,0 +1,38 @@
+/**
+ * Registry instance under benchmark, run as a child of bench/run.ts
+ *
+ * Serves the catalog in SERVERS_DIR on an ephemeral port, reports
+ * the port and startup time to the parent, and answers memory queries.
+ */
+
+import { createServer } from '../src/server-factory.js';
+
+type BenchMessage = { type: 'memory' };
+
+async function main() {
+  const started = performance.now();
+  const fastify = await createServer();
+  await fastify.listen({ port: 0, host: '127.0.0.1' });
+  const address = fastify.server.address();
+
+  process.on('message', (message: BenchMessage) => {
+    if (message.type === 'memory') {
+      const usage = process.memoryUsage();
+      process.send!({ type: 'memory', rss: usage.rss, heapUsed: usage.heapUsed });
+    }
+  });
+  process.on('disconnect', () => {
+    fastify.close().finally(() => process.exit(0));
+  });
+
+  process.send!({
+    type: 'ready',
+    port: typeof address === 'object' && address ? address.port : 0,
+    startupMs: Math.round(performance.now() - started)
+  });
+}
+
+main().catch(error => {
+  console.error('Benchmark server failed to start:', error);
+  process.exit(1);
+});
@@ -0,0 +1,87 @@
+#!/usr/bin/env tsx
+
+/**
+ * Benchmark list response serialization with and without a response schema
+ *
+ * Serves the full catalog list from two routes that differ only in whether
+ * a response schema is declared (compiled fast-json-stringify serializer vs
+ * JSON.stringify) and reports requests per second for each. The API itself
+ * serializes a list once per query per catalog snapshot, so this measures
+ * the cost of a response cache miss.
+ *
+ * Environment:
+ *   BENCH_DURATION_MS  time spent on each route (default 3000)
+ *   BENCH_COPIES       replicate the catalog to simulate a larger one (default 1)
+ */
+
+import Fastify from 'fastify';
+import { readFile } from 'fs/promises';
+import { dirname, join } from 'path';
+import { fileURLToPath } from 'url';
+import { readServersDir, type CatalogSource } from '../src/catalog/loader.js';
+import { listServers } from '../src/catalog/query.js';
+import { createSnapshot } from '../src/catalog/snapshot.js';
+import { serverDetailSchema, serverListResponseSchema } from '../src/http/response-schemas.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const SERVERS_DIR = process.env.SERVERS_DIR || join(__dirname, '..', 'servers');
+const BUNDLED_SCHEMA = join(__dirname, '..', 'schemas', '2025-12-11', 'nimbletools-server.bundled.schema.json');
+
+const DURATION_MS = parseInt(process.env.BENCH_DURATION_MS || '3000', 10);
+const COPIES = parseInt(process.env.BENCH_COPIES || '1', 10);
+
+function replicate(sources: CatalogSource[], copies: number): CatalogSource[] {
+  if (copies <= 1) return sources;
+  return Array.from({ length: copies }, (_, copy) => sources.map(source => ({
+    directory: `${source.directory}-${copy}`,
+    digest: `${source.digest}-${copy}`,
+    server: { ...source.server, name: `${source.server.name}-${copy}` },
+    history: source.history.map(server => ({ ...server, name: `${server.name}-${copy}` }))
+  }))).flat();
+}
+
+async function benchmark() {
+  const snapshot = createSnapshot(replicate(await readServersDir(SERVERS_DIR), COPIES));
+  const listSchema = serverListResponseSchema(serverDetailSchema(JSON.parse(await readFile(BUNDLED_SCHEMA, 'utf-8'))));
+  const query = { limit: '500' };
+
+  const fastify = Fastify({ logger: false });
+  fastify.get('/without-schema', async () => listServers(snapshot, query));
+  fastify.get('/with-schema', { schema: { response: { 200: listSchema } } }, async () => listServers(snapshot, query));
+  await fastify.ready();
+
+  const sample = await fastify.inject({ method: 'GET', url: '/with-schema' });
+  console.log(`📊 List serialization: ${snapshot.list.length} servers, ${sample.rawPayload.length} bytes per response\n`);
+
+  const results: Record<string, number> = {};
+  for (const url of ['/without-schema', '/with-schema']) {
+    // Warm up so both serializers are compiled and optimized
+    for (let i = 0; i < 50; i++) {
+      await fastify.inject({ method: 'GET', url });
+    }
+
+    let requests = 0;
+    const start = process.hrtime.bigint();
+    const deadline = start + BigInt(DURATION_MS) * 1_000_000n;
+    while (process.hrtime.bigint() < deadline) {
+      await fastify.inject({ method: 'GET', url });
+      requests++;
+    }
+    const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+
+    results[url] = requests / seconds;
+    console.log(`   ${url.padEnd(16)} ${results[url].toFixed(0).padStart(8)} req/s`);
+  }
+
+  const speedup = results['/with-schema'] / results['/without-schema'];
+  console.log(`\n   Response schema: ${speedup.toFixed(2)}x`);
+
+  await fastify.close();
+}
+
+benchmark().catch(error => {
+  console.error('❌ Benchmark failed:', error);
+  process.exit(1);
+});
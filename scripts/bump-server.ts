@@ -11,10 +11,11 @@
  * This will:
  *   1. Fetch the release from GitHub (e.g., NimbleBrainInc/mcp-ipinfo v1.0.2)
  *   2. Download SHA256 hashes from the release assets
- *   3. Update servers/<server-name>/server.json with new version and hashes
+ *   3. Keep the current definition as servers/<server-name>/versions/<old-version>.json
+ *   4. Update servers/<server-name>/server.json with new version and hashes
  */
 
-import { readFileSync, writeFileSync, existsSync } from "fs";
+import { readFileSync, writeFileSync, existsSync, mkdirSync } from "fs";
 import { join } from "path";
 
 interface ServerJson {
@@ -142,8 +143,17 @@ async function main() {
   const hashes = await fetchSha256FromRelease(release);
   console.log(`Found hashes for: ${Object.keys(hashes).join(", ")}`);
 
-  // Update server.json
+  // Keep the outgoing version so it can still be pinned or rolled back to
   const cleanVersion = version.replace(/^v/, "");
+  const versionsDir = join(serverDir, "versions");
+  const archivedPath = join(versionsDir, `${serverJson.version}.json`);
+  if (serverJson.version !== cleanVersion && !existsSync(archivedPath)) {
+    mkdirSync(versionsDir, { recursive: true });
+    writeFileSync(archivedPath, readFileSync(serverJsonPath));
+    console.log(`Archived ${serverJson.version} to ${archivedPath}`);
+  }
+
+  // Update server.json
   serverJson.version = cleanVersion;
 
   if (serverJson.packages && serverJson.packages.length > 0) {
@@ -0,0 +1,144 @@
+#!/usr/bin/env tsx
+
+/**
+ * Compile all server definitions into a single catalog artifact
+ *
+ * Validates every servers/<name>/server.json (and versions/*.json) against
+ * the bundled schema, normalizes them the same way the API does and writes
+ * dist/catalog.json.
+ * publishedAt/updatedAt come from git history (first and last commit
+ * touching the file), falling back to file mtime when git has no record.
+ * The API loads this file with a single read at startup instead of
+ * scanning servers/ (see src/catalog/artifact.ts).
+ */
+
+import Ajv2020 from 'ajv/dist/2020.js';
+import ajvFormats from 'ajv-formats';
+import { execFileSync } from 'child_process';
+import { mkdir, readFile, stat, writeFile } from 'fs/promises';
+import { dirname, join } from 'path';
+import { fileURLToPath } from 'url';
+import { buildCatalogArtifact } from '../src/catalog/artifact.js';
+import {
+  createSource,
+  historyProblem,
+  listServerDirectories,
+  listVersionFiles,
+  SERVER_FILE,
+  timestampsFromStat,
+  VERSIONS_DIR,
+  type CatalogSource,
+  type SourceFile,
+  type SourceTimestamps
+} from '../src/catalog/loader.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const REPO_ROOT = join(__dirname, '..');
+const SERVERS_DIR = process.env.SERVERS_DIR || join(__dirname, '..', 'servers');
+const SCHEMAS_DIR = join(__dirname, '..', 'schemas');
+const OUTPUT_PATH = process.env.CATALOG_FILE || join(__dirname, '..', 'dist', 'catalog.json');
+
+// Current schema version
+const SCHEMA_VERSION = '2025-12-11';
+
+/**
+ * First and last commit dates for a file, or null when git is unavailable
+ * or the file is untracked. Uncommitted edits keep the file mtime as
+ * updatedAt so the change is still visible to updated_since.
+ */
+function gitTimestamps(path: string, fallback: SourceTimestamps): SourceTimestamps | null {
+  try {
+    const git = (...args: string[]) => execFileSync('git', args, { cwd: REPO_ROOT, encoding: 'utf-8' }).trim();
+    const dates = git('log', '--follow', '--format=%cI', '--', path).split('\n').filter(Boolean);
+    if (dates.length === 0) return null;
+
+    const modified = git('status', '--porcelain', '--', path) !== '';
+    return {
+      publishedAt: new Date(dates[dates.length - 1]).toISOString(),
+      updatedAt: modified ? fallback.updatedAt : new Date(dates[0]).toISOString()
+    };
+  } catch {
+    return null;
+  }
+}
+
+async function compileCatalog() {
+  console.log(`📦 Compiling catalog...`);
+  console.log(`   Servers: ${SERVERS_DIR}`);
+  console.log(`   Output:  ${OUTPUT_PATH}`);
+
+  // Use bundled schema (all $refs resolved) to avoid network fetches
+  const schemaPath = join(SCHEMAS_DIR, SCHEMA_VERSION, 'nimbletools-server.bundled.schema.json');
+  const ajv = new Ajv2020({ allErrors: true, strict: false });
+  ajvFormats(ajv);
+  const validate = ajv.compile(JSON.parse(await readFile(schemaPath, 'utf-8')));
+
+  const sources: CatalogSource[] = [];
+  const failures: string[] = [];
+
+  // Validate one definition file and attach its timestamps
+  const readDefinition = async (path: string, content: Buffer): Promise<SourceFile> => {
+    if (!validate(JSON.parse(content.toString('utf-8')))) {
+      const details = (validate.errors || [])
+        .map(error => `${error.instancePath || '/'}: ${error.message}`)
+        .join('; ');
+      throw new Error(details);
+    }
+    const fromStat = timestampsFromStat(await stat(path));
+    return { content, timestamps: gitTimestamps(path, fromStat) ?? fromStat };
+  };
+
+  for (const directory of await listServerDirectories(SERVERS_DIR)) {
+    const serverDir = join(SERVERS_DIR, directory);
+    const serverJsonPath = join(serverDir, SERVER_FILE);
+
+    let content: Buffer;
+    try {
+      content = await readFile(serverJsonPath);
+    } catch {
+      continue; // Not a server directory
+    }
+
+    try {
+      const current = await readDefinition(serverJsonPath, content);
+      const currentServer = JSON.parse(content.toString('utf-8'));
+      const history: SourceFile[] = [];
+      for (const file of await listVersionFiles(serverDir)) {
+        const path = join(serverDir, VERSIONS_DIR, file);
+        try {
+          const archived = await readDefinition(path, await readFile(path));
+          // A file the runtime would skip fails the build instead
+          const problem = historyProblem(currentServer, JSON.parse(archived.content.toString('utf-8')), file);
+          if (problem) {
+            throw new Error(problem);
+          }
+          history.push({ ...archived, file });
+        } catch (error: any) {
+          failures.push(`${directory}/${VERSIONS_DIR}/${file}: ${error.message}`);
+        }
+      }
+      sources.push(createSource(directory, current.content, current.timestamps, history));
+    } catch (error: any) {
+      failures.push(`${directory}: ${error.message}`);
+    }
+  }
+
+  if (failures.length > 0) {
+    console.error(`\n❌ ${failures.length} invalid server definition(s):`);
+    failures.forEach(failure => console.error(`   └─ ${failure}`));
+    process.exit(1);
+  }
+
+  const artifact = buildCatalogArtifact(sources);
+  await mkdir(dirname(OUTPUT_PATH), { recursive: true });
+  await writeFile(OUTPUT_PATH, JSON.stringify(artifact));
+
+  console.log(`\n✅ Compiled ${sources.length} servers (catalog ${artifact.id})`);
+}
+
+compileCatalog().catch(error => {
+  console.error('❌ Failed to compile catalog:', error);
+  process.exit(1);
+});
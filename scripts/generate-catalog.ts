@@ -0,0 +1,81 @@
+#!/usr/bin/env tsx
+
+/**
+ * Generate a synthetic catalog for scale testing
+ *
+ * Usage:
+ *   npm run generate-catalog -- <count> [output-dir] [--seed <n>] [--max-history <n>]
+ *
+ * Writes <count> server directories (server.json plus versions/) shaped
+ * like the definitions in servers/ into output-dir, or a new temporary
+ * directory. Point the API or the scripts at it with SERVERS_DIR:
+ *
+ *   SERVERS_DIR=/tmp/registry-catalog-abc123 npm run dev
+ *   SERVERS_DIR=/tmp/registry-catalog-abc123 npm run validate-servers
+ *
+ * See bench/catalog.ts for what is varied.
+ */
+
+import { mkdir, mkdtemp, readdir } from 'fs/promises';
+import { tmpdir } from 'os';
+import { dirname, join, resolve } from 'path';
+import { fileURLToPath } from 'url';
+import { readTemplates, writeSyntheticCatalog } from '../bench/catalog.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+// Templates always come from the real definitions
+const TEMPLATES_DIR = join(__dirname, '..', 'servers');
+
+const USAGE = 'Usage: npm run generate-catalog -- <count> [output-dir] [--seed <n>] [--max-history <n>]';
+
+function parseArgs(args: string[]) {
+  const positional: string[] = [];
+  const options: Record<string, string> = {};
+  for (let i = 0; i < args.length; i++) {
+    if (args[i].startsWith('--')) {
+      options[args[i].slice(2)] = args[++i];
+    } else {
+      positional.push(args[i]);
+    }
+  }
+
+  const count = parseInt(positional[0], 10);
+  const seed = options.seed === undefined ? 1 : parseInt(options.seed, 10);
+  const maxHistory = options['max-history'] === undefined ? 8 : parseInt(options['max-history'], 10);
+  if (!(count > 0) || Number.isNaN(seed) || !(maxHistory >= 0)) {
+    console.error(USAGE);
+    process.exit(1);
+  }
+
+  return { count, outputDir: positional[1], seed, maxHistory };
+}
+
+async function generateCatalog() {
+  const { count, outputDir, seed, maxHistory } = parseArgs(process.argv.slice(2));
+
+  let serversDir: string;
+  if (outputDir) {
+    serversDir = resolve(outputDir);
+    await mkdir(serversDir, { recursive: true });
+    if ((await readdir(serversDir)).length > 0) {
+      console.error(`❌ ${serversDir} is not empty`);
+      process.exit(1);
+    }
+  } else {
+    serversDir = await mkdtemp(join(tmpdir(), 'registry-catalog-'));
+  }
+
+  console.log(`🧪 Generating ${count} servers (seed ${seed}, up to ${maxHistory} older versions each)...`);
+  const started = Date.now();
+  await writeSyntheticCatalog(serversDir, await readTemplates(TEMPLATES_DIR), { count, seed, maxHistory });
+
+  console.log(`\n✅ Wrote ${count} servers to ${serversDir} in ${Date.now() - started} ms`);
+  console.log(`\n   SERVERS_DIR=${serversDir} npm run dev`);
+}
+
+generateCatalog().catch(error => {
+  console.error('❌ Failed to generate catalog:', error);
+  process.exit(1);
+});
@@ -13,7 +13,7 @@ import { fileURLToPath } from 'url';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
-const SERVERS_DIR = join(__dirname, '..', 'servers');
+const SERVERS_DIR = process.env.SERVERS_DIR || join(__dirname, '..', 'servers');
 const SCHEMAS_DIR = join(__dirname, '..', 'schemas');
 
 // Current schema version
@@ -0,0 +1,67 @@
+/**
+ * Precompiled catalog artifact
+ *
+ * `npm run compile-catalog` validates every server definition and merges
+ * them into a single JSON file. Loading it at startup is one read and one
+ * parse instead of a directory scan plus a read per server.
+ */
+
+import { readFile } from 'fs/promises';
+import type { CatalogSource } from './loader.js';
+import { createSnapshot, type CatalogSnapshot } from './snapshot.js';
+
+// Bumped whenever CatalogSource changes shape
+export const CATALOG_ARTIFACT_FORMAT = 2;
+
+export interface CatalogArtifact {
+  format: number;
+  generatedAt: string;
+  /** Snapshot id the sources produce; checked on load */
+  id: string;
+  /** Server names in catalog order */
+  names: string[];
+  sources: CatalogSource[];
+}
+
+/**
+ * Build the artifact for a set of sources
+ */
+export function buildCatalogArtifact(sources: CatalogSource[]): CatalogArtifact {
+  return snapshotArtifact(createSnapshot(sources));
+}
+
+/**
+ * The artifact reproducing an existing snapshot
+ */
+export function snapshotArtifact(snapshot: CatalogSnapshot): CatalogArtifact {
+  return {
+    format: CATALOG_ARTIFACT_FORMAT,
+    generatedAt: new Date().toISOString(),
+    id: snapshot.id,
+    names: snapshot.list.map(s => s.name),
+    sources: Array.from(snapshot.sources.values())
+  };
+}
+
+/**
+ * Read a catalog artifact. Returns null when the file does not exist and
+ * throws when it exists but is not a usable artifact.
+ */
+export async function readCatalogArtifact(path: string): Promise<CatalogArtifact | null> {
+  let content: string;
+  try {
+    content = await readFile(path, 'utf-8');
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code === 'ENOENT') {
+      return null;
+    }
+    throw error;
+  }
+
+  const artifact = JSON.parse(content) as CatalogArtifact;
+  if (artifact.format !== CATALOG_ARTIFACT_FORMAT || !Array.isArray(artifact.sources)) {
+    throw new Error(`Unsupported catalog artifact format in ${path}: ${artifact.format}`);
+  }
+
+  return artifact;
+}
@@ -0,0 +1,173 @@
+import { describe, it, expect } from 'vitest';
+import { ChangeLog, versionFingerprint } from './changes.js';
+import { createSource, type SourceFile } from './loader.js';
+import { createSnapshot } from './snapshot.js';
+
+const timestamps = { publishedAt: '2025-01-01T00:00:00.000Z', updatedAt: '2025-01-01T00:00:00.000Z' };
+
+function file(directory: string, version: string, fields: Record<string, unknown> = {}): SourceFile {
+  const server = { name: `ai.nimbletools/${directory}`, version, description: `${directory} server`, ...fields };
+  return { content: Buffer.from(JSON.stringify(server)), timestamps };
+}
+
+function source(directory: string, version = '1.0.0', fields: Record<string, unknown> = {}, history: SourceFile[] = []) {
+  const latest = file(directory, version, fields);
+  return createSource(directory, latest.content, latest.timestamps, history);
+}
+
+const empty = createSnapshot([]);
+
+describe('ChangeLog', () => {
+  it('should record every version of the first snapshot as added', () => {
+    const log = new ChangeLog();
+    log.record(empty, createSnapshot([source('echo'), source('weather', '2.0.0', {}, [file('weather', '1.0.0')])]));
+
+    const page = log.since(0, 100);
+    expect(page.changes.map(c => [c.sequence, c.type, c.name, c.version])).toEqual([
+      [1, 'added', 'ai.nimbletools/echo', '1.0.0'],
+      [2, 'added', 'ai.nimbletools/weather', '2.0.0'],
+      [3, 'added', 'ai.nimbletools/weather', '1.0.0']
+    ]);
+    expect(page.changes[0].server?.description).toBe('echo server');
+    expect(page.changes[0].versionId).toBeDefined();
+    expect(page).toMatchObject({ nextSince: 3, hasMore: false, reset: false });
+  });
+
+  it('should record added, updated and removed versions between snapshots', () => {
+    const log = new ChangeLog();
+    const first = createSnapshot([source('echo'), source('weather')]);
+    const second = createSnapshot([source('echo', '1.0.0', { description: 'changed' }), source('github')]);
+    log.record(empty, first);
+    log.record(first, second);
+
+    const page = log.since(2, 100);
+    expect(page.changes.map(c => [c.type, c.name])).toEqual([
+      ['updated', 'ai.nimbletools/echo'],
+      ['added', 'ai.nimbletools/github'],
+      ['removed', 'ai.nimbletools/weather']
+    ]);
+    expect(page.changes[0].server?.description).toBe('changed');
+    expect(page.changes[2].server).toBeUndefined();
+  });
+
+  it('should report a version that stops being the latest as updated', () => {
+    const log = new ChangeLog();
+    const first = createSnapshot([source('echo')]);
+    const second = createSnapshot([source('echo', '1.1.0', {}, [file('echo', '1.0.0')])]);
+    log.record(empty, first);
+    log.record(first, second);
+
+    expect(log.since(1, 100).changes.map(c => [c.type, c.version])).toEqual([
+      ['added', '1.1.0'],
+      ['updated', '1.0.0']
+    ]);
+  });
+
+  it('should record nothing when the snapshots are equivalent', () => {
+    const log = new ChangeLog();
+    const snapshot = createSnapshot([source('echo')]);
+    log.record(empty, snapshot);
+    log.record(snapshot, createSnapshot([source('echo')]));
+
+    expect(log.sequence).toBe(1);
+  });
+
+  it('should notify subscribers once per recorded batch', () => {
+    const log = new ChangeLog();
+    const batches: number[][] = [];
+    const unsubscribe = log.subscribe(changes => batches.push(changes.map(c => c.sequence)));
+    const first = createSnapshot([source('echo'), source('weather')]);
+    log.record(empty, first);
+    log.record(first, createSnapshot([source('echo'), source('weather')]));
+    unsubscribe();
+    log.record(first, empty);
+
+    expect(batches).toEqual([[1, 2]]);
+  });
+
+  it('should page through entries', () => {
+    const log = new ChangeLog();
+    log.record(empty, createSnapshot(['a', 'b', 'c', 'd', 'e'].map(name => source(name))));
+
+    const first = log.since(0, 2);
+    expect(first.changes.map(c => c.sequence)).toEqual([1, 2]);
+    expect(first).toMatchObject({ nextSince: 2, hasMore: true });
+
+    const last = log.since(4, 2);
+    expect(last.changes.map(c => c.sequence)).toEqual([5]);
+    expect(last).toMatchObject({ nextSince: 5, hasMore: false });
+
+    expect(log.since(5, 2)).toMatchObject({ changes: [], nextSince: 5, hasMore: false, reset: false });
+  });
+
+  it('should ask for a resync once the requested entries were trimmed', () => {
+    const log = new ChangeLog(3);
+    log.record(empty, createSnapshot(['a', 'b', 'c', 'd', 'e'].map(name => source(name))));
+
+    expect(log.since(1, 100)).toMatchObject({ changes: [], nextSince: 5, reset: true });
+    expect(log.since(2, 100).changes.map(c => c.sequence)).toEqual([3, 4, 5]);
+  });
+
+  it('should take its epoch from the first snapshot it records', () => {
+    const snapshot = createSnapshot([source('echo')]);
+    const first = new ChangeLog();
+    const second = new ChangeLog();
+    first.record(empty, snapshot);
+    second.record(empty, createSnapshot([source('echo')]));
+    first.record(snapshot, createSnapshot([source('echo', '1.1.0')]));
+
+    expect(first.epoch).toBe(snapshot.id);
+    expect(second.epoch).toBe(first.epoch);
+    expect(second.since(0, 100, first.epoch).changes).toEqual(first.since(0, 1, first.epoch).changes);
+  });
+
+  it('should ask for a resync on an unknown epoch or a future sequence', () => {
+    const log = new ChangeLog(100, 'current');
+    log.record(empty, createSnapshot([source('echo')]));
+
+    expect(log.since(0, 100, 'current').changes).toHaveLength(1);
+    expect(log.since(0, 100, 'previous').reset).toBe(true);
+    expect(log.since(7, 100).reset).toBe(true);
+  });
+
+  it('should continue an exported log with the same epoch and sequences', () => {
+    const log = new ChangeLog(100, 'current');
+    const first = createSnapshot([source('echo'), source('time')]);
+    log.record(empty, first);
+
+    const sources = Array.from(first.sources.values());
+    const restored = ChangeLog.restore(JSON.parse(JSON.stringify(log.export(sources))), sources);
+    restored.record(first, createSnapshot([source('echo', '1.1.0'), source('time')]));
+
+    expect(restored.epoch).toBe('current');
+    expect(restored.since(0, 100, 'current').changes.map(c => `${c.sequence}:${c.type}`))
+      .toEqual(['1:added', '2:added', '3:added', '4:removed']);
+  });
+
+  it('should export only the definitions the handed-over catalog does not have', () => {
+    const log = new ChangeLog();
+    const first = createSnapshot([source('echo')]);
+    const second = createSnapshot([source('echo', '1.1.0', {}, [file('echo', '1.0.0')])]);
+    log.record(empty, first);
+    log.record(first, second);
+
+    const sources = Array.from(second.sources.values());
+    const state = log.export(sources);
+    // The first entry still describes 1.0.0 as the latest version
+    expect(state.entries.map(entry => entry.server !== undefined)).toEqual([true, false, false]);
+
+    const restored = ChangeLog.restore(JSON.parse(JSON.stringify(state)), sources);
+    expect(restored.since(0, 100).changes).toEqual(JSON.parse(JSON.stringify(log.since(0, 100).changes)));
+  });
+});
+
+describe('versionFingerprint', () => {
+  it('should change when a version stops being the latest', () => {
+    const before = createSnapshot([source('echo')]).versions.get('ai.nimbletools/echo')!.byVersion.get('1.0.0')!;
+    const after = createSnapshot([source('echo', '1.1.0', {}, [file('echo', '1.0.0')])]).versions.get('ai.nimbletools/echo')!.byVersion.get('1.0.0')!;
+
+    expect(after._meta?.['io.modelcontextprotocol.registry/official']?.versionId)
+      .toBe(before._meta?.['io.modelcontextprotocol.registry/official']?.versionId);
+    expect(versionFingerprint(after)).not.toBe(versionFingerprint(before));
+  });
+});
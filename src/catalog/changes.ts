@@ -0,0 +1,229 @@
+/**
+ * Append-only change log of catalog snapshots
+ *
+ * Every snapshot swap is diffed against the previous snapshot and each
+ * added, updated or removed server version becomes one entry with the
+ * next sequence number. Consumers remember the last sequence they saw and
+ * ask only for what came after it. The log is bounded; a consumer that
+ * falls behind the oldest retained entry (or holds a sequence from a
+ * log with another history, detected through the epoch) is told to
+ * resync.
+ *
+ * A log's epoch is the id of the first snapshot it records. Replaying a
+ * snapshot from empty is deterministic, so every process that starts
+ * from the same catalog (e.g. the same dist/catalog.json) numbers its
+ * entries the same way and accepts the others' positions.
+ */
+
+import type { ChangeEntry, MCPServerDetail } from '../types/api.js';
+import type { CatalogSource } from './loader.js';
+import type { CatalogSnapshot } from './snapshot.js';
+
+export type ChangeType = ChangeEntry['type'];
+
+export interface ChangesPage {
+  changes: ChangeEntry[];
+  /** Sequence to pass as `since` on the next request */
+  nextSince: number;
+  /** More entries are available after `nextSince` */
+  hasMore: boolean;
+  /** The requested position is no longer (or was never) in this log; resync from a full listing */
+  reset: boolean;
+}
+
+export type ChangeListener = (changes: readonly ChangeEntry[]) => void;
+
+/**
+ * Everything needed to continue a log in another process. Entries whose
+ * definition is unchanged in the catalog handed over with the log carry
+ * no `server`; it is taken from the catalog on restore.
+ */
+export interface ChangeLogState {
+  epoch: string;
+  sequence: number;
+  entries: ChangeEntry[];
+}
+
+const DEFAULT_MAX_ENTRIES = 10000;
+// Epoch of a log that has not recorded a snapshot yet
+const INITIAL_EPOCH = 'empty';
+
+function registryMeta(server: MCPServerDetail) {
+  return server._meta?.['io.modelcontextprotocol.registry/official'];
+}
+
+/**
+ * Everything about a version a consumer could have cached: content
+ * (through versionId) and whether it is still the latest
+ */
+export function versionFingerprint(server: MCPServerDetail): string {
+  const meta = registryMeta(server);
+  return `${meta?.versionId ?? ''}:${meta?.isLatest ?? ''}:${meta?.updatedAt ?? ''}`;
+}
+
+/**
+ * Every version of every source, keyed by name and version
+ */
+function versionsOf(sources: Iterable<CatalogSource>): Map<string, MCPServerDetail> {
+  const versions = new Map<string, MCPServerDetail>();
+  for (const source of sources) {
+    for (const server of [...source.history, source.server]) {
+      versions.set(`${server.name}@${server.version}`, server);
+    }
+  }
+  return versions;
+}
+
+export class ChangeLog {
+  private entries: ChangeEntry[] = [];
+  private lastSequence = 0;
+  private readonly listeners = new Set<ChangeListener>();
+
+  /**
+   * @param maxEntries how many entries to retain
+   * @param currentEpoch identifies this log; by default the id of the first
+   *   snapshot recorded. Sequences from another epoch are meaningless.
+   */
+  constructor(
+    private readonly maxEntries = DEFAULT_MAX_ENTRIES,
+    private currentEpoch?: string
+  ) {}
+
+  /**
+   * Continue a log exported by another process, keeping its epoch and
+   * sequence numbers. `sources` are those of the catalog it was exported
+   * with.
+   */
+  static restore(state: ChangeLogState, sources: Iterable<CatalogSource>, maxEntries = DEFAULT_MAX_ENTRIES): ChangeLog {
+    const log = new ChangeLog(maxEntries, state.epoch);
+    const versions = versionsOf(sources);
+    log.entries = state.entries.slice(-maxEntries).map(entry => {
+      const server = entry.type === 'removed' ? undefined : entry.server ?? versions.get(`${entry.name}@${entry.version}`);
+      return Object.freeze(server ? { ...entry, server } : entry);
+    });
+    log.lastSequence = state.sequence;
+    return log;
+  }
+
+  /** Identifies the history this log's sequence numbers belong to */
+  get epoch(): string {
+    return this.currentEpoch ?? INITIAL_EPOCH;
+  }
+
+  /** Sequence of the most recent entry (0 when empty) */
+  get sequence(): number {
+    return this.lastSequence;
+  }
+
+  /**
+   * Be told about every batch of entries as it is recorded.
+   * Returns a function that removes the listener.
+   */
+  subscribe(listener: ChangeListener): () => void {
+    this.listeners.add(listener);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  /**
+   * Append the differences between two snapshots
+   */
+  record(previous: CatalogSnapshot, next: CatalogSnapshot): void {
+    this.currentEpoch ??= next.id;
+    const batch: ChangeEntry[] = [];
+    const before = new Map<string, MCPServerDetail>();
+    for (const versions of previous.versions.values()) {
+      for (const server of versions.list) {
+        before.set(`${server.name}@${server.version}`, server);
+      }
+    }
+
+    for (const versions of next.versions.values()) {
+      for (const server of versions.list) {
+        const key = `${server.name}@${server.version}`;
+        const earlier = before.get(key);
+        before.delete(key);
+
+        if (!earlier) {
+          batch.push(this.append('added', server));
+        } else if (versionFingerprint(earlier) !== versionFingerprint(server)) {
+          batch.push(this.append('updated', server));
+        }
+      }
+    }
+
+    // Whatever is left existed before but not anymore
+    for (const server of before.values()) {
+      batch.push(this.append('removed', server));
+    }
+
+    if (this.entries.length > this.maxEntries) {
+      this.entries.splice(0, this.entries.length - this.maxEntries);
+    }
+
+    if (batch.length === 0) return;
+    for (const listener of this.listeners) {
+      try {
+        listener(batch);
+      } catch (error) {
+        console.error('Error notifying change listener:', error);
+      }
+    }
+  }
+
+  /**
+   * The retained entries and position, for `ChangeLog.restore`. Entries
+   * whose definition is the one in `sources` leave it out, since the
+   * catalog is handed over along with the log.
+   */
+  export(sources: Iterable<CatalogSource>): ChangeLogState {
+    const versions = versionsOf(sources);
+    const entries = this.entries.map(entry => {
+      const current = versions.get(`${entry.name}@${entry.version}`);
+      if (!entry.server || !current || versionFingerprint(current) !== versionFingerprint(entry.server)) {
+        return entry;
+      }
+      const { server, ...rest } = entry;
+      return rest;
+    });
+    return { epoch: this.epoch, sequence: this.lastSequence, entries };
+  }
+
+  /**
+   * Entries after a sequence number, oldest first
+   */
+  since(since: number, limit: number, epoch?: string): ChangesPage {
+    const oldest = this.entries.length > 0 ? this.entries[0].sequence : this.lastSequence + 1;
+    const reset = (epoch !== undefined && epoch !== this.epoch)
+      || since < oldest - 1
+      || since > this.lastSequence;
+
+    if (reset) {
+      return { changes: [], nextSince: this.lastSequence, hasMore: false, reset: true };
+    }
+
+    // Sequences are contiguous, so the position follows from the number
+    const start = since - oldest + 1;
+    const changes = this.entries.slice(start, start + limit);
+    const nextSince = changes.length > 0 ? changes[changes.length - 1].sequence : since;
+
+    return { changes, nextSince, hasMore: nextSince < this.lastSequence, reset: false };
+  }
+
+  private append(type: ChangeType, server: MCPServerDetail): ChangeEntry {
+    const entry: ChangeEntry = {
+      sequence: ++this.lastSequence,
+      type,
+      name: server.name,
+      version: server.version,
+      versionId: registryMeta(server)?.versionId
+    };
+    if (type !== 'removed') {
+      entry.server = server;
+    }
+    Object.freeze(entry);
+    this.entries.push(entry);
+    return entry;
+  }
+}
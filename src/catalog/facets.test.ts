@@ -0,0 +1,91 @@
+import { describe, it, expect } from 'vitest';
+import type { MCPServerDetail } from '../types/api.js';
+import { bitsetPositions, FacetIndex, hasPosition, parseFacetValues } from './facets.js';
+
+function server(
+  name: string,
+  meta: Record<string, unknown>,
+  registryTypes: string[] = ['mcpb']
+): MCPServerDetail {
+  return {
+    name: `ai.nimbletools/${name}`,
+    version: '1.0.0',
+    description: name,
+    packages: registryTypes.map(registryType => ({ registryType, identifier: name })),
+    _meta: { 'ai.nimbletools.mcp/v1': meta }
+  } as unknown as MCPServerDetail;
+}
+
+const servers = [
+  server('clickhouse', {
+    status: 'active',
+    capabilities: { tools: true, resources: true, prompts: true },
+    display: { category: 'infrastructure-data', tags: ['database', 'sql'] }
+  }),
+  server('echo', {
+    status: 'active',
+    capabilities: { tools: true, resources: false },
+    display: { category: 'developer-tools', tags: ['testing'] }
+  }, ['mcpb', 'npm']),
+  server('legacy', {
+    status: 'deprecated',
+    display: { category: 'developer-tools', tags: ['SQL'] }
+  }, []),
+  server('postgres', {
+    status: 'active',
+    capabilities: { tools: true },
+    display: { category: 'infrastructure-data', tags: ['database'] }
+  })
+];
+
+const index = new FacetIndex(servers);
+const names = (bitset: Uint32Array | null) => bitset && bitsetPositions(bitset).map(i => servers[i].description);
+
+describe('FacetIndex', () => {
+  it('should return null when no facet is filtered', () => {
+    expect(index.match({})).toBeNull();
+    expect(index.match({ tag: ' , ' })).toBeNull();
+  });
+
+  it('should match any of the values given for one facet', () => {
+    expect(names(index.match({ category: 'developer-tools' }))).toEqual(['echo', 'legacy']);
+    expect(names(index.match({ tag: 'testing,sql' }))).toEqual(['clickhouse', 'echo', 'legacy']);
+  });
+
+  it('should require every filtered facet to match', () => {
+    expect(names(index.match({ tag: 'sql', status: 'active' }))).toEqual(['clickhouse']);
+    expect(names(index.match({ category: 'infrastructure-data', capability: 'prompts' }))).toEqual(['clickhouse']);
+    expect(names(index.match({ registry_type: 'npm', status: 'deprecated' }))).toEqual([]);
+  });
+
+  it('should compare values case-insensitively and ignore unknown ones', () => {
+    expect(names(index.match({ status: 'DEPRECATED,unknown' }))).toEqual(['legacy']);
+  });
+
+  it('should count facet values, most frequent first', () => {
+    const counts = index.count(null);
+
+    expect(counts.category).toEqual({ 'developer-tools': 2, 'infrastructure-data': 2 });
+    expect(counts.tag).toEqual({ database: 2, sql: 2, testing: 1 });
+    expect(counts.registry_type).toEqual({ mcpb: 3, npm: 1 });
+    expect(counts.capability).toEqual({ tools: 3, prompts: 1, resources: 1 });
+    expect(index.count([0]).status).toEqual({ active: 1 });
+  });
+
+  it('should handle catalogs spanning several bitset words', () => {
+    const many = Array.from({ length: 70 }, (_, i) =>
+      server(`s${i}`, { status: i % 3 === 0 ? 'beta' : 'active' }));
+    const matched = new FacetIndex(many).match({ status: 'beta' })!;
+
+    expect(bitsetPositions(matched)).toEqual(Array.from({ length: 24 }, (_, i) => i * 3));
+    expect(hasPosition(matched, 63)).toBe(true);
+    expect(hasPosition(matched, 64)).toBe(false);
+  });
+});
+
+describe('parseFacetValues', () => {
+  it('should split, trim, lowercase and de-duplicate', () => {
+    expect(parseFacetValues(' Database,sql ,database')).toEqual(['database', 'sql']);
+    expect(parseFacetValues(undefined)).toEqual([]);
+  });
+});
@@ -0,0 +1,170 @@
+/**
+ * Facet indexes for structured list filters
+ *
+ * Every facet value (a category, a tag, a package registry type...) maps
+ * to a bitset over the snapshot's name-ordered list, built once with the
+ * snapshot. Values requested for one facet are OR-ed and facets are
+ * AND-ed, so a filter costs a few word-wise operations per bitset however
+ * many servers match.
+ */
+
+import type { MCPServerDetail } from '../types/api.js';
+
+/** Filterable facets, named as their list query parameters */
+export const FACETS = ['category', 'tag', 'status', 'registry_type', 'capability'] as const;
+
+export type Facet = typeof FACETS[number];
+
+/** Comma-separated values per facet, as received in the query */
+export type FacetFilters = { [facet in Facet]?: string };
+
+/** Number of servers per value of each facet */
+export type FacetCounts = Record<Facet, Record<string, number>>;
+
+/**
+ * Split a comma-separated facet parameter into lowercase values
+ */
+export function parseFacetValues(value: string | undefined): string[] {
+  if (!value) return [];
+  return Array.from(new Set(value.split(',').map(v => v.trim().toLowerCase()).filter(Boolean))).sort();
+}
+
+function facetValues(server: MCPServerDetail): Record<Facet, string[]> {
+  const meta = server._meta?.['ai.nimbletools.mcp/v1'];
+  const values: Record<Facet, Array<string | undefined>> = {
+    category: [meta?.display?.category],
+    tag: meta?.display?.tags ?? [],
+    status: [meta?.status],
+    registry_type: (server.packages ?? []).map(pkg => pkg.registryType),
+    capability: Object.entries(meta?.capabilities ?? {})
+      .filter(([, enabled]) => enabled === true)
+      .map(([capability]) => capability)
+  };
+
+  const normalized = {} as Record<Facet, string[]>;
+  for (const facet of FACETS) {
+    normalized[facet] = Array.from(new Set(values[facet]
+      .filter((value): value is string => typeof value === 'string' && value !== '')
+      .map(value => value.toLowerCase())));
+  }
+  return normalized;
+}
+
+/**
+ * Whether a position is set in a bitset
+ */
+export function hasPosition(bitset: Uint32Array, position: number): boolean {
+  return (bitset[position >>> 5] & (1 << (position & 31))) !== 0;
+}
+
+/**
+ * Set positions of a bitset, ascending
+ */
+export function bitsetPositions(bitset: Uint32Array): number[] {
+  const positions: number[] = [];
+  for (let word = 0; word < bitset.length; word++) {
+    let bits = bitset[word];
+    while (bits !== 0) {
+      // Lowest set bit first
+      const bit = 31 - Math.clz32(bits & -bits);
+      positions.push(word * 32 + bit);
+      bits &= bits - 1;
+    }
+  }
+  return positions;
+}
+
+/**
+ * Facet bitsets of one snapshot's servers. Immutable once built.
+ */
+export class FacetIndex {
+  private readonly words: number;
+  private readonly bitsets = new Map<Facet, Map<string, Uint32Array>>();
+  /** Facet values per list position, for counting */
+  private readonly values: ReadonlyArray<Record<Facet, string[]>>;
+
+  constructor(servers: readonly MCPServerDetail[]) {
+    this.words = Math.ceil(servers.length / 32);
+    this.values = servers.map(facetValues);
+
+    for (const facet of FACETS) {
+      this.bitsets.set(facet, new Map());
+    }
+    this.values.forEach((values, position) => {
+      for (const facet of FACETS) {
+        const byValue = this.bitsets.get(facet)!;
+        for (const value of values[facet]) {
+          let bitset = byValue.get(value);
+          if (!bitset) {
+            bitset = new Uint32Array(this.words);
+            byValue.set(value, bitset);
+          }
+          bitset[position >>> 5] |= 1 << (position & 31);
+        }
+      }
+    });
+  }
+
+  /**
+   * Bitset of the servers matching every filtered facet (any of its
+   * values), or null when no facet is filtered
+   */
+  match(filters: FacetFilters): Uint32Array | null {
+    let result: Uint32Array | null = null;
+
+    for (const facet of FACETS) {
+      const values = parseFacetValues(filters[facet]);
+      if (values.length === 0) continue;
+
+      const any = new Uint32Array(this.words);
+      for (const value of values) {
+        const bitset = this.bitsets.get(facet)!.get(value);
+        if (!bitset) continue;
+        for (let word = 0; word < this.words; word++) {
+          any[word] |= bitset[word];
+        }
+      }
+
+      if (result) {
+        for (let word = 0; word < this.words; word++) {
+          result[word] &= any[word];
+        }
+      } else {
+        result = any;
+      }
+    }
+    return result;
+  }
+
+  /**
+   * Count facet values over the given positions (every server when null),
+   * most frequent first
+   */
+  count(positions: readonly number[] | null): FacetCounts {
+    const counts = {} as Record<Facet, Map<string, number>>;
+    for (const facet of FACETS) {
+      counts[facet] = new Map();
+    }
+
+    const tally = (position: number) => {
+      const values = this.values[position];
+      for (const facet of FACETS) {
+        for (const value of values[facet]) {
+          counts[facet].set(value, (counts[facet].get(value) ?? 0) + 1);
+        }
+      }
+    };
+    if (positions) {
+      positions.forEach(tally);
+    } else {
+      for (let position = 0; position < this.values.length; position++) tally(position);
+    }
+
+    const result = {} as FacetCounts;
+    for (const facet of FACETS) {
+      const sorted = Array.from(counts[facet]).sort((a, b) => b[1] - a[1] || (a[0] < b[0] ? -1 : 1));
+      result[facet] = Object.fromEntries(sorted);
+    }
+    return result;
+  }
+}
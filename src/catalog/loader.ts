@@ -0,0 +1,331 @@
+/**
+ * Reads server definitions from the servers directory
+ *
+ * Each server directory holds the current definition in server.json and,
+ * optionally, earlier (or pinned) versions as versions/<version>.json.
+ */
+
+import { createHash } from 'crypto';
+import type { Stats } from 'fs';
+import { readdir, readFile, stat } from 'fs/promises';
+import { join } from 'path';
+import { v5 as uuidv5 } from 'uuid';
+import type { MCPServerDetail, RegistryMetadata } from '../types/api.js';
+import { compareVersions } from './semver.js';
+
+export const SERVER_FILE = 'server.json';
+export const VERSIONS_DIR = 'versions';
+
+// Namespace for content-derived versionIds (uuid v5 of the server.json digest)
+const VERSION_ID_NAMESPACE = '6f1c9a52-3d0e-4b8f-9a47-2c5e8d1b7f30';
+
+/**
+ * When a definition was first published and last changed
+ */
+export interface SourceTimestamps {
+  publishedAt: string;
+  updatedAt: string;
+}
+
+/**
+ * Raw bytes of one definition file and its timestamps
+ */
+export interface SourceFile {
+  content: Buffer;
+  timestamps: SourceTimestamps;
+  /** File name under versions/, checked against the declared version */
+  file?: string;
+}
+
+/**
+ * The parsed versions of one server directory together with the facts
+ * needed to detect changes
+ */
+export interface CatalogSource {
+  /** Directory name under the servers directory */
+  directory: string;
+  /** sha256 of the raw definition bytes (of server.json alone when there is no history) */
+  digest: string;
+  /** Latest version, with registry metadata attached */
+  server: MCPServerDetail;
+  /** Every other version, oldest first */
+  history: MCPServerDetail[];
+}
+
+/**
+ * Derive timestamps from file metadata, used when no better source
+ * (such as git history at catalog build time) is available
+ */
+export function timestampsFromStat(info: Stats): SourceTimestamps {
+  const created = info.birthtimeMs > 0 && info.birthtimeMs < info.mtimeMs ? info.birthtime : info.mtime;
+  return {
+    publishedAt: created.toISOString(),
+    updatedAt: info.mtime.toISOString()
+  };
+}
+
+/**
+ * Attach the official registry metadata block to a parsed definition.
+ * Everything in it is derived from the file itself, so reloading an
+ * unchanged file yields identical metadata.
+ */
+function withRegistryMetadata(
+  serverData: MCPServerDetail,
+  digest: string,
+  timestamps: SourceTimestamps,
+  isLatest: boolean
+): MCPServerDetail {
+  // Add registry metadata if not present
+  if (!serverData._meta) {
+    serverData._meta = {
+      'ai.nimbletools.mcp/v1': {}
+    };
+  }
+
+  const registryMeta: RegistryMetadata = {
+    serverId: serverData.name,
+    versionId: uuidv5(digest, VERSION_ID_NAMESPACE),
+    publishedAt: timestamps.publishedAt,
+    updatedAt: timestamps.updatedAt,
+    isLatest
+  };
+
+  serverData._meta['io.modelcontextprotocol.registry/official'] = registryMeta;
+
+  return serverData;
+}
+
+/**
+ * Why a versions/ file cannot be part of a server's history, or null
+ * when it can
+ */
+export function historyProblem(current: MCPServerDetail, archived: MCPServerDetail, file?: string): string | null {
+  if (archived.name !== current.name) {
+    return `name '${archived.name}' does not match server.json ('${current.name}')`;
+  }
+  if (file !== undefined && file !== `${archived.version}.json`) {
+    return `file name does not match its version '${archived.version}'`;
+  }
+  return null;
+}
+
+/**
+ * Parse raw server.json bytes, plus any files from versions/, into a
+ * catalog source. server.json is the latest version, even when a
+ * versions/ file declares a higher one (a rollback), and wins over a
+ * versions/ file declaring the same version. versions/ files that cannot
+ * be parsed or belong elsewhere are skipped.
+ */
+export function createSource(
+  directory: string,
+  content: Buffer,
+  timestamps: SourceTimestamps,
+  history: SourceFile[] = []
+): CatalogSource {
+  const current = JSON.parse(content.toString('utf-8')) as MCPServerDetail;
+  const digestOf = (bytes: Buffer) => createHash('sha256').update(bytes).digest('hex');
+
+  const byVersion = new Map<string, { digest: string; data: MCPServerDetail; timestamps: SourceTimestamps }>();
+  for (const file of history) {
+    const label = `${directory}/${VERSIONS_DIR}/${file.file ?? '?'}`;
+    let data: MCPServerDetail;
+    try {
+      data = JSON.parse(file.content.toString('utf-8')) as MCPServerDetail;
+    } catch (error) {
+      console.error(`Skipping ${label}:`, error);
+      continue;
+    }
+
+    const problem = historyProblem(current, data, file.file);
+    if (problem) {
+      console.error(`Skipping ${label}: ${problem}`);
+      continue;
+    }
+    if (data.version === current.version) continue;
+    if (compareVersions(data.version, current.version) > 0) {
+      console.error(`${label} is newer than server.json (${current.version}); server.json stays the latest version`);
+    }
+    byVersion.set(data.version, { digest: digestOf(file.content), data, timestamps: file.timestamps });
+  }
+
+  const older = Array.from(byVersion.values()).sort((a, b) => compareVersions(a.data.version, b.data.version));
+  const latest = { digest: digestOf(content), data: current, timestamps };
+  const versions = [...older, latest];
+  const servers = versions.map((version, i) =>
+    withRegistryMetadata(version.data, version.digest, version.timestamps, i === versions.length - 1));
+
+  const digest = versions.length === 1
+    ? latest.digest
+    : createHash('sha256').update(versions.map(version => version.digest).join('\n')).digest('hex');
+
+  return {
+    directory,
+    digest,
+    server: servers[servers.length - 1],
+    history: servers.slice(0, -1)
+  };
+}
+
+/**
+ * List the definition files under a server's versions/ directory
+ */
+export async function listVersionFiles(serverDir: string): Promise<string[]> {
+  try {
+    const files = await readdir(join(serverDir, VERSIONS_DIR));
+    return files.filter(file => file.endsWith('.json')).sort();
+  } catch (error) {
+    const code = (error as NodeJS.ErrnoException).code;
+    if (code === 'ENOENT' || code === 'ENOTDIR') {
+      return [];
+    }
+    throw error;
+  }
+}
+
+async function readSourceFile(path: string): Promise<SourceFile> {
+  const [content, info] = await Promise.all([readFile(path), stat(path)]);
+  return { content, timestamps: timestampsFromStat(info) };
+}
+
+/**
+ * Read every versions/ file of a server; unreadable files are skipped
+ * so they cannot take the current version down with them
+ */
+async function readHistory(serverDir: string): Promise<SourceFile[]> {
+  let names: string[];
+  try {
+    names = await listVersionFiles(serverDir);
+  } catch (error) {
+    console.error(`Skipping ${join(serverDir, VERSIONS_DIR)}:`, error);
+    return [];
+  }
+
+  const files = await Promise.all(names.map(async file => {
+    const path = join(serverDir, VERSIONS_DIR, file);
+    try {
+      return { ...await readSourceFile(path), file };
+    } catch (error) {
+      console.error(`Skipping ${path}:`, error);
+      return null;
+    }
+  }));
+  return files.filter((file): file is SourceFile & { file: string } => file !== null);
+}
+
+/**
+ * Read and parse a single server directory.
+ * Returns null when the directory has no server.json; throws when the
+ * file exists but cannot be parsed.
+ */
+export async function readServerDirectory(serversDir: string, directory: string): Promise<CatalogSource | null> {
+  const serverJsonPath = join(serversDir, directory, SERVER_FILE);
+
+  let current: SourceFile;
+  try {
+    current = await readSourceFile(serverJsonPath);
+  } catch (error) {
+    const code = (error as NodeJS.ErrnoException).code;
+    if (code === 'ENOENT' || code === 'ENOTDIR') {
+      return null;
+    }
+    throw error;
+  }
+
+  const history = await readHistory(join(serversDir, directory));
+  return createSource(directory, current.content, current.timestamps, history);
+}
+
+/**
+ * List the server directories, sorted for deterministic load order
+ */
+export async function listServerDirectories(serversDir: string): Promise<string[]> {
+  const dirs = await readdir(serversDir, { withFileTypes: true });
+  return dirs
+    .filter(d => d.isDirectory())
+    .map(d => d.name)
+    .sort();
+}
+
+/**
+ * Read every server definition under the servers directory
+ */
+export async function readServersDir(serversDir: string): Promise<CatalogSource[]> {
+  const sources: CatalogSource[] = [];
+
+  try {
+    const directories = await listServerDirectories(serversDir);
+    const results = await Promise.all(directories.map(async (directory) => {
+      try {
+        return await readServerDirectory(serversDir, directory);
+      } catch (error) {
+        console.error(`Error loading ${join(serversDir, directory, SERVER_FILE)}:`, error);
+        return null;
+      }
+    }));
+
+    for (const source of results) {
+      if (source) sources.push(source);
+    }
+  } catch (error) {
+    console.error('Error reading servers directory:', error);
+  }
+
+  return sources;
+}
+
+/**
+ * Modification time (epoch ms) of the most recently changed definition
+ * file; 0 when there are none or the directory does not exist
+ */
+export async function newestDefinitionMtime(serversDir: string): Promise<number> {
+  const mtime = (path: string) => stat(path).then(info => info.mtimeMs, () => 0);
+
+  let directories: string[];
+  try {
+    directories = await listServerDirectories(serversDir);
+  } catch {
+    return 0;
+  }
+
+  const times = await Promise.all(directories.map(async (directory) => {
+    const serverDir = join(serversDir, directory);
+    const versionFiles = await listVersionFiles(serverDir).catch(() => []);
+    const files = await Promise.all([
+      mtime(join(serverDir, SERVER_FILE)),
+      ...versionFiles.map(file => mtime(join(serverDir, VERSIONS_DIR, file)))
+    ]);
+    return Math.max(0, ...files);
+  }));
+  return Math.max(0, ...times);
+}
+
+/**
+ * Cheap change detector: directory listing plus size and mtime of every
+ * definition file. Only stats files, never reads or parses them.
+ */
+export async function fingerprintServersDir(serversDir: string): Promise<string> {
+  const fingerprintFile = async (path: string) => {
+    try {
+      const info = await stat(path);
+      return `${info.size}:${info.mtimeMs}`;
+    } catch {
+      return '-';
+    }
+  };
+
+  try {
+    const directories = await listServerDirectories(serversDir);
+    const parts = await Promise.all(directories.map(async (directory) => {
+      const serverDir = join(serversDir, directory);
+      const versionFiles = await listVersionFiles(serverDir).catch(() => []);
+      const files = await Promise.all([
+        fingerprintFile(join(serverDir, SERVER_FILE)),
+        ...versionFiles.map(async file => `${file}=${await fingerprintFile(join(serverDir, VERSIONS_DIR, file))}`)
+      ]);
+      return `${directory}:${files.join(':')}`;
+    }));
+    return parts.join('\n');
+  } catch {
+    return '';
+  }
+}
@@ -0,0 +1,57 @@
+import { describe, it, expect } from 'vitest';
+import type { MCPServerDetail } from '../types/api.js';
+import { normalizePlatform, packagePlatform, PlatformIndex } from './platforms.js';
+
+const bundle = (platform: string) =>
+  `https://github.com/NimbleBrainInc/mcp-echo/releases/download/v0.1.0/mcp-echo-v0.1.0-${platform}.mcpb`;
+
+function server(identifiers: string[]): MCPServerDetail {
+  return {
+    name: 'ai.nimbletools/echo',
+    version: '0.1.0',
+    description: 'Echo',
+    packages: identifiers.map(identifier => ({ registryType: 'mcpb', identifier, transport: { type: 'stdio' } }))
+  } as MCPServerDetail;
+}
+
+describe('packagePlatform', () => {
+  it('should read the platform from the bundle file name', () => {
+    expect(packagePlatform(bundle('linux-arm64'))).toBe('linux-arm64');
+    expect(packagePlatform(bundle('darwin-x64'))).toBe('darwin-amd64');
+  });
+
+  it('should treat other packages as platform-independent', () => {
+    expect(packagePlatform('@modelcontextprotocol/server-echo')).toBeNull();
+    expect(packagePlatform('https://example.com/mcp-echo-v0.1.0.mcpb')).toBeNull();
+  });
+});
+
+describe('normalizePlatform', () => {
+  it('should canonicalize aliases and reject anything else', () => {
+    expect(normalizePlatform('Linux-AArch64')).toBe('linux-arm64');
+    expect(normalizePlatform('linux')).toBeNull();
+    expect(normalizePlatform(undefined)).toBeNull();
+  });
+});
+
+describe('PlatformIndex', () => {
+  const multi = server([bundle('linux-amd64'), bundle('linux-arm64'), 'echo-npm']);
+  const plain = server(['echo-npm']);
+  const index = new PlatformIndex([multi, plain]);
+
+  it('should keep the platform package and platform-independent ones', () => {
+    expect(index.select(multi, 'linux-arm64').packages?.map(pkg => pkg.identifier)).toEqual([bundle('linux-arm64'), 'echo-npm']);
+  });
+
+  it('should keep only platform-independent packages for an unknown platform', () => {
+    expect(index.select(multi, 'windows-amd64').packages?.map(pkg => pkg.identifier)).toEqual(['echo-npm']);
+  });
+
+  it('should return servers without platform packages unchanged', () => {
+    expect(index.select(plain, 'linux-arm64')).toBe(plain);
+  });
+
+  it('should return the same precomputed variant every time', () => {
+    expect(index.select(multi, 'linux-amd64')).toBe(index.select(multi, 'linux-amd64'));
+  });
+});
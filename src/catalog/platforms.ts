@@ -0,0 +1,100 @@
+/**
+ * Platform-specific package selection
+ *
+ * MCPB servers publish one package per platform, identical except for the
+ * bundle URL and checksum, e.g. `...-linux-amd64.mcpb` and
+ * `...-linux-arm64.mcpb`. The platform index records, for every server
+ * version that has such packages, a variant per platform that keeps only
+ * that platform's packages plus any package without a platform marker, so
+ * a client that needs one platform gets one package.
+ */
+
+import type { MCPServerDetail } from '../types/api.js';
+
+const PLATFORM_PATTERN = /-([a-z0-9]+)-([a-z0-9_]+)\.mcpb$/i;
+
+const OS_ALIASES: Record<string, string> = {
+  macos: 'darwin',
+  win32: 'windows'
+};
+
+const ARCH_ALIASES: Record<string, string> = {
+  x64: 'amd64',
+  x86_64: 'amd64',
+  aarch64: 'arm64'
+};
+
+const KNOWN_OS = new Set(['linux', 'darwin', 'windows']);
+
+function canonicalPlatform(os: string, arch: string): string {
+  os = os.toLowerCase();
+  arch = arch.toLowerCase();
+  return `${OS_ALIASES[os] ?? os}-${ARCH_ALIASES[arch] ?? arch}`;
+}
+
+/**
+ * Normalize a requested platform such as `linux-arm64` (common aliases
+ * like `linux-aarch64` or `darwin-x64` are accepted). Returns null when
+ * none is requested or it is not `<os>-<arch>`.
+ */
+export function normalizePlatform(platform: string | undefined): string | null {
+  const match = platform ? /^([a-z0-9]+)-([a-z0-9_]+)$/i.exec(platform.trim()) : null;
+  return match ? canonicalPlatform(match[1], match[2]) : null;
+}
+
+/**
+ * Platform a package is built for, taken from its bundle file name;
+ * null for platform-independent packages
+ */
+export function packagePlatform(identifier: string): string | null {
+  const match = PLATFORM_PATTERN.exec(identifier);
+  if (!match || !KNOWN_OS.has(OS_ALIASES[match[1].toLowerCase()] ?? match[1].toLowerCase())) {
+    return null;
+  }
+  return canonicalPlatform(match[1], match[2]);
+}
+
+interface PlatformVariants {
+  /** Variant per platform that has packages */
+  readonly byPlatform: ReadonlyMap<string, MCPServerDetail>;
+  /** Variant with only the platform-independent packages */
+  readonly other: MCPServerDetail;
+}
+
+function withPackages(server: MCPServerDetail, packages: NonNullable<MCPServerDetail['packages']>): MCPServerDetail {
+  return Object.freeze({ ...server, packages: Object.freeze(packages) as typeof packages });
+}
+
+/**
+ * Per-version platform variants of one snapshot. Immutable once built.
+ */
+export class PlatformIndex {
+  private readonly variants = new Map<MCPServerDetail, PlatformVariants>();
+
+  constructor(servers: Iterable<MCPServerDetail>) {
+    for (const server of servers) {
+      const packages = server.packages ?? [];
+      const platforms = packages.map(pkg => packagePlatform(pkg.identifier));
+      if (platforms.every(platform => platform === null)) continue;
+
+      const byPlatform = new Map<string, MCPServerDetail>();
+      for (const platform of new Set(platforms)) {
+        if (platform === null) continue;
+        byPlatform.set(platform, withPackages(server, packages.filter((_, i) => platforms[i] === platform || platforms[i] === null)));
+      }
+      this.variants.set(server, {
+        byPlatform,
+        other: withPackages(server, packages.filter((_, i) => platforms[i] === null))
+      });
+    }
+  }
+
+  /**
+   * The server with only the packages that run on a (normalized) platform
+   */
+  select(server: MCPServerDetail, platform: string): MCPServerDetail {
+    const variants = this.variants.get(server);
+    if (!variants) return server;
+    return variants.byPlatform.get(platform) ?? variants.other;
+  }
+}
@@ -0,0 +1,71 @@
+import { describe, it, expect } from 'vitest';
+import type { MCPServerDetail } from '../types/api.js';
+import { parseFields, projector } from './projection.js';
+
+const server = {
+  name: 'ai.nimbletools/weather',
+  version: '1.0.0',
+  title: 'Weather',
+  description: 'Forecasts and alerts',
+  packages: [
+    { registryType: 'npm', identifier: 'weather-mcp', environmentVariables: [{ name: 'API_KEY' }] },
+    { registryType: 'mcpb', identifier: 'weather-linux-x64.mcpb' }
+  ],
+  _meta: {
+    'ai.nimbletools.mcp/v1': {
+      status: 'active',
+      display: { category: 'weather', tags: ['forecast'] }
+    },
+    'io.modelcontextprotocol.registry/official': { isLatest: true }
+  }
+} as unknown as MCPServerDetail;
+
+describe('parseFields', () => {
+  it('should trim, de-duplicate and sort paths, always adding name and version', () => {
+    expect(parseFields(' title,description ,title')).toEqual(['description', 'name', 'title', 'version']);
+  });
+
+  it('should return null when nothing is selected', () => {
+    expect(parseFields(undefined)).toBeNull();
+    expect(parseFields(' , ')).toBeNull();
+  });
+});
+
+describe('projector', () => {
+  it('should keep only the selected top-level fields', () => {
+    expect(projector(parseFields('title')!)(server)).toEqual({
+      name: 'ai.nimbletools/weather',
+      version: '1.0.0',
+      title: 'Weather'
+    });
+  });
+
+  it('should match keys that contain dots', () => {
+    const projected = projector(parseFields('_meta.ai.nimbletools.mcp/v1.display.category')!)(server);
+
+    expect(projected._meta).toEqual({ 'ai.nimbletools.mcp/v1': { display: { category: 'weather' } } });
+  });
+
+  it('should project every element of an array', () => {
+    const projected = projector(parseFields('packages.identifier')!)(server);
+
+    expect(projected.packages).toEqual([{ identifier: 'weather-mcp' }, { identifier: 'weather-linux-x64.mcpb' }]);
+  });
+
+  it('should keep a field whole when it is selected alongside its children', () => {
+    const projected = projector(parseFields('packages,packages.identifier')!)(server);
+
+    expect(projected.packages).toBe(server.packages);
+  });
+
+  it('should ignore paths that do not exist', () => {
+    expect(projector(parseFields('title.length,missing')!)(server)).toEqual({
+      name: 'ai.nimbletools/weather',
+      version: '1.0.0'
+    });
+  });
+
+  it('should reuse the compiled projector for the same field set', () => {
+    expect(projector(parseFields('title,description')!)).toBe(projector(parseFields('description,title')!));
+  });
+});
@@ -0,0 +1,105 @@
+/**
+ * Sparse fieldsets: server definitions reduced to the requested paths
+ *
+ * A field set is a comma-separated list of dotted paths, such as
+ * `title,packages.identifier,_meta.ai.nimbletools.mcp/v1.display`.
+ * Keys may contain dots themselves, so paths are matched against the keys
+ * actually present: a key is kept whole when it equals the remaining path
+ * and descended into when the path continues with `<key>.`. Arrays are
+ * projected element by element. `name` and `version` are always kept so
+ * every projected server still identifies itself.
+ *
+ * Each distinct field set compiles to one projector, which memoizes per
+ * key how to project it, so projecting the same shape again costs one
+ * map lookup per key.
+ */
+
+import type { MCPServerDetail } from '../types/api.js';
+
+type Project = (value: unknown) => unknown;
+
+/** Projection of a key: keep it whole, project it, or drop it */
+type KeyProjection = true | Project | null;
+
+const ALWAYS_INCLUDED = ['name', 'version'];
+
+// Distinct field sets whose compiled projectors are kept
+const MAX_PROJECTORS = 256;
+
+const projectors = new Map<string, Project>();
+
+/**
+ * Normalize a `fields` parameter into sorted, de-duplicated paths.
+ * Returns null when it selects nothing (no projection).
+ */
+export function parseFields(fields: string | undefined): string[] | null {
+  if (!fields) return null;
+
+  const paths = new Set(fields.split(',').map(path => path.trim()).filter(Boolean));
+  if (paths.size === 0) return null;
+
+  for (const path of ALWAYS_INCLUDED) {
+    paths.add(path);
+  }
+  return Array.from(paths).sort();
+}
+
+function keyProjection(paths: readonly string[], key: string): KeyProjection {
+  const rest: string[] = [];
+  for (const path of paths) {
+    if (path === key) return true;
+    if (path.startsWith(`${key}.`)) {
+      rest.push(path.slice(key.length + 1));
+    }
+  }
+  return rest.length > 0 ? compile(rest) : null;
+}
+
+function compile(paths: readonly string[]): Project {
+  const byKey = new Map<string, KeyProjection>();
+
+  const project: Project = (value) => {
+    if (Array.isArray(value)) return value.map(project);
+    // A path that runs past a scalar selects nothing below it
+    if (!value || typeof value !== 'object') return undefined;
+
+    const projected: Record<string, unknown> = {};
+    for (const [key, child] of Object.entries(value)) {
+      let projection = byKey.get(key);
+      if (projection === undefined) {
+        projection = keyProjection(paths, key);
+        byKey.set(key, projection);
+      }
+
+      if (projection === true) {
+        projected[key] = child;
+      } else if (projection) {
+        const selected = projection(child);
+        if (selected !== undefined) projected[key] = selected;
+      }
+    }
+    return projected;
+  };
+  return project;
+}
+
+/**
+ * The projector for a normalized field set (see parseFields)
+ */
+export function projector(paths: readonly string[]): (server: MCPServerDetail) => MCPServerDetail {
+  const key = paths.join(',');
+  let project = projectors.get(key);
+  if (project) {
+    // Re-insert to mark as most recently used
+    projectors.delete(key);
+  } else {
+    project = compile(paths);
+    if (projectors.size >= MAX_PROJECTORS) {
+      projectors.delete(projectors.keys().next().value!);
+    }
+  }
+  projectors.set(key, project);
+
+  // Only the selected fields are present; name and version always are
+  return project as (server: MCPServerDetail) => MCPServerDetail;
+}
@@ -0,0 +1,209 @@
+import { describe, it, expect } from 'vitest';
+import { createSource } from './loader.js';
+import { cursorProblem, decodeCursor, encodeCursor, listQueryKey, listServers, resolveVersion } from './query.js';
+import { createSnapshot } from './snapshot.js';
+
+function source(directory: string, fields: Record<string, unknown> = {}, updatedAt = '2025-01-01T00:00:00.000Z') {
+  const server = {
+    name: `ai.nimbletools/${directory}`,
+    version: '1.0.0',
+    description: `${directory} server`,
+    ...fields
+  };
+  return createSource(directory, Buffer.from(JSON.stringify(server)), { publishedAt: updatedAt, updatedAt });
+}
+
+const snapshot = createSnapshot([
+  source('weather', { title: 'Weather', description: 'Forecasts and alerts' }),
+  source('echo', { description: 'Echo service' }, '2025-06-01T00:00:00.000Z'),
+  source('github', { title: 'GitHub' })
+]);
+
+describe('listServers', () => {
+  it('should list servers sorted by name', () => {
+    const response = listServers(snapshot, {});
+
+    expect(response.servers.map(s => s.name)).toEqual([
+      'ai.nimbletools/echo',
+      'ai.nimbletools/github',
+      'ai.nimbletools/weather'
+    ]);
+    expect(response.metadata).toEqual({ count: 3 });
+  });
+
+  it('should search name, title and description case-insensitively', () => {
+    expect(listServers(snapshot, { search: 'FORECAST' }).servers.map(s => s.name)).toEqual(['ai.nimbletools/weather']);
+    expect(listServers(snapshot, { search: 'github' }).servers).toHaveLength(1);
+  });
+
+  it('should match word prefixes', () => {
+    expect(listServers(snapshot, { search: 'ale' }).servers.map(s => s.name)).toEqual(['ai.nimbletools/weather']);
+  });
+
+  it('should order search results by relevance when asked', () => {
+    const withMention = createSnapshot([
+      ...snapshot.sources.values(),
+      source('almanac', { description: 'Mentions the weather in passing' })
+    ]);
+    const names = (sort?: string) =>
+      listServers(withMention, { search: 'weather', sort }).servers.map(s => s.name);
+
+    expect(names()).toEqual(['ai.nimbletools/almanac', 'ai.nimbletools/weather']);
+    expect(names('relevance')).toEqual(['ai.nimbletools/weather', 'ai.nimbletools/almanac']);
+  });
+
+  it('should reduce servers to the requested fields', () => {
+    const response = listServers(snapshot, { fields: 'title', limit: '1' });
+
+    expect(response.servers).toEqual([{ name: 'ai.nimbletools/echo', version: '1.0.0' }]);
+    expect(response.metadata?.next_cursor).toBeDefined();
+  });
+
+  it('should combine facet filters with search and count facets over every page', () => {
+    const faceted = createSnapshot([
+      ...snapshot.sources.values(),
+      source('radar', {
+        description: 'Weather radar',
+        _meta: { 'ai.nimbletools.mcp/v1': { status: 'beta', display: { category: 'data-intelligence', tags: ['weather'] } } }
+      }),
+      source('storms', {
+        description: 'Weather storms',
+        _meta: { 'ai.nimbletools.mcp/v1': { status: 'active', display: { category: 'data-intelligence', tags: ['weather'] } } }
+      })
+    ]);
+
+    const first = listServers(faceted, { search: 'weather', tag: 'weather', facets: 'true', limit: '1' });
+    expect(first.servers.map(s => s.name)).toEqual(['ai.nimbletools/radar']);
+    expect(first.metadata?.facets?.status).toEqual({ active: 1, beta: 1 });
+
+    const second = listServers(faceted, { search: 'weather', tag: 'weather', cursor: first.metadata?.next_cursor });
+    expect(second.servers.map(s => s.name)).toEqual(['ai.nimbletools/storms']);
+    expect(listServers(faceted, { tag: 'weather', status: 'beta' }).servers.map(s => s.name)).toEqual(['ai.nimbletools/radar']);
+  });
+
+  it('should narrow packages to the requested platform', () => {
+    const bundle = (platform: string) => ({
+      registryType: 'mcpb',
+      identifier: `https://example.com/mcp-radar-v1.0.0-${platform}.mcpb`,
+      transport: { type: 'stdio' }
+    });
+    const withPackages = createSnapshot([source('radar', { packages: [bundle('linux-amd64'), bundle('linux-arm64')] })]);
+    const response = listServers(withPackages, { platform: 'linux-arm64' });
+
+    expect(response.servers[0].packages?.map(pkg => pkg.identifier)).toEqual(['https://example.com/mcp-radar-v1.0.0-linux-arm64.mcpb']);
+    expect(listQueryKey({ platform: 'linux-aarch64' })).toBe(listQueryKey({ platform: 'linux-arm64' }));
+  });
+
+  it('should filter by updated_since', () => {
+    const response = listServers(snapshot, { updated_since: '2025-03-01T00:00:00Z' });
+
+    expect(response.servers.map(s => s.name)).toEqual(['ai.nimbletools/echo']);
+  });
+
+  it('should paginate with a next cursor', () => {
+    const first = listServers(snapshot, { limit: '2' });
+    const second = listServers(snapshot, { limit: '2', cursor: first.metadata?.next_cursor });
+
+    expect(first.servers).toHaveLength(2);
+    expect(second.servers.map(s => s.name)).toEqual(['ai.nimbletools/weather']);
+    expect(second.metadata?.next_cursor).toBeUndefined();
+  });
+});
+
+describe('cursor pagination', () => {
+  const walk = (target: typeof snapshot, cursor?: string) => listServers(target, { limit: '1', cursor });
+
+  it('should issue opaque cursors carrying the last name', () => {
+    const cursor = listServers(snapshot, { limit: '1' }).metadata?.next_cursor;
+
+    expect(cursor).not.toMatch(/^\d+$/);
+    expect(decodeCursor(cursor!)).toEqual({ k: 'ai.nimbletools/echo' });
+  });
+
+  it('should neither skip nor repeat servers when the catalog changes between pages', () => {
+    const first = walk(snapshot);
+    // A server sorting before the cursor is added between requests
+    const changed = createSnapshot([...snapshot.sources.values(), source('alpha')]);
+    const second = walk(changed, first.metadata?.next_cursor);
+    const third = walk(changed, second.metadata?.next_cursor);
+
+    expect([first, second, third].flatMap(page => page.servers.map(s => s.name))).toEqual([
+      'ai.nimbletools/echo',
+      'ai.nimbletools/github',
+      'ai.nimbletools/weather'
+    ]);
+    expect(third.metadata?.next_cursor).toBeUndefined();
+  });
+
+  it('should resume after a name that has since been removed', () => {
+    const cursor = encodeCursor({ k: 'ai.nimbletools/fetch' });
+
+    expect(walk(snapshot, cursor).servers.map(s => s.name)).toEqual(['ai.nimbletools/github']);
+  });
+
+  it('should page relevance-ordered results by offset', () => {
+    const first = listServers(snapshot, { search: 'nimbletools', sort: 'relevance', limit: '1' });
+
+    expect(decodeCursor(first.metadata!.next_cursor!)).toEqual({ o: 1, s: snapshot.id });
+  });
+
+  it('should reject relevance cursors from another snapshot or sort order', () => {
+    const relevance = { search: 'nimbletools', sort: 'relevance' };
+    const offset = decodeCursor(listServers(snapshot, { ...relevance, limit: '1' }).metadata!.next_cursor!)!;
+    const keyset = decodeCursor(listServers(snapshot, { limit: '1' }).metadata!.next_cursor!)!;
+    const changed = createSnapshot([...snapshot.sources.values(), source('alpha')]);
+
+    expect(cursorProblem(offset, snapshot, relevance)).toBeNull();
+    expect(cursorProblem(offset, changed, relevance)).toMatch(/expired/);
+    expect(cursorProblem(offset, snapshot, { search: 'nimbletools' })).toMatch(/sort order/);
+    expect(cursorProblem(keyset, changed, {})).toBeNull();
+    expect(cursorProblem(keyset, snapshot, relevance)).toMatch(/sort order/);
+    expect(cursorProblem(decodeCursor('2')!, changed, relevance)).toBeNull();
+  });
+
+  it('should accept legacy integer cursors and reject malformed ones', () => {
+    expect(walk(snapshot, '2').servers.map(s => s.name)).toEqual(['ai.nimbletools/weather']);
+    expect(decodeCursor('not-a-cursor')).toBeNull();
+    expect(decodeCursor(encodeCursor({ o: -1 }))).toBeNull();
+  });
+});
+
+describe('listQueryKey', () => {
+  it('should treat equivalent queries as the same key', () => {
+    expect(listQueryKey({ search: 'Echo' })).toBe(listQueryKey({ search: 'echo' }));
+    expect(listQueryKey({ updated_since: '2025-01-01T00:00:00Z' }))
+      .toBe(listQueryKey({ updated_since: '2025-01-01T00:00:00.000Z' }));
+    expect(listQueryKey({ limit: '2' })).not.toBe(listQueryKey({ limit: '3' }));
+    expect(listQueryKey({ fields: 'title,name' })).toBe(listQueryKey({ fields: 'title' }));
+    expect(listQueryKey({ fields: 'title' })).not.toBe(listQueryKey({}));
+  });
+});
+
+describe('resolveVersion', () => {
+  const file = (version: string) => ({
+    content: Buffer.from(JSON.stringify({ name: 'ai.nimbletools/clickhouse', version, description: 'ClickHouse' })),
+    timestamps: { publishedAt: '2025-01-01T00:00:00.000Z', updatedAt: '2025-01-01T00:00:00.000Z' }
+  });
+  const current = file('0.2.0');
+  const versions = createSnapshot([
+    createSource('clickhouse', current.content, current.timestamps, ['0.1.12', '0.1.13-mcpb.1', '0.1.2'].map(file))
+  ]).versions.get('ai.nimbletools/clickhouse')!;
+  const resolve = (requested: string) => resolveVersion(versions, requested)?.version;
+
+  it('should resolve exact versions and latest', () => {
+    expect(resolve('0.1.2')).toBe('0.1.2');
+    expect(resolve('latest')).toBe('0.2.0');
+  });
+
+  it('should resolve a range to the newest matching version', () => {
+    expect(resolve('^0.1')).toBe('0.1.13-mcpb.1');
+    expect(resolve('~0.1.2 || <0.1')).toBe('0.1.13-mcpb.1');
+    expect(resolve('0.1.2 - 0.1.12')).toBe('0.1.12');
+  });
+
+  it('should return undefined when nothing matches', () => {
+    expect(resolve('^1')).toBeUndefined();
+    expect(resolve('9.9.9')).toBeUndefined();
+    expect(resolve('not a range')).toBeUndefined();
+  });
+});
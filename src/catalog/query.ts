@@ -0,0 +1,227 @@
+/**
+ * List query evaluation against a catalog snapshot
+ */
+
+import type { MCPServerDetail, ServerListResponse } from '../types/api.js';
+import { bitsetPositions, FACETS, hasPosition, parseFacetValues, type FacetFilters } from './facets.js';
+import { normalizePlatform } from './platforms.js';
+import { parseFields, projector } from './projection.js';
+import { parseRange, satisfies } from './semver.js';
+import type { CatalogSnapshot, ServerVersions } from './snapshot.js';
+
+export interface ListServersQuery extends FacetFilters {
+  cursor?: string;
+  limit?: string;
+  search?: string;
+  version?: string;
+  updated_since?: string;
+  sort?: string;
+  /** Comma-separated paths to include in each server (sparse fieldset) */
+  fields?: string;
+  /** "true" to include facet counts of the matching servers */
+  facets?: string;
+  /** Keep only the packages for this platform, e.g. linux-arm64 */
+  platform?: string;
+}
+
+const DEFAULT_LIMIT = 100;
+const MAX_LIMIT = 500;
+
+/**
+ * Normalize list parameters so equivalent requests share one cache
+ * entry and ETag
+ */
+export function listQueryKey(query: ListServersQuery): string {
+  return JSON.stringify([
+    query.cursor ?? '',
+    query.limit ?? '',
+    query.search?.toLowerCase() ?? '',
+    query.version ?? '',
+    query.updated_since ? Date.parse(query.updated_since) : '',
+    query.search && query.sort === 'relevance' ? 'relevance' : '',
+    parseFields(query.fields)?.join(',') ?? '',
+    FACETS.map(facet => parseFacetValues(query[facet]).join(',')),
+    query.facets === 'true',
+    normalizePlatform(query.platform) ?? ''
+  ]);
+}
+
+/**
+ * Decoded pagination cursor. Name-ordered pages resume after the last
+ * name seen (`k`), which stays correct when servers are added or removed
+ * between requests; relevance-ordered pages resume at an offset (`o`),
+ * which is only meaningful against the snapshot it was issued for (`s`).
+ */
+export interface ListCursor {
+  /** Name of the last server on the previous page */
+  k?: string;
+  /** Offset into the result list */
+  o?: number;
+  /** Id of the snapshot a relevance-ordered page was served from */
+  s?: string;
+}
+
+/**
+ * Encode a cursor as an opaque URL-safe string
+ */
+export function encodeCursor(cursor: ListCursor): string {
+  return Buffer.from(JSON.stringify(cursor)).toString('base64url');
+}
+
+/**
+ * Decode a cursor, or return null when it is malformed. Plain integers
+ * are accepted as offsets for clients holding cursors from older versions.
+ */
+export function decodeCursor(cursor: string): ListCursor | null {
+  if (/^\d+$/.test(cursor)) {
+    return { o: parseInt(cursor, 10) };
+  }
+
+  try {
+    const decoded = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf-8'));
+    if (decoded && typeof decoded === 'object'
+      && (typeof decoded.k === 'string' || (Number.isInteger(decoded.o) && decoded.o >= 0))) {
+      return decoded as ListCursor;
+    }
+  } catch {
+    // Fall through to invalid
+  }
+  return null;
+}
+
+/**
+ * Why a decoded cursor cannot continue this list request, or null when
+ * it can. Legacy integer offsets (no snapshot id) are always accepted.
+ */
+export function cursorProblem(cursor: ListCursor, snapshot: CatalogSnapshot, query: ListServersQuery): string | null {
+  const byRelevance = Boolean(query.search) && query.sort === 'relevance';
+  if (byRelevance ? cursor.k !== undefined : cursor.s !== undefined) {
+    return 'Cursor does not match the requested sort order';
+  }
+  if (cursor.s !== undefined && cursor.s !== snapshot.id) {
+    return 'Cursor has expired because the catalog changed; start from the first page';
+  }
+  return null;
+}
+
+/**
+ * First position in `positions` whose server name sorts after `name`
+ */
+function positionAfter(list: CatalogSnapshot['list'], positions: ArrayLike<number> | null, name: string): number {
+  let low = 0;
+  let high = positions ? positions.length : list.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    const candidate = list[positions ? positions[mid] : mid].name;
+    if (candidate <= name) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+/**
+ * Filter and paginate the snapshot for a list request
+ */
+export function listServers(snapshot: CatalogSnapshot, query: ListServersQuery): ServerListResponse {
+  const { list, derived } = snapshot;
+  // Positions into `list` that match the filters; null when unfiltered
+  let positions: number[] | null = null;
+  let byRelevance = false;
+
+  // Apply full-text search; results stay in name order unless sorted by relevance
+  const hits = query.search ? snapshot.search.search(query.search) : null;
+  if (hits) {
+    positions = hits.map(hit => hit.index);
+    byRelevance = query.sort === 'relevance';
+    if (!byRelevance) {
+      positions.sort((a, b) => a - b);
+    }
+  }
+
+  // Apply updated_since filter
+  if (query.updated_since) {
+    const since = Date.parse(query.updated_since);
+    if (!isNaN(since)) {
+      // Include servers without update timestamp
+      positions = (positions ?? list.map((_, i) => i))
+        .filter(i => isNaN(derived[i].updatedAtMs) || derived[i].updatedAtMs >= since);
+    }
+  }
+
+  // Apply facet filters: any value within a facet, every facet
+  const matched = snapshot.facets.match(query);
+  if (matched) {
+    positions = positions ? positions.filter(i => hasPosition(matched, i)) : bitsetPositions(matched);
+  }
+
+  // Note: version=latest is a no-op for us since we only serve latest versions
+
+  // Parse pagination parameters
+  const limit = Math.min(parseInt(query.limit || String(DEFAULT_LIMIT), 10), MAX_LIMIT);
+  const total = positions ? positions.length : list.length;
+  const cursor = query.cursor ? decodeCursor(query.cursor) : null;
+
+  let startIdx = 0;
+  if (cursor?.k !== undefined && !byRelevance) {
+    // Keyset: resume after the last name seen, by binary search
+    startIdx = positionAfter(list, positions, cursor.k);
+  } else if (cursor?.o !== undefined) {
+    startIdx = cursor.o;
+  }
+  const endIdx = Math.min(startIdx + limit, total);
+
+  // Paginate results
+  const paginated: MCPServerDetail[] = [];
+  for (let i = startIdx; i < endIdx; i++) {
+    paginated.push(list[positions ? positions[i] : i]);
+  }
+
+  const platform = normalizePlatform(query.platform);
+  let servers = platform ? paginated.map(server => snapshot.platforms.select(server, platform)) : paginated;
+  const fields = parseFields(query.fields);
+  if (fields) {
+    servers = servers.map(projector(fields));
+  }
+
+  const response: ServerListResponse = {
+    servers,
+    metadata: {
+      count: paginated.length
+    }
+  };
+
+  if (query.facets === 'true' && response.metadata) {
+    response.metadata.facets = snapshot.facets.count(positions);
+  }
+
+  // Add next cursor if there are more results
+  if (endIdx < total && paginated.length > 0 && response.metadata) {
+    response.metadata.next_cursor = encodeCursor(byRelevance
+      ? { o: endIdx, s: snapshot.id }
+      : { k: paginated[paginated.length - 1].name });
+  }
+
+  return response;
+}
+
+/**
+ * Resolve a requested version against a server's versions: an exact
+ * version first, then "latest", then the newest version satisfying it
+ * as a semver range (such as `^0.1` or `>=1.2 <2`)
+ */
+export function resolveVersion(versions: ServerVersions, requested: string): MCPServerDetail | undefined {
+  const exact = versions.byVersion.get(requested);
+  if (exact) return exact;
+  if (requested === 'latest') return versions.list[0];
+
+  const range = parseRange(requested);
+  if (!range) return undefined;
+
+  // Versions are newest first after the latest, so the first match is the
+  // highest, except that the latest wins over versions rolled back from
+  const index = versions.semver.findIndex(version => version !== null && satisfies(version, range));
+  return index === -1 ? undefined : versions.list[index];
+}
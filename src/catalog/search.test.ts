@@ -0,0 +1,64 @@
+import { describe, it, expect } from 'vitest';
+import type { MCPServerDetail } from '../types/api.js';
+import { SearchIndex, tokenize } from './search.js';
+
+function server(name: string, fields: Partial<MCPServerDetail> = {}, tags: string[] = []): MCPServerDetail {
+  return {
+    name: `ai.nimbletools/${name}`,
+    version: '1.0.0',
+    description: `${name} server`,
+    ...fields,
+    _meta: { 'ai.nimbletools.mcp/v1': { display: { tags } } }
+  };
+}
+
+const servers = [
+  server('finnhub', { title: 'Finnhub', description: 'Stock market data and financial news' }, ['finance', 'stocks']),
+  server('github', {
+    title: 'GitHub',
+    description: 'Repositories, issues and pull requests',
+    packages: [{
+      registryType: 'mcpb',
+      identifier: 'github.mcpb',
+      transport: { type: 'streamable-http' },
+      environmentVariables: [{ name: 'GITHUB_TOKEN' }]
+    }]
+  }),
+  server('news', { description: 'Headlines from news sources about markets, finance and stocks' }, ['news'])
+];
+
+const index = new SearchIndex(servers);
+const names = (query: string) => index.search(query)?.map(hit => servers[hit.index].name);
+
+describe('tokenize', () => {
+  it('should split names and env vars on separators', () => {
+    expect(tokenize('ai.nimbletools/mcp-echo')).toEqual(['ai', 'nimbletools', 'mcp', 'echo']);
+    expect(tokenize('GITHUB_TOKEN')).toEqual(['github', 'token']);
+  });
+});
+
+describe('SearchIndex', () => {
+  it('should match whole words and word prefixes', () => {
+    expect(names('finnhub')).toEqual(['ai.nimbletools/finnhub']);
+    expect(names('Repo')).toEqual(['ai.nimbletools/github']);
+  });
+
+  it('should index tags and environment variable names', () => {
+    expect(names('token')).toEqual(['ai.nimbletools/github']);
+    expect(names('stocks')).toHaveLength(2);
+  });
+
+  it('should require every query term to match', () => {
+    expect(names('stock news')).toEqual(['ai.nimbletools/finnhub', 'ai.nimbletools/news'].sort());
+    expect(names('stock github')).toEqual([]);
+  });
+
+  it('should rank name and tag matches above description matches', () => {
+    expect(names('finance')).toEqual(['ai.nimbletools/finnhub', 'ai.nimbletools/news']);
+    expect(names('news')?.[0]).toBe('ai.nimbletools/news');
+  });
+
+  it('should return null for queries without searchable terms', () => {
+    expect(index.search('  /- ')).toBeNull();
+  });
+});
@@ -0,0 +1,179 @@
+/**
+ * Full-text search over a catalog snapshot
+ *
+ * An inverted index is built once per snapshot from each server's name,
+ * title, description, display tags and environment variable names.
+ * Queries are tokenized the same way; every query term must match
+ * (exactly or as a prefix of an indexed term) and matches are ranked
+ * with BM25, with per-field weights folded into the term frequencies.
+ */
+
+import type { MCPServerDetail } from '../types/api.js';
+
+/**
+ * Relative weight of a term occurrence in each indexed field
+ */
+const FIELD_WEIGHTS = {
+  name: 3,
+  title: 2,
+  tags: 2,
+  env: 1,
+  description: 1
+} as const;
+
+// BM25 parameters (standard defaults)
+const K1 = 1.2;
+const B = 0.75;
+
+// A prefix match counts for less than the exact term
+const PREFIX_WEIGHT = 0.5;
+
+export interface SearchHit {
+  /** Position of the server in the snapshot list */
+  readonly index: number;
+  readonly score: number;
+}
+
+/**
+ * Split text into lowercase alphanumeric terms. Separators such as
+ * `/ . - _` in names and env vars all split terms.
+ */
+export function tokenize(text: string): string[] {
+  return text.toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(Boolean);
+}
+
+function indexedFields(server: MCPServerDetail): Array<[keyof typeof FIELD_WEIGHTS, string]> {
+  const display = server._meta?.['ai.nimbletools.mcp/v1']?.display;
+
+  // Packages usually repeat the same variables per platform
+  const envNames = new Set<string>();
+  for (const pkg of server.packages ?? []) {
+    for (const variable of pkg.environmentVariables ?? []) {
+      envNames.add(variable.name);
+    }
+  }
+
+  return [
+    ['name', server.name],
+    ['title', server.title ?? ''],
+    ['description', server.description ?? ''],
+    ['tags', (display?.tags ?? []).join(' ')],
+    ['env', Array.from(envNames).join(' ')]
+  ];
+}
+
+/**
+ * Inverted index of one snapshot's servers. Immutable once built.
+ */
+export class SearchIndex {
+  /** Indexed terms, sorted so prefixes can be found by binary search */
+  private readonly terms: string[];
+  /** Per term: matching server positions and their weighted term frequency */
+  private readonly postings = new Map<string, { docs: Uint32Array; tf: Float32Array }>();
+  private readonly docLengths: Float32Array;
+  private readonly avgDocLength: number;
+
+  constructor(servers: readonly MCPServerDetail[]) {
+    const frequencies = new Map<string, Map<number, number>>();
+    this.docLengths = new Float32Array(servers.length);
+
+    servers.forEach((server, doc) => {
+      for (const [field, text] of indexedFields(server)) {
+        const weight = FIELD_WEIGHTS[field];
+        for (const term of tokenize(text)) {
+          let byDoc = frequencies.get(term);
+          if (!byDoc) {
+            byDoc = new Map();
+            frequencies.set(term, byDoc);
+          }
+          byDoc.set(doc, (byDoc.get(doc) ?? 0) + weight);
+          this.docLengths[doc] += weight;
+        }
+      }
+    });
+
+    for (const [term, byDoc] of frequencies) {
+      // Map iteration follows insertion order, so docs are already ascending
+      this.postings.set(term, {
+        docs: Uint32Array.from(byDoc.keys()),
+        tf: Float32Array.from(byDoc.values())
+      });
+    }
+
+    this.terms = Array.from(frequencies.keys()).sort();
+    const total = this.docLengths.reduce((sum, length) => sum + length, 0);
+    this.avgDocLength = servers.length > 0 ? total / servers.length : 0;
+  }
+
+  /**
+   * Servers matching every term of the query, best match first.
+   * Returns null when the query contains no searchable terms.
+   */
+  search(query: string): SearchHit[] | null {
+    const queryTerms = Array.from(new Set(tokenize(query)));
+    if (queryTerms.length === 0) return null;
+
+    const docCount = this.docLengths.length;
+    const scores = new Float64Array(docCount);
+    const matched = new Uint16Array(docCount);
+    // Best score per server for the current query term, across the exact
+    // term and its prefix expansions
+    const best = new Float64Array(docCount);
+    const touched: number[] = [];
+
+    for (const queryTerm of queryTerms) {
+      for (const term of this.expand(queryTerm)) {
+        const { docs, tf } = this.postings.get(term)!;
+        const idf = Math.log(1 + (docCount - docs.length + 0.5) / (docs.length + 0.5));
+        const weight = term === queryTerm ? 1 : PREFIX_WEIGHT;
+
+        for (let i = 0; i < docs.length; i++) {
+          const doc = docs[i];
+          const norm = K1 * (1 - B + B * this.docLengths[doc] / this.avgDocLength);
+          const score = weight * idf * (tf[i] * (K1 + 1)) / (tf[i] + norm);
+          if (best[doc] === 0) touched.push(doc);
+          if (score > best[doc]) best[doc] = score;
+        }
+      }
+
+      if (touched.length === 0) return [];
+      for (const doc of touched) {
+        matched[doc]++;
+        scores[doc] += best[doc];
+        best[doc] = 0;
+      }
+      touched.length = 0;
+    }
+
+    const hits: SearchHit[] = [];
+    for (let doc = 0; doc < docCount; doc++) {
+      if (matched[doc] === queryTerms.length) {
+        hits.push({ index: doc, score: scores[doc] });
+      }
+    }
+    // Ties keep name order
+    return hits.sort((a, b) => b.score - a.score || a.index - b.index);
+  }
+
+  /**
+   * Indexed terms starting with the given prefix (including the term itself)
+   */
+  private expand(prefix: string): string[] {
+    let low = 0;
+    let high = this.terms.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (this.terms[mid] < prefix) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+
+    const expansions: string[] = [];
+    for (let i = low; i < this.terms.length && this.terms[i].startsWith(prefix); i++) {
+      expansions.push(this.terms[i]);
+    }
+    return expansions;
+  }
+}
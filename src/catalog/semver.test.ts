@@ -0,0 +1,69 @@
+import { describe, it, expect } from 'vitest';
+import { compareVersions, parseRange, parseVersion, satisfies } from './semver.js';
+
+describe('parseVersion', () => {
+  it('should parse release and pre-release versions', () => {
+    expect(parseVersion('1.2.3')).toEqual({ major: 1, minor: 2, patch: 3, prerelease: [] });
+    expect(parseVersion('v1.0.0-beta.2+build.5')).toEqual({ major: 1, minor: 0, patch: 0, prerelease: ['beta', 2] });
+  });
+
+  it('should reject invalid versions', () => {
+    expect(parseVersion('1.0')).toBeNull();
+    expect(parseVersion('01.0.0')).toBeNull();
+    expect(parseVersion('latest')).toBeNull();
+  });
+});
+
+describe('compareVersions', () => {
+  it('should order versions by semver precedence', () => {
+    const versions = ['1.0.0', '1.0.0-rc.1', '0.9.0', '1.10.0', '1.2.0', '1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-beta'];
+
+    expect(versions.sort(compareVersions)).toEqual([
+      '0.9.0',
+      '1.0.0-alpha',
+      '1.0.0-alpha.1',
+      '1.0.0-beta',
+      '1.0.0-rc.1',
+      '1.0.0',
+      '1.2.0',
+      '1.10.0'
+    ]);
+  });
+
+  it('should sort invalid versions before valid ones', () => {
+    expect(['1.0.0', 'snapshot', '0.1.0'].sort(compareVersions)).toEqual(['snapshot', '0.1.0', '1.0.0']);
+  });
+});
+
+describe('parseRange', () => {
+  const matching = (range: string, versions: string[]) => {
+    const parsed = parseRange(range)!;
+    return versions.filter(version => satisfies(parseVersion(version)!, parsed));
+  };
+  const versions = ['0.0.3', '0.1.0', '0.1.12', '0.1.13-mcpb.1', '0.2.0-beta', '0.2.0', '1.0.0', '1.4.2', '2.0.0'];
+
+  it('should resolve caret ranges, including pre-release tags', () => {
+    expect(matching('^0.1', versions)).toEqual(['0.1.0', '0.1.12', '0.1.13-mcpb.1']);
+    expect(matching('^1.0.0', versions)).toEqual(['1.0.0', '1.4.2']);
+    expect(matching('^0.0.3', versions)).toEqual(['0.0.3']);
+  });
+
+  it('should resolve tilde and x-ranges', () => {
+    expect(matching('~0.1.12', versions)).toEqual(['0.1.12', '0.1.13-mcpb.1']);
+    expect(matching('1.x', versions)).toEqual(['1.0.0', '1.4.2']);
+    expect(matching('*', versions)).toEqual(versions);
+  });
+
+  it('should resolve comparators, hyphen ranges and alternatives', () => {
+    expect(matching('>=0.2.0 <2', versions)).toEqual(['0.2.0', '1.0.0', '1.4.2']);
+    expect(matching('> 1', versions)).toEqual(['2.0.0']);
+    expect(matching('0.1.12 - 1.0', versions)).toEqual(['0.1.12', '0.1.13-mcpb.1', '0.2.0-beta', '0.2.0', '1.0.0']);
+    expect(matching('^2 || 0.0.3', versions)).toEqual(['0.0.3', '2.0.0']);
+  });
+
+  it('should reject malformed ranges', () => {
+    expect(parseRange('latest')).toBeNull();
+    expect(parseRange('^a.b')).toBeNull();
+    expect(parseRange('>=1.0.0 <')).toBeNull();
+  });
+});
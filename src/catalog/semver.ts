@@ -0,0 +1,252 @@
+/**
+ * Semantic version parsing and ordering (https://semver.org)
+ *
+ * Only what the registry needs to order a server's versions; versions
+ * that are not valid semver still sort deterministically, before every
+ * valid one.
+ */
+
+export interface SemVer {
+  major: number;
+  minor: number;
+  patch: number;
+  /** Dot-separated pre-release identifiers (numeric ones as numbers) */
+  prerelease: Array<string | number>;
+}
+
+const SEMVER_PATTERN = /^v?(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$/;
+
+/**
+ * Parse a version string, or return null when it is not valid semver.
+ * A leading "v" is tolerated; build metadata is ignored.
+ */
+export function parseVersion(version: string): SemVer | null {
+  const match = SEMVER_PATTERN.exec(version.trim());
+  if (!match) return null;
+
+  return {
+    major: Number(match[1]),
+    minor: Number(match[2]),
+    patch: Number(match[3]),
+    prerelease: match[4]
+      ? match[4].split('.').map(id => (/^\d+$/.test(id) ? Number(id) : id))
+      : []
+  };
+}
+
+function compareIdentifiers(a: string | number, b: string | number): number {
+  if (typeof a === 'number' && typeof b === 'number') return a - b;
+  // Numeric identifiers have lower precedence than alphanumeric ones
+  if (typeof a === 'number') return -1;
+  if (typeof b === 'number') return 1;
+  return a < b ? -1 : a > b ? 1 : 0;
+}
+
+/**
+ * Compare two parsed versions by semver precedence
+ */
+export function compareSemVer(a: SemVer, b: SemVer): number {
+  const core = a.major - b.major || a.minor - b.minor || a.patch - b.patch;
+  if (core !== 0) return core;
+
+  // A pre-release has lower precedence than the release itself
+  if (a.prerelease.length === 0 || b.prerelease.length === 0) {
+    return b.prerelease.length - a.prerelease.length;
+  }
+
+  const length = Math.min(a.prerelease.length, b.prerelease.length);
+  for (let i = 0; i < length; i++) {
+    const order = compareIdentifiers(a.prerelease[i], b.prerelease[i]);
+    if (order !== 0) return order;
+  }
+  return a.prerelease.length - b.prerelease.length;
+}
+
+/**
+ * Compare two version strings by semver precedence, usable with
+ * Array.prototype.sort (ascending)
+ */
+export function compareVersions(a: string, b: string): number {
+  const parsedA = parseVersion(a);
+  const parsedB = parseVersion(b);
+
+  if (parsedA && parsedB) return compareSemVer(parsedA, parsedB);
+  if (parsedA) return 1;
+  if (parsedB) return -1;
+  return a < b ? -1 : a > b ? 1 : 0;
+}
+
+type Operator = '<' | '<=' | '>' | '>=' | '=';
+
+interface Comparator {
+  operator: Operator;
+  version: SemVer;
+}
+
+/**
+ * A parsed range: satisfied when every comparator of any one set matches
+ */
+export type VersionRange = Comparator[][];
+
+/** A partial version such as `1`, `1.2`, `1.x` or `1.2.3-beta`; null parts are wildcards */
+interface PartialVersion {
+  major: number | null;
+  minor: number | null;
+  patch: number | null;
+  prerelease: Array<string | number>;
+}
+
+const PARTIAL_PATTERN = /^v?(\d+|[xX*])(?:\.(\d+|[xX*])(?:\.(\d+|[xX*])(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z-.]+)?)?)?$/;
+
+function parsePartial(text: string): PartialVersion | null {
+  const match = PARTIAL_PATTERN.exec(text);
+  if (!match) return null;
+
+  const part = (value: string | undefined) => (value === undefined || /^[xX*]$/.test(value) ? null : Number(value));
+  const major = part(match[1]);
+  const minor = major === null ? null : part(match[2]);
+  const patch = minor === null ? null : part(match[3]);
+  return {
+    major,
+    minor,
+    patch,
+    prerelease: patch !== null && match[4]
+      ? match[4].split('.').map(id => (/^\d+$/.test(id) ? Number(id) : id))
+      : []
+  };
+}
+
+function semver(major: number, minor: number, patch: number, prerelease: Array<string | number> = []): SemVer {
+  return { major, minor, patch, prerelease };
+}
+
+// `-0` is the lowest pre-release of a version, so `< x.y.z-0` excludes
+// every pre-release of x.y.z while still admitting those of lower versions
+const lowest = (major: number, minor: number, patch: number) => semver(major, minor, patch, [0]);
+
+/** Inclusive lower bound of a partial, filling wildcards with zeros */
+function lowerBound(p: PartialVersion): Comparator[] {
+  if (p.major === null) return [];
+  if (p.minor === null) return [{ operator: '>=', version: lowest(p.major, 0, 0) }];
+  if (p.patch === null) return [{ operator: '>=', version: lowest(p.major, p.minor, 0) }];
+  return [{ operator: '>=', version: semver(p.major, p.minor, p.patch, p.prerelease) }];
+}
+
+/** Exclusive bound just above every version the partial covers */
+function upperBound(p: PartialVersion): Comparator[] {
+  if (p.major === null) return [];
+  if (p.minor === null) return [{ operator: '<', version: lowest(p.major + 1, 0, 0) }];
+  if (p.patch === null) return [{ operator: '<', version: lowest(p.major, p.minor + 1, 0) }];
+  return [{ operator: '<=', version: semver(p.major, p.minor, p.patch, p.prerelease) }];
+}
+
+function caret(p: PartialVersion): Comparator[] {
+  if (p.major === null) return [];
+  let upper: SemVer;
+  if (p.major > 0 || p.minor === null) {
+    upper = lowest(p.major + 1, 0, 0);
+  } else if (p.minor > 0 || p.patch === null) {
+    upper = lowest(0, p.minor + 1, 0);
+  } else {
+    upper = lowest(0, 0, p.patch + 1);
+  }
+  return [...lowerBound(p), { operator: '<', version: upper }];
+}
+
+function tilde(p: PartialVersion): Comparator[] {
+  if (p.major === null) return [];
+  const upper = p.minor === null ? lowest(p.major + 1, 0, 0) : lowest(p.major, p.minor + 1, 0);
+  return [...lowerBound(p), { operator: '<', version: upper }];
+}
+
+function primitive(operator: Operator, p: PartialVersion): Comparator[] {
+  if (p.major === null) {
+    // `<*` and `>*` can never match; everything else matches anything
+    return operator === '<' || operator === '>' ? [{ operator: '<', version: lowest(0, 0, 0) }] : [];
+  }
+  if (p.patch !== null) {
+    return [{ operator, version: semver(p.major, p.minor!, p.patch, p.prerelease) }];
+  }
+
+  switch (operator) {
+    case '=':
+      return [...lowerBound(p), ...upperBound(p)];
+    case '>=':
+      return lowerBound(p);
+    case '<':
+      return [{ operator: '<', version: lowerBound(p)[0].version }];
+    case '>':
+      return [{ operator: '>=', version: upperBound(p)[0].version }];
+    case '<=':
+      return upperBound(p);
+  }
+}
+
+function parseComparator(text: string): Comparator[] | null {
+  const match = /^(<=|>=|<|>|=|\^|~)?(.*)$/.exec(text)!;
+  const partial = parsePartial(match[2]);
+  if (!partial) return null;
+
+  switch (match[1]) {
+    case '^':
+      return caret(partial);
+    case '~':
+      return tilde(partial);
+    case undefined:
+      return primitive('=', partial);
+    default:
+      return primitive(match[1] as Operator, partial);
+  }
+}
+
+/**
+ * Parse an npm-style range: `^1.2`, `~0.1.3`, `1.x`, `*`, `>=1.0.0 <2`,
+ * `1.0.0 - 1.4`, and `||` alternatives. Pre-release versions are matched
+ * like any other version, so `^0.1` includes `0.1.13-mcpb.1`.
+ * Returns null when the range is malformed.
+ */
+export function parseRange(range: string): VersionRange | null {
+  const sets: VersionRange = [];
+
+  for (const alternative of range.split('||')) {
+    // Allow whitespace between an operator and its version ("> 1.2")
+    const text = alternative.trim().replace(/(<=|>=|<|>|=|\^|~)\s+/g, '$1');
+    const comparators: Comparator[] = [];
+
+    const hyphen = /^(\S+)\s+-\s+(\S+)$/.exec(text);
+    if (hyphen) {
+      const from = parsePartial(hyphen[1]);
+      const to = parsePartial(hyphen[2]);
+      if (!from || !to) return null;
+      comparators.push(...lowerBound(from), ...upperBound(to));
+    } else if (text !== '') {
+      for (const part of text.split(/\s+/)) {
+        const parsed = parseComparator(part);
+        if (!parsed) return null;
+        comparators.push(...parsed);
+      }
+    }
+
+    sets.push(comparators);
+  }
+
+  return sets;
+}
+
+function matches(version: SemVer, { operator, version: bound }: Comparator): boolean {
+  const order = compareSemVer(version, bound);
+  switch (operator) {
+    case '<': return order < 0;
+    case '<=': return order <= 0;
+    case '>': return order > 0;
+    case '>=': return order >= 0;
+    case '=': return order === 0;
+  }
+}
+
+/**
+ * Whether a version satisfies a parsed range
+ */
+export function satisfies(version: SemVer, range: VersionRange): boolean {
+  return range.some(set => set.every(comparator => matches(version, comparator)));
+}
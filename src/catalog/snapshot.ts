@@ -0,0 +1,134 @@
+/**
+ * Immutable catalog snapshot
+ *
+ * A snapshot is built once from a set of parsed server definitions and never
+ * mutated afterwards. Request handlers read from it without any I/O; a new
+ * snapshot replaces the old one atomically when the definitions change.
+ */
+
+import { createHash } from 'crypto';
+import type { MCPServerDetail } from '../types/api.js';
+import { versionFingerprint } from './changes.js';
+import { FacetIndex } from './facets.js';
+import type { CatalogSource } from './loader.js';
+import { PlatformIndex } from './platforms.js';
+import { SearchIndex } from './search.js';
+import { parseVersion, type SemVer } from './semver.js';
+
+/**
+ * Per-server fields derived once at build time
+ */
+export interface DerivedFields {
+  /** updatedAt as epoch milliseconds (NaN when absent) */
+  readonly updatedAtMs: number;
+}
+
+/**
+ * Every version of one server
+ */
+export interface ServerVersions {
+  /** The latest version (server.json), then older versions newest first */
+  readonly list: readonly MCPServerDetail[];
+  /** Versions keyed by version string */
+  readonly byVersion: ReadonlyMap<string, MCPServerDetail>;
+  /** Parsed versions, index-aligned with `list` (null when not semver) */
+  readonly semver: ReadonlyArray<SemVer | null>;
+}
+
+export interface CatalogSnapshot {
+  /**
+   * Content-derived identifier; identical definitions with identical
+   * registry metadata (latest flags, timestamps) yield the same id
+   */
+  readonly id: string;
+  /** Epoch milliseconds at which this snapshot was built */
+  readonly builtAt: number;
+  /** Latest version of each server, keyed by name */
+  readonly servers: ReadonlyMap<string, MCPServerDetail>;
+  /** All versions of each server, keyed by name */
+  readonly versions: ReadonlyMap<string, ServerVersions>;
+  /** Latest version of each server, sorted by name */
+  readonly list: readonly MCPServerDetail[];
+  /** Derived fields, index-aligned with `list` */
+  readonly derived: readonly DerivedFields[];
+  /** Full-text index over `list` */
+  readonly search: SearchIndex;
+  /** Facet bitsets over `list` */
+  readonly facets: FacetIndex;
+  /** Platform-specific variants of every version */
+  readonly platforms: PlatformIndex;
+  /** Sources the snapshot was built from, keyed by directory */
+  readonly sources: ReadonlyMap<string, CatalogSource>;
+}
+
+/**
+ * Recursively freeze an object graph
+ */
+export function deepFreeze<T>(value: T): T {
+  if (value && typeof value === 'object' && !Object.isFrozen(value)) {
+    Object.freeze(value);
+    for (const child of Object.values(value as Record<string, unknown>)) {
+      deepFreeze(child);
+    }
+  }
+  return value;
+}
+
+function deriveFields(server: MCPServerDetail): DerivedFields {
+  const updatedAt = server._meta?.['io.modelcontextprotocol.registry/official']?.updatedAt;
+  return Object.freeze({
+    updatedAtMs: updatedAt ? Date.parse(updatedAt) : NaN
+  });
+}
+
+/**
+ * Build a frozen snapshot from parsed sources
+ */
+export function createSnapshot(sources: Iterable<CatalogSource>): CatalogSnapshot {
+  const byDirectory = new Map<string, CatalogSource>();
+  for (const source of sources) {
+    byDirectory.set(source.directory, source);
+  }
+
+  const directories = Array.from(byDirectory.keys()).sort();
+  const servers = new Map<string, MCPServerDetail>();
+  const versions = new Map<string, ServerVersions>();
+
+  for (const directory of directories) {
+    const { server, history } = byDirectory.get(directory)!;
+    if (servers.has(server.name)) {
+      console.error(`Duplicate server name '${server.name}' in ${directory}, overriding earlier definition`);
+    }
+    servers.set(server.name, deepFreeze(server));
+
+    const newestFirst = [server, ...deepFreeze(history).slice().reverse()];
+    versions.set(server.name, Object.freeze({
+      list: Object.freeze(newestFirst),
+      byVersion: new Map(newestFirst.map(version => [version.version, version])),
+      semver: Object.freeze(newestFirst.map(version => parseVersion(version.version)))
+    }));
+  }
+
+  const list = Array.from(servers.values()).sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0));
+
+  const hash = createHash('sha256');
+  for (const directory of directories) {
+    const source = byDirectory.get(directory)!;
+    // Timestamps are not part of the digest, but are part of every response
+    const fingerprints = [...source.history, source.server].map(versionFingerprint).join(',');
+    hash.update(`${directory}\u0000${source.digest}\u0000${fingerprints}\n`);
+  }
+
+  return Object.freeze({
+    id: hash.digest('hex').slice(0, 16),
+    builtAt: Date.now(),
+    servers,
+    versions,
+    list: Object.freeze(list),
+    derived: Object.freeze(list.map(deriveFields)),
+    search: new SearchIndex(list),
+    facets: new FacetIndex(list),
+    platforms: new PlatformIndex(Array.from(versions.values()).flatMap(server => server.list)),
+    sources: byDirectory
+  });
+}
@@ -0,0 +1,315 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { mkdtemp, mkdir, rm, utimes, writeFile } from 'fs/promises';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { buildCatalogArtifact } from './artifact.js';
+import { readServersDir } from './loader.js';
+import { CatalogStore } from './store.js';
+
+async function writeServer(root: string, directory: string, overrides: Record<string, unknown> = {}) {
+  await mkdir(join(root, directory), { recursive: true });
+  await writeFile(join(root, directory, 'server.json'), JSON.stringify({
+    name: `ai.nimbletools/${directory}`,
+    version: '1.0.0',
+    description: `${directory} server`,
+    ...overrides
+  }));
+}
+
+async function writeVersion(root: string, directory: string, version: string, overrides: Record<string, unknown> = {}) {
+  await mkdir(join(root, directory, 'versions'), { recursive: true });
+  await writeFile(join(root, directory, 'versions', `${version}.json`), JSON.stringify({
+    name: `ai.nimbletools/${directory}`,
+    version,
+    description: `${directory} server ${version}`,
+    ...overrides
+  }));
+}
+
+describe('CatalogStore', () => {
+  let serversDir: string;
+  let store: CatalogStore;
+
+  beforeEach(async () => {
+    serversDir = await mkdtemp(join(tmpdir(), 'catalog-'));
+    await writeServer(serversDir, 'zeta');
+    await writeServer(serversDir, 'alpha');
+    store = new CatalogStore({ serversDir, refreshIntervalMs: 0 });
+  });
+
+  afterEach(async () => {
+    store.close();
+    await rm(serversDir, { recursive: true, force: true });
+  });
+
+  it('should build a sorted, frozen snapshot on load', async () => {
+    const snapshot = await store.load();
+
+    expect(snapshot.list.map(s => s.name)).toEqual(['ai.nimbletools/alpha', 'ai.nimbletools/zeta']);
+    expect(snapshot.servers.get('ai.nimbletools/zeta')).toBe(snapshot.list[1]);
+    expect(Object.isFrozen(snapshot.list[0])).toBe(true);
+    expect(Object.isFrozen(snapshot.list[0]._meta)).toBe(true);
+  });
+
+  it('should keep the same snapshot when nothing changed', async () => {
+    const first = await store.load();
+    const second = await store.refresh();
+
+    expect(second).toBe(first);
+  });
+
+  it('should swap in a new snapshot when a definition changes', async () => {
+    const first = await store.load();
+    await writeServer(serversDir, 'alpha', { version: '1.1.0', description: 'changed' });
+
+    const second = await store.refresh();
+
+    expect(second).not.toBe(first);
+    expect(second.id).not.toBe(first.id);
+    expect(second.servers.get('ai.nimbletools/alpha')?.version).toBe('1.1.0');
+    // The previous snapshot is untouched
+    expect(first.servers.get('ai.nimbletools/alpha')?.version).toBe('1.0.0');
+  });
+
+  it('should derive registry metadata from file content', async () => {
+    const first = await store.load();
+    const reloaded = await new CatalogStore({ serversDir, refreshIntervalMs: 0 }).load();
+    const meta = (snapshot: typeof first) =>
+      snapshot.servers.get('ai.nimbletools/alpha')?._meta?.['io.modelcontextprotocol.registry/official'];
+
+    expect(reloaded.id).toBe(first.id);
+    expect(meta(reloaded)).toEqual(meta(first));
+
+    await writeServer(serversDir, 'alpha', { version: '1.1.0' });
+    const changed = await store.refresh();
+
+    expect(meta(changed)?.versionId).not.toBe(meta(first)?.versionId);
+  });
+
+  it('should coalesce concurrent reloads into one', async () => {
+    const results = await Promise.all([store.load(), store.load(), store.refresh()]);
+
+    expect(results[1]).toBe(results[0]);
+    expect(results[2]).toBe(results[0]);
+    expect(store.stats.reloads).toBe(1);
+    expect(store.stats.coalescedReloads).toBe(2);
+  });
+
+  it('should time each rebuild', async () => {
+    await store.load();
+    await writeServer(serversDir, 'beta');
+    await store.load();
+
+    expect(store.stats.reloads).toBe(2);
+    expect(store.stats.lastReloadMs).toBeGreaterThan(0);
+    expect(store.stats.reloadTimeMs).toBeGreaterThanOrEqual(store.stats.lastReloadMs);
+  });
+
+  it('should skip directories with invalid JSON', async () => {
+    await mkdir(join(serversDir, 'broken'));
+    await writeFile(join(serversDir, 'broken', 'server.json'), '{ not json');
+
+    const snapshot = await store.load();
+
+    expect(snapshot.list).toHaveLength(2);
+  });
+
+  it('should index every version from versions/ and mark server.json as latest', async () => {
+    await writeServer(serversDir, 'alpha', { version: '1.2.0' });
+    await writeVersion(serversDir, 'alpha', '1.0.0');
+    await writeVersion(serversDir, 'alpha', '1.1.0');
+    // A copy of the current version is superseded by server.json
+    await writeVersion(serversDir, 'alpha', '1.2.0', { description: 'stale copy' });
+
+    const snapshot = await store.load();
+    const versions = snapshot.versions.get('ai.nimbletools/alpha')!;
+    const isLatest = (version: string) =>
+      versions.byVersion.get(version)?._meta?.['io.modelcontextprotocol.registry/official']?.isLatest;
+
+    expect(versions.list.map(s => s.version)).toEqual(['1.2.0', '1.1.0', '1.0.0']);
+    expect(snapshot.servers.get('ai.nimbletools/alpha')?.version).toBe('1.2.0');
+    expect(versions.byVersion.get('1.2.0')?.description).toBe('alpha server');
+    expect(isLatest('1.2.0')).toBe(true);
+    expect(isLatest('1.1.0')).toBe(false);
+    expect(snapshot.list).toHaveLength(2);
+  });
+
+  it('should keep server.json as latest after a rollback', async () => {
+    await writeServer(serversDir, 'alpha', { version: '1.1.0' });
+    await writeVersion(serversDir, 'alpha', '1.2.0');
+
+    const snapshot = await store.load();
+    const versions = snapshot.versions.get('ai.nimbletools/alpha')!;
+
+    expect(snapshot.servers.get('ai.nimbletools/alpha')?.version).toBe('1.1.0');
+    expect(versions.list.map(s => s.version)).toEqual(['1.1.0', '1.2.0']);
+    expect(versions.byVersion.get('1.2.0')?._meta?.['io.modelcontextprotocol.registry/official']?.isLatest).toBe(false);
+  });
+
+  it('should skip versions/ files that are invalid or belong elsewhere', async () => {
+    await writeVersion(serversDir, 'alpha', '0.9.0');
+    await writeVersion(serversDir, 'alpha', '0.8.0', { name: 'ai.nimbletools/zeta' });
+    await writeVersion(serversDir, 'alpha', '0.7.0', { version: '0.6.0' });
+    await writeFile(join(serversDir, 'alpha', 'versions', '0.5.0.json'), '{ not json');
+
+    const snapshot = await store.load();
+
+    expect(snapshot.versions.get('ai.nimbletools/alpha')?.list.map(s => s.version)).toEqual(['1.0.0', '0.9.0']);
+    expect(snapshot.versions.get('ai.nimbletools/zeta')?.list.map(s => s.version)).toEqual(['1.0.0']);
+  });
+
+  it('should record what each swap added, updated and removed', async () => {
+    await store.load();
+    expect(store.changes.sequence).toBe(2);
+
+    await writeServer(serversDir, 'zeta', { description: 'changed' });
+    await rm(join(serversDir, 'alpha'), { recursive: true });
+    await writeServer(serversDir, 'beta');
+    await store.refresh();
+
+    expect(store.changes.since(2, 100).changes.map(c => [c.type, c.name])).toEqual([
+      ['added', 'ai.nimbletools/beta'],
+      ['updated', 'ai.nimbletools/zeta'],
+      ['removed', 'ai.nimbletools/alpha']
+    ]);
+  });
+
+  it('should give a new snapshot id when only a timestamp changes', async () => {
+    const first = await store.load();
+    const later = new Date(Date.now() + 60000);
+    await utimes(join(serversDir, 'alpha', 'server.json'), later, later);
+
+    const second = await store.refresh();
+
+    expect(second.id).not.toBe(first.id);
+    expect(store.changes.since(2, 100).changes.map(c => [c.type, c.name])).toEqual([['updated', 'ai.nimbletools/alpha']]);
+  });
+
+  it('should detect changes to files in versions/', async () => {
+    const first = await store.load();
+    await writeVersion(serversDir, 'zeta', '0.9.0');
+
+    const second = await store.refresh();
+
+    expect(second.id).not.toBe(first.id);
+    expect(second.versions.get('ai.nimbletools/zeta')?.list.map(s => s.version)).toEqual(['1.0.0', '0.9.0']);
+  });
+
+  it('should prefer a precompiled catalog artifact', async () => {
+    const artifactPath = join(serversDir, 'catalog.json');
+    await writeFile(artifactPath, JSON.stringify(buildCatalogArtifact(await readServersDir(serversDir))));
+    // A definition that is not in the artifact but older than it is not picked up
+    await writeServer(serversDir, 'beta');
+    const past = new Date(Date.now() - 60000);
+    await utimes(join(serversDir, 'beta', 'server.json'), past, past);
+
+    store = new CatalogStore({ serversDir, catalogFile: artifactPath, refreshIntervalMs: 0 });
+    const snapshot = await store.load();
+
+    expect(snapshot.list.map(s => s.name)).toEqual(['ai.nimbletools/alpha', 'ai.nimbletools/zeta']);
+  });
+
+  it('should load the servers directory when it changed after the artifact was built', async () => {
+    const artifactPath = join(serversDir, 'catalog.json');
+    await writeFile(artifactPath, JSON.stringify(buildCatalogArtifact(await readServersDir(serversDir))));
+    const past = new Date(Date.now() - 60000);
+    await utimes(artifactPath, past, past);
+    await writeServer(serversDir, 'beta');
+
+    store = new CatalogStore({ serversDir, catalogFile: artifactPath, refreshIntervalMs: 0 });
+    const snapshot = await store.load();
+
+    expect(snapshot.list).toHaveLength(3);
+  });
+
+  it('should fall back to the servers directory when the artifact is unusable', async () => {
+    const artifactPath = join(serversDir, 'catalog.json');
+    await writeFile(artifactPath, JSON.stringify({ format: 0, sources: [] }));
+
+    store = new CatalogStore({ serversDir, catalogFile: artifactPath, refreshIntervalMs: 0 });
+    const snapshot = await store.load();
+
+    expect(snapshot.list).toHaveLength(2);
+  });
+
+  it('should number changes the same way in every process loading the same artifact', async () => {
+    await writeVersion(serversDir, 'zeta', '0.9.0');
+    const artifactPath = join(serversDir, 'catalog.json');
+    await writeFile(artifactPath, JSON.stringify(buildCatalogArtifact(await readServersDir(serversDir))));
+
+    const first = new CatalogStore({ serversDir, catalogFile: artifactPath, refreshIntervalMs: 0 });
+    const second = new CatalogStore({ serversDir, catalogFile: artifactPath, refreshIntervalMs: 0 });
+    const snapshot = await first.load();
+    await second.load();
+
+    expect(first.changes.epoch).toBe(snapshot.id);
+    expect(second.changes.epoch).toBe(first.changes.epoch);
+    expect(second.changes.since(1, 100, first.changes.epoch)).toEqual(first.changes.since(1, 100, first.changes.epoch));
+    expect(second.changes.since(1, 100, first.changes.epoch)).toMatchObject({ reset: false, nextSince: 3 });
+  });
+
+  it('should fall back to the servers directory when the artifact is missing', async () => {
+    store = new CatalogStore({ serversDir, catalogFile: join(serversDir, 'missing.json'), refreshIntervalMs: 0 });
+    const snapshot = await store.load();
+
+    expect(snapshot.list).toHaveLength(2);
+  });
+
+  it('should load a handed-over catalog and continue its change log', async () => {
+    const original = await store.load();
+    // Sent between processes as a structured copy
+    const handoff = JSON.parse(JSON.stringify(store.export()));
+    await writeServer(serversDir, 'beta');
+
+    const worker = new CatalogStore({ serversDir, handoff, refreshIntervalMs: 0 });
+    const snapshot = await worker.load();
+    worker.close();
+
+    expect(snapshot.id).toBe(original.id);
+    expect(snapshot.list.map(s => s.name)).toEqual(['ai.nimbletools/alpha', 'ai.nimbletools/zeta']);
+    expect(worker.changes.epoch).toBe(store.changes.epoch);
+    expect(worker.changes.sequence).toBe(2);
+    expect(worker.changes.since(0, 100).changes).toHaveLength(2);
+  });
+
+  describe('watching', () => {
+    async function waitFor(predicate: () => boolean) {
+      const deadline = Date.now() + 5000;
+      while (!predicate()) {
+        if (Date.now() > deadline) throw new Error('Timed out waiting for catalog change');
+        await new Promise(resolve => setTimeout(resolve, 10));
+      }
+    }
+
+    beforeEach(async () => {
+      store = new CatalogStore({ serversDir, watch: true, debounceMs: 20 });
+      await store.load();
+      store.start();
+    });
+
+    it('should apply added, changed and removed servers incrementally', async () => {
+      const reloads = store.stats.reloads;
+
+      await writeServer(serversDir, 'beta');
+      await writeServer(serversDir, 'alpha', { version: '2.0.0' });
+      await rm(join(serversDir, 'zeta'), { recursive: true });
+
+      await waitFor(() => store.snapshot.servers.get('ai.nimbletools/alpha')?.version === '2.0.0'
+        && store.snapshot.servers.has('ai.nimbletools/beta')
+        && !store.snapshot.servers.has('ai.nimbletools/zeta'));
+
+      expect(store.snapshot.list.map(s => s.name)).toEqual(['ai.nimbletools/alpha', 'ai.nimbletools/beta']);
+      // The burst is debounced into a small number of batches, not one per event
+      expect(store.stats.reloads - reloads).toBeLessThanOrEqual(3);
+    });
+
+    it('should keep the previous definition while a file is invalid', async () => {
+      await writeFile(join(serversDir, 'alpha', 'server.json'), '{ "name": ');
+      await writeServer(serversDir, 'beta');
+
+      await waitFor(() => store.snapshot.servers.has('ai.nimbletools/beta'));
+
+      expect(store.snapshot.servers.get('ai.nimbletools/alpha')?.version).toBe('1.0.0');
+    });
+  });
+});
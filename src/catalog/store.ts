@@ -0,0 +1,345 @@
+/**
+ * Catalog store
+ *
+ * Holds the current catalog snapshot and swaps in a new one when the
+ * server definitions on disk change. Request handlers only ever read
+ * `store.snapshot`, which never touches the filesystem.
+ *
+ * Changes are picked up by watching the servers directory; only the
+ * server directories that changed are re-parsed. Polling is used when
+ * watching is disabled or unsupported. When a precompiled catalog
+ * artifact is available (and no definition changed after it was built)
+ * it is loaded instead and never reloaded; the same goes for a catalog
+ * handed over by another process (cluster workers get theirs from the
+ * primary, see src/cluster.ts). An unusable artifact is logged and the
+ * servers directory is loaded instead.
+ *
+ * Every swap is recorded in a change log so consumers can sync
+ * incrementally (see ./changes.ts).
+ */
+
+import { watch, type FSWatcher } from 'fs';
+import { stat } from 'fs/promises';
+import { readCatalogArtifact, snapshotArtifact, type CatalogArtifact } from './artifact.js';
+import { ChangeLog, type ChangeLogState } from './changes.js';
+import { fingerprintServersDir, newestDefinitionMtime, readServerDirectory, readServersDir } from './loader.js';
+import { createSnapshot, type CatalogSnapshot } from './snapshot.js';
+
+export interface CatalogStoreOptions {
+  /** Directory containing one sub-directory per server */
+  serversDir: string;
+  /** Precompiled catalog artifact, preferred over serversDir when present and up to date */
+  catalogFile?: string;
+  /** How often to poll the servers directory when not watching (0 disables) */
+  refreshIntervalMs?: number;
+  /** Watch the servers directory and apply changes incrementally */
+  watch?: boolean;
+  /** Quiet period used to batch bursts of filesystem events */
+  debounceMs?: number;
+  /** Number of change log entries to retain */
+  changeLogSize?: number;
+  /** Catalog and change log built by another process; used instead of reading from disk */
+  handoff?: CatalogHandoff;
+}
+
+/**
+ * A loaded catalog in a form that can be sent to another process
+ */
+export interface CatalogHandoff {
+  artifact: CatalogArtifact;
+  changes: ChangeLogState;
+}
+
+export interface CatalogStoreStats {
+  /** Completed rebuilds of the catalog from disk */
+  reloads: number;
+  /** Reload requests that joined an already running reload */
+  coalescedReloads: number;
+  /** Time spent in completed rebuilds, in milliseconds */
+  reloadTimeMs: number;
+  /** Duration of the most recent rebuild, in milliseconds */
+  lastReloadMs: number;
+}
+
+const DEFAULT_REFRESH_INTERVAL = 60000; // 1 minute
+const DEFAULT_DEBOUNCE = 100;
+
+export class CatalogStore {
+  private current: CatalogSnapshot = createSnapshot([]);
+  private fingerprint = '';
+  private timer: NodeJS.Timeout | null = null;
+  private inflight: Promise<CatalogSnapshot> | null = null;
+  private watcher: FSWatcher | null = null;
+  private debounce: NodeJS.Timeout | null = null;
+  private pending = new Set<string>();
+  private rescanPending = false;
+  private precompiled = false;
+  private readonly counters: CatalogStoreStats = { reloads: 0, coalescedReloads: 0, reloadTimeMs: 0, lastReloadMs: 0 };
+  /** Added, updated and removed server versions, one entry per change */
+  readonly changes: ChangeLog;
+
+  constructor(private readonly options: CatalogStoreOptions) {
+    this.changes = options.handoff
+      ? ChangeLog.restore(options.handoff.changes, options.handoff.artifact.sources, options.changeLogSize)
+      : new ChangeLog(options.changeLogSize);
+  }
+
+  /**
+   * The current snapshot. Always available, never blocks.
+   */
+  get snapshot(): CatalogSnapshot {
+    return this.current;
+  }
+
+  get stats(): Readonly<CatalogStoreStats> {
+    return this.counters;
+  }
+
+  /**
+   * The current snapshot and change log, for `CatalogStoreOptions.handoff`
+   */
+  export(): CatalogHandoff {
+    const artifact = snapshotArtifact(this.current);
+    return { artifact, changes: this.changes.export(artifact.sources) };
+  }
+
+  /**
+   * Read every server definition and swap in a new snapshot if the
+   * content differs from the current one
+   */
+  load(): Promise<CatalogSnapshot> {
+    return this.singleFlight(() => this.rebuild());
+  }
+
+  /**
+   * Reload only if the servers directory changed since the last load
+   */
+  refresh(): Promise<CatalogSnapshot> {
+    return this.singleFlight(async () => {
+      const fingerprint = await fingerprintServersDir(this.options.serversDir);
+      if (fingerprint === this.fingerprint) {
+        return this.current;
+      }
+      return this.rebuild();
+    });
+  }
+
+  /**
+   * Start background change detection
+   */
+  start(): void {
+    // A precompiled artifact is immutable for the lifetime of the process
+    if (this.precompiled || this.timer || this.watcher) return;
+
+    if (this.options.watch && this.startWatching()) return;
+    this.startPolling();
+  }
+
+  /**
+   * Stop background change detection
+   */
+  close(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+    if (this.debounce) {
+      clearTimeout(this.debounce);
+      this.debounce = null;
+    }
+    this.stopWatching();
+  }
+
+  private startPolling(): void {
+    const interval = this.options.refreshIntervalMs ?? DEFAULT_REFRESH_INTERVAL;
+    if (this.timer || interval <= 0) return;
+
+    this.timer = setInterval(() => {
+      this.refresh().catch(error => {
+        console.error('Error refreshing catalog:', error);
+      });
+    }, interval);
+    this.timer.unref();
+  }
+
+  private startWatching(): boolean {
+    try {
+      this.watcher = watch(this.options.serversDir, { recursive: true, persistent: false }, (_event, filename) => {
+        this.onFileChange(filename);
+      });
+    } catch (error) {
+      console.error('Unable to watch servers directory, falling back to polling:', error);
+      return false;
+    }
+
+    this.watcher.on('error', (error) => {
+      console.error('Servers directory watcher failed, falling back to polling:', error);
+      this.stopWatching();
+      this.startPolling();
+    });
+    return true;
+  }
+
+  private stopWatching(): void {
+    if (this.watcher) {
+      this.watcher.close();
+      this.watcher = null;
+    }
+  }
+
+  /**
+   * Record which server directory an event belongs to and (re)arm the
+   * debounce timer, so a burst such as a git checkout becomes one batch
+   */
+  private onFileChange(filename: string | null): void {
+    const directory = filename ? filename.split(/[\\/]/)[0] : '';
+    if (directory) {
+      this.pending.add(directory);
+    } else {
+      // Some platforms do not report the filename; rescan everything
+      this.rescanPending = true;
+    }
+    this.scheduleFlush();
+  }
+
+  private scheduleFlush(): void {
+    if (this.debounce) {
+      clearTimeout(this.debounce);
+    }
+    this.debounce = setTimeout(() => this.flush(), this.options.debounceMs ?? DEFAULT_DEBOUNCE);
+    this.debounce.unref();
+  }
+
+  private flush(): void {
+    this.debounce = null;
+
+    // Let the running reload finish; the batch is applied right after
+    if (this.inflight) {
+      this.scheduleFlush();
+      return;
+    }
+
+    const directories = this.pending;
+    const rescan = this.rescanPending;
+    this.pending = new Set();
+    this.rescanPending = false;
+
+    const run = rescan ? this.load() : this.singleFlight(() => this.patch(directories));
+    run.catch(error => {
+      console.error('Error applying catalog changes:', error);
+    });
+  }
+
+  /**
+   * Re-parse only the given server directories and rebuild the snapshot
+   * from the current sources plus those changes
+   */
+  private async patch(directories: Iterable<string>): Promise<CatalogSnapshot> {
+    const started = performance.now();
+    const sources = new Map(this.current.sources);
+
+    for (const directory of directories) {
+      try {
+        const source = await readServerDirectory(this.options.serversDir, directory);
+        if (source) {
+          sources.set(directory, source);
+        } else {
+          sources.delete(directory);
+        }
+      } catch (error) {
+        // Usually a partially written file; keep serving the previous definition
+        console.error(`Error loading ${directory}, keeping previous definition:`, error);
+      }
+    }
+
+    this.countReload(started);
+    this.swap(createSnapshot(sources.values()));
+    return this.current;
+  }
+
+  /**
+   * Run at most one reload at a time. Callers arriving while a reload is
+   * running share its promise instead of scanning the directory again;
+   * readers keep getting the previous snapshot until it completes.
+   */
+  private singleFlight(task: () => Promise<CatalogSnapshot>): Promise<CatalogSnapshot> {
+    if (this.inflight) {
+      this.counters.coalescedReloads++;
+      return this.inflight;
+    }
+
+    this.inflight = task().finally(() => {
+      this.inflight = null;
+    });
+    return this.inflight;
+  }
+
+  private async rebuild(): Promise<CatalogSnapshot> {
+    const started = performance.now();
+    if (this.options.handoff) {
+      const snapshot = createSnapshot(this.options.handoff.artifact.sources);
+      this.precompiled = true;
+      this.countReload(started);
+      // The handed-over change log already describes this snapshot
+      this.current = snapshot;
+      return this.current;
+    }
+
+    if (this.options.catalogFile) {
+      const artifact = await this.readArtifact(this.options.catalogFile);
+      if (artifact) {
+        const snapshot = createSnapshot(artifact.sources);
+        if (snapshot.id !== artifact.id) {
+          console.error(`Catalog artifact ${this.options.catalogFile} does not match its recorded id`);
+        }
+        this.precompiled = true;
+        this.countReload(started);
+        this.swap(snapshot);
+        return this.current;
+      }
+    }
+
+    const fingerprint = await fingerprintServersDir(this.options.serversDir);
+    const sources = await readServersDir(this.options.serversDir);
+    this.fingerprint = fingerprint;
+    this.countReload(started);
+    this.swap(createSnapshot(sources));
+    return this.current;
+  }
+
+  /**
+   * The precompiled artifact, or null when it is missing, unusable or
+   * older than a definition in the servers directory
+   */
+  private async readArtifact(path: string): Promise<CatalogArtifact | null> {
+    try {
+      const built = await stat(path).then(info => info.mtimeMs, () => null);
+      if (built === null) return null;
+
+      if (await newestDefinitionMtime(this.options.serversDir) > built) {
+        console.error(`${this.options.serversDir} changed after ${path} was compiled; loading it instead`);
+        return null;
+      }
+      return await readCatalogArtifact(path);
+    } catch (error) {
+      console.error(`Ignoring catalog artifact ${path}, loading ${this.options.serversDir} instead:`, error);
+      return null;
+    }
+  }
+
+    private countReload(started: number): void {
+    const elapsed = performance.now() - started;
+    this.counters.reloads++;
+    this.counters.reloadTimeMs += elapsed;
+    this.counters.lastReloadMs = elapsed;
+  }
+
+  private swap(next: CatalogSnapshot): void {
+    // Keep the existing snapshot (and its age) when nothing actually changed
+    if (next.id === this.current.id && next.list.length === this.current.list.length) {
+      return;
+    }
+    this.changes.record(this.current, next);
+    this.current = next;
+  }
+}
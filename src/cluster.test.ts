@@ -0,0 +1,211 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import type { Worker } from 'cluster';
+import { EventEmitter } from 'events';
+import { mkdir, mkdtemp, rm, writeFile } from 'fs/promises';
+import { availableParallelism, tmpdir } from 'os';
+import { join } from 'path';
+import { CatalogStore, type CatalogHandoff } from './catalog/store.js';
+import { requestCatalog, startPrimary, workerCount, type WorkerCluster } from './cluster.js';
+
+describe('workerCount', () => {
+  it('should serve from a single process by default', () => {
+    expect(workerCount(undefined)).toBe(1);
+    expect(workerCount('')).toBe(1);
+  });
+
+  it('should accept a count or auto', () => {
+    expect(workerCount('4')).toBe(4);
+    expect(workerCount(' AUTO ')).toBe(availableParallelism());
+  });
+
+  it('should fall back to a single process for invalid values', () => {
+    expect(workerCount('0')).toBe(1);
+    expect(workerCount('many')).toBe(1);
+  });
+});
+
+type Message = { type: string; handoff?: CatalogHandoff };
+
+let nextPid = 1000;
+
+/**
+ * A worker that asks for the catalog and listens, as src/server.ts does,
+ * and exits when told to shut down
+ */
+class FakeWorker extends EventEmitter {
+  readonly sent: Message[] = [];
+  readonly process = { pid: nextPid++ };
+  private connected = true;
+
+  constructor(private readonly cluster: FakeCluster) {
+    super();
+  }
+
+  start(): void {
+    this.emit('message', { type: 'catalog-request' });
+    this.emit('listening', {});
+  }
+
+  send(message: Message): boolean {
+    this.sent.push(message);
+    if (message.type === 'shutdown') {
+      setImmediate(() => this.exit(0));
+    }
+    return true;
+  }
+
+  isConnected(): boolean {
+    return this.connected;
+  }
+
+  kill(): void {
+    this.exit(null, 'SIGTERM');
+  }
+
+  exit(code: number | null, signal?: string): void {
+    this.connected = false;
+    this.emit('exit', code, signal);
+    this.cluster.emit('exit', this, code, signal);
+  }
+
+  get retired(): boolean {
+    return this.sent.some(message => message.type === 'shutdown');
+  }
+
+  get catalogId(): string | undefined {
+    return this.sent.find(message => message.type === 'catalog')?.handoff?.artifact.id;
+  }
+}
+
+class FakeCluster extends EventEmitter {
+  readonly workers: FakeWorker[] = [];
+  /** Retired workers at the time of each fork */
+  readonly retiredAtFork: number[] = [];
+  /** Whether forked workers start by themselves */
+  autoStart = true;
+
+  fork(): Worker {
+    const worker = new FakeWorker(this);
+    this.retiredAtFork.push(this.workers.filter(w => w.retired).length);
+    this.workers.push(worker);
+    if (this.autoStart) {
+      setImmediate(() => worker.start());
+    }
+    return worker as unknown as Worker;
+  }
+}
+
+async function waitFor(predicate: () => boolean) {
+  const deadline = Date.now() + 5000;
+  while (!predicate()) {
+    if (Date.now() > deadline) throw new Error('Timed out waiting for workers');
+    await new Promise(resolve => setTimeout(resolve, 5));
+  }
+}
+
+async function writeServer(root: string, directory: string) {
+  await mkdir(join(root, directory), { recursive: true });
+  await writeFile(join(root, directory, 'server.json'), JSON.stringify({
+    name: `ai.nimbletools/${directory}`,
+    version: '1.0.0',
+    description: `${directory} server`
+  }));
+}
+
+describe('startPrimary', () => {
+  let serversDir: string;
+  let catalog: CatalogStore;
+  let fake: FakeCluster;
+
+  beforeEach(async () => {
+    serversDir = await mkdtemp(join(tmpdir(), 'cluster-'));
+    await writeServer(serversDir, 'alpha');
+    catalog = new CatalogStore({ serversDir, refreshIntervalMs: 0 });
+    fake = new FakeCluster();
+  });
+
+  afterEach(async () => {
+    catalog.close();
+    await rm(serversDir, { recursive: true, force: true });
+  });
+
+  function start(workers: number) {
+    return startPrimary(workers, { catalog, cluster: fake as unknown as WorkerCluster, respawnDelayMs: 0 });
+  }
+
+  it('should hand every worker the catalog and resolve once they listen', async () => {
+    await start(2);
+
+    expect(fake.workers).toHaveLength(2);
+    expect(fake.workers.map(w => w.catalogId)).toEqual([catalog.snapshot.id, catalog.snapshot.id]);
+    expect(fake.workers.some(w => w.retired)).toBe(false);
+  });
+
+  it('should replace workers one at a time when the catalog changes', async () => {
+    await start(2);
+    const [first, second] = fake.workers;
+
+    await writeServer(serversDir, 'beta');
+    const snapshot = await catalog.refresh();
+    await waitFor(() => first.retired && second.retired);
+
+    expect(fake.workers).toHaveLength(4);
+    // Each old worker is retired only after its replacement listens
+    expect(fake.retiredAtFork).toEqual([0, 0, 0, 1]);
+    expect(fake.workers.slice(2).map(w => w.catalogId)).toEqual([snapshot.id, snapshot.id]);
+    expect(fake.workers[2].sent.find(m => m.type === 'catalog')?.handoff?.changes.sequence).toBe(catalog.changes.sequence);
+
+    // Retired workers exiting are not replaced again
+    await new Promise(resolve => setTimeout(resolve, 20));
+    expect(fake.workers).toHaveLength(4);
+  });
+
+  it('should keep the current worker when its replacement exits before listening', async () => {
+    await start(1);
+    fake.autoStart = false;
+
+    await writeServer(serversDir, 'beta');
+    await catalog.refresh();
+    await waitFor(() => fake.workers.length === 2);
+    fake.workers[1].exit(1);
+    await new Promise(resolve => setTimeout(resolve, 20));
+
+    expect(fake.workers[0].retired).toBe(false);
+    expect(fake.workers).toHaveLength(2);
+  });
+
+  it('should respawn a worker that exits unexpectedly', async () => {
+    await start(2);
+
+    fake.workers[0].exit(1);
+    await waitFor(() => fake.workers.length === 3 && fake.workers[2].catalogId !== undefined);
+
+    expect(fake.workers[2].catalogId).toBe(catalog.snapshot.id);
+  });
+});
+
+describe('requestCatalog', () => {
+  it('should ask the primary for the catalog and resolve with its answer', async () => {
+    const handoff = { artifact: { id: 'snapshot' }, changes: { epoch: 'epoch', sequence: 3, entries: [] } } as unknown as CatalogHandoff;
+    const sent: unknown[] = [];
+    const send = process.send;
+    const listeners = process.listenerCount('message');
+
+    process.send = ((message: unknown) => {
+      sent.push(message);
+      setImmediate(() => {
+        process.emit('message', { type: 'shutdown' }, undefined);
+        process.emit('message', { type: 'catalog', handoff }, undefined);
+      });
+      return true;
+    }) as typeof process.send;
+
+    try {
+      expect(await requestCatalog()).toBe(handoff);
+    } finally {
+      process.send = send;
+    }
+    expect(sent).toEqual([{ type: 'catalog-request' }]);
+    expect(process.listenerCount('message')).toBe(listeners);
+  });
+});
@@ -0,0 +1,204 @@
+/**
+ * Multi-process serving
+ *
+ * With more than one worker configured, the primary process loads the
+ * catalog, watches for changes and forks the workers that serve HTTP on
+ * the shared port. Workers never read the servers directory: each asks the
+ * primary for the current catalog at startup and builds its snapshot from
+ * the handed-over sources and change log, so every worker reports the same
+ * change sequence and event ids.
+ *
+ * When the catalog changes, workers are replaced one at a time: a new
+ * worker is forked, and the worker it replaces is asked to shut down once
+ * the new one is listening, so capacity never drops by more than a worker.
+ */
+
+import cluster, { type Worker } from 'cluster';
+import { availableParallelism } from 'os';
+import type { FastifyInstance } from 'fastify';
+import type { CatalogHandoff, CatalogStore } from './catalog/store.js';
+import { createCatalogStore } from './server-factory.js';
+
+type ClusterMessage =
+  | { type: 'catalog-request' }
+  | { type: 'catalog'; handoff: CatalogHandoff }
+  | { type: 'shutdown' };
+
+// How long a replaced worker may spend finishing in-flight requests
+const SHUTDOWN_TIMEOUT = parseInt(process.env.WORKER_SHUTDOWN_TIMEOUT_MS || '30000', 10);
+// Delay before replacing a worker that exited unexpectedly
+const RESPAWN_DELAY = 1000;
+
+/** The parts of the cluster module the primary uses */
+export type WorkerCluster = Pick<typeof cluster, 'fork' | 'on'>;
+
+export interface PrimaryOptions {
+  /** Catalog to hand to workers (default: the configured servers directory) */
+  catalog?: CatalogStore;
+  /** Where workers are forked from (default: the cluster module) */
+  cluster?: WorkerCluster;
+  /** Delay before replacing a worker that exited unexpectedly */
+  respawnDelayMs?: number;
+}
+
+/**
+ * Number of worker processes requested: a count, `auto` for one per
+ * core, or 1 (a single process) when unset or invalid
+ */
+export function workerCount(value: string | undefined): number {
+  if (!value) return 1;
+  if (value.trim().toLowerCase() === 'auto') return availableParallelism();
+  const count = parseInt(value, 10);
+  return Number.isFinite(count) && count > 0 ? count : 1;
+}
+
+/**
+ * Resolves true once the worker listens, false if it exits first
+ */
+function listening(worker: Worker): Promise<boolean> {
+  return new Promise(resolve => {
+    const onListening = () => {
+      worker.off('exit', onExit);
+      resolve(true);
+    };
+    const onExit = () => {
+      worker.off('listening', onListening);
+      resolve(false);
+    };
+    worker.once('listening', onListening);
+    worker.once('exit', onExit);
+  });
+}
+
+/**
+ * Load the catalog and run the given number of workers until the process
+ * is told to stop. Resolves once every initial worker is listening.
+ */
+export async function startPrimary(workers: number, options: PrimaryOptions = {}): Promise<void> {
+  const catalog = options.catalog ?? createCatalogStore();
+  const workerCluster = options.cluster ?? cluster;
+  const respawnDelay = options.respawnDelayMs ?? RESPAWN_DELAY;
+  await catalog.load();
+  catalog.start();
+
+  let handoff = catalog.export();
+  // Workers serving requests, with the snapshot id each was given
+  const active = new Map<Worker, string | null>();
+  // Workers asked to shut down that have not exited yet
+  const retiring = new Set<Worker>();
+  let rolling = false;
+  let stopping = false;
+
+  const fork = (): Worker => {
+    const worker = workerCluster.fork();
+    active.set(worker, null);
+    worker.on('message', (message: ClusterMessage) => {
+      if (message.type === 'catalog-request') {
+        active.set(worker, handoff.artifact.id);
+        worker.send({ type: 'catalog', handoff } satisfies ClusterMessage);
+      }
+    });
+    return worker;
+  };
+
+  const retire = (worker: Worker) => {
+    active.delete(worker);
+    if (!worker.isConnected()) return;
+
+    retiring.add(worker);
+    worker.send({ type: 'shutdown' } satisfies ClusterMessage);
+    const timer = setTimeout(() => worker.kill(), SHUTDOWN_TIMEOUT);
+    timer.unref();
+    worker.once('exit', () => clearTimeout(timer));
+  };
+
+  /**
+   * Replace every worker serving an older catalog, one at a time
+   */
+  const roll = async () => {
+    if (rolling) return;
+    rolling = true;
+    try {
+      let stale: Worker | undefined;
+      while (!stopping && (stale = Array.from(active).find(([, id]) => id !== null && id !== handoff.artifact.id)?.[0])) {
+        if (!(await listening(fork()))) {
+          console.error('Replacement worker exited before listening; keeping the current worker');
+          return;
+        }
+        retire(stale);
+      }
+    } finally {
+      rolling = false;
+    }
+  };
+
+  catalog.changes.subscribe(() => {
+    // Listeners run before the new snapshot is swapped in
+    queueMicrotask(() => {
+      handoff = catalog.export();
+      roll().catch(error => {
+        console.error('Error restarting workers:', error);
+      });
+    });
+  });
+
+  workerCluster.on('exit', (worker, code, signal) => {
+    retiring.delete(worker);
+    if (stopping) {
+      if (active.size === 0 && retiring.size === 0) process.exit(0);
+      return;
+    }
+    if (!active.delete(worker)) return;
+
+    console.error(`Worker ${worker.process.pid} exited unexpectedly (${signal ?? code}), starting a new one`);
+    setTimeout(() => {
+      if (!stopping && active.size < workers) fork();
+    }, respawnDelay);
+  });
+
+  const stop = () => {
+    if (stopping) return;
+    stopping = true;
+    catalog.close();
+    for (const worker of Array.from(active.keys())) {
+      retire(worker);
+    }
+    if (retiring.size === 0) process.exit(0);
+  };
+  process.once('SIGTERM', stop);
+  process.once('SIGINT', stop);
+
+  const started = await Promise.all(Array.from({ length: workers }, () => listening(fork())));
+  if (started.includes(false)) {
+    throw new Error('A worker exited during startup');
+  }
+}
+
+/**
+ * Ask the primary for the catalog to serve
+ */
+export function requestCatalog(): Promise<CatalogHandoff> {
+  return new Promise(resolve => {
+    const onMessage = (message: ClusterMessage) => {
+      if (message.type !== 'catalog') return;
+      process.off('message', onMessage);
+      resolve(message.handoff);
+    };
+    process.on('message', onMessage);
+    process.send!({ type: 'catalog-request' } satisfies ClusterMessage);
+  });
+}
+
+/**
+ * Close the server gracefully and exit when the primary retires this worker
+ */
+export function exitOnShutdown(fastify: FastifyInstance): void {
+  process.on('message', (message: ClusterMessage) => {
+    if (message.type !== 'shutdown') return;
+    fastify.close()
+      .catch(error => {
+        console.error('Error closing worker:', error);
+      })
+      .finally(() => process.exit(0));
+  });
+}
@@ -0,0 +1,60 @@
+import { describe, it, expect } from 'vitest';
+import { brotliDecompressSync, gunzipSync } from 'zlib';
+import { acceptableEncodings, EncodedBody } from './compression.js';
+
+const LARGE = Buffer.from(JSON.stringify({ servers: Array.from({ length: 100 }, (_, i) => ({ name: `ai.nimbletools/server-${i}` })) }));
+
+describe('acceptableEncodings', () => {
+  it('should order encodings by q-value, then by server preference', () => {
+    expect(acceptableEncodings('gzip;q=1.0, br;q=0.5')).toEqual(['gzip', 'br']);
+    expect(acceptableEncodings('gzip, br')[0]).toBe('br');
+  });
+
+  it('should exclude encodings with q=0 and unsupported codings', () => {
+    expect(acceptableEncodings('br;q=0, gzip')).toEqual(['gzip']);
+    expect(acceptableEncodings('deflate, compress')).toEqual([]);
+    expect(acceptableEncodings(undefined)).toEqual([]);
+  });
+
+  it('should honour the wildcard', () => {
+    expect(acceptableEncodings('*')).toContain('gzip');
+    expect(acceptableEncodings('*, gzip;q=0')).not.toContain('gzip');
+  });
+});
+
+describe('EncodedBody', () => {
+  it('should serve identity until the preferred variant is ready', async () => {
+    const body = new EncodedBody(LARGE);
+
+    expect(body.select('gzip')).toBe('identity');
+    await body.prepare('gzip');
+
+    expect(body.select('gzip')).toBe('gzip');
+    expect(gunzipSync(body.variant('gzip')!)).toEqual(LARGE);
+  });
+
+  it('should compress each variant once', async () => {
+    const body = new EncodedBody(LARGE);
+    await Promise.all([body.prepare('gzip'), body.prepare('gzip')]);
+    const first = body.variant('gzip');
+
+    await body.prepare('gzip');
+
+    expect(body.variant('gzip')).toBe(first);
+  });
+
+  it('should leave small bodies uncompressed', async () => {
+    const body = EncodedBody.fromJson({ status: 'ok' });
+    await body.prepare('gzip');
+
+    expect(body.compressible).toBe(false);
+    expect(body.select('gzip')).toBe('identity');
+  });
+
+  it('should build brotli variants that decode to the identity body', async () => {
+    const body = new EncodedBody(LARGE);
+    await body.prepare('br');
+
+    expect(brotliDecompressSync(body.variant('br')!)).toEqual(LARGE);
+  });
+});
@@ -0,0 +1,178 @@
+/**
+ * Pre-compressed response bodies and Accept-Encoding negotiation
+ *
+ * A body is compressed at most once per encoding, in the background on
+ * the libuv thread pool, and the result is kept alongside the identity
+ * bytes for as long as the body itself is cached (one catalog snapshot
+ * for API responses). Until a variant is ready, the best variant that is
+ * already available (or the identity body) is sent instead, so no
+ * request ever waits on compression.
+ */
+
+import type { FastifyReply, FastifyRequest } from 'fastify';
+import { promisify } from 'util';
+import zlib from 'zlib';
+import { encodedEtag, varyOn } from './etag.js';
+
+export type ContentEncoding = 'br' | 'zstd' | 'gzip' | 'identity';
+
+type Compressor = (body: Buffer) => Promise<Buffer>;
+
+const brotliCompress = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+// Moderate levels compress many times faster than the maximum for a few
+// percent larger output; every process builds its own variants, on every
+// start, so maximum effort would be paid again per worker and per deploy
+const BROTLI_QUALITY = 4;
+const GZIP_LEVEL = 6;
+const ZSTD_LEVEL = 3;
+
+const COMPRESSORS: Partial<Record<ContentEncoding, Compressor>> = {
+  br: body => brotliCompress(body, {
+    params: {
+      [zlib.constants.BROTLI_PARAM_QUALITY]: BROTLI_QUALITY,
+      [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+      [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length
+    }
+  }),
+  gzip: body => gzip(body, { level: GZIP_LEVEL })
+};
+
+// zstd is only available from Node 22.15
+if (typeof zlib.zstdCompress === 'function') {
+  const zstdCompress = promisify(zlib.zstdCompress);
+  COMPRESSORS.zstd = body => zstdCompress(body, {
+    params: { [zlib.constants.ZSTD_c_compressionLevel]: ZSTD_LEVEL }
+  });
+}
+
+// Server preference when the client weighs several encodings equally
+const PREFERENCE: ContentEncoding[] = (['br', 'zstd', 'gzip'] as ContentEncoding[])
+  .filter(encoding => COMPRESSORS[encoding]);
+
+// Compression overhead outweighs the savings below this size
+const MIN_COMPRESS_BYTES = 1024;
+
+/**
+ * Parse an Accept-Encoding header into the acceptable encodings we
+ * support, most preferred first
+ */
+export function acceptableEncodings(header: string | string[] | undefined): ContentEncoding[] {
+  if (!header) return [];
+
+  const weights = new Map<string, number>();
+  for (const part of (Array.isArray(header) ? header.join(',') : header).split(',')) {
+    const [coding, ...params] = part.trim().toLowerCase().split(';');
+    if (!coding) continue;
+
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+    weights.set(coding, q ? parseFloat(q.slice(2)) || 0 : 1);
+  }
+
+  const wildcard = weights.get('*') ?? 0;
+  return PREFERENCE
+    .map((encoding, rank) => ({ encoding, rank, q: weights.get(encoding) ?? wildcard }))
+    .filter(candidate => candidate.q > 0)
+    .sort((a, b) => b.q - a.q || a.rank - b.rank)
+    .map(candidate => candidate.encoding);
+}
+
+/**
+ * A response body together with its lazily built compressed variants
+ */
+export class EncodedBody {
+  private readonly variants = new Map<ContentEncoding, Buffer>();
+  private readonly pending = new Map<ContentEncoding, Promise<void>>();
+
+  constructor(readonly identity: Buffer) {}
+
+  static fromJson(value: unknown): EncodedBody {
+    return new EncodedBody(Buffer.from(JSON.stringify(value)));
+  }
+
+  get compressible(): boolean {
+    return this.identity.length >= MIN_COMPRESS_BYTES;
+  }
+
+  /**
+   * The bytes for an encoding, if that variant has been built
+   */
+  variant(encoding: ContentEncoding): Buffer | undefined {
+    return encoding === 'identity' ? this.identity : this.variants.get(encoding);
+  }
+
+  /**
+   * Build the variant for an encoding in the background (once)
+   */
+  prepare(encoding: ContentEncoding): Promise<void> {
+    const compress = COMPRESSORS[encoding];
+    if (!compress || !this.compressible || this.variants.has(encoding)) {
+      return Promise.resolve();
+    }
+
+    let pending = this.pending.get(encoding);
+    if (!pending) {
+      pending = compress(this.identity)
+        .then(compressed => {
+          // Keep the variant only if it actually saves bytes
+          if (compressed.length < this.identity.length) {
+            this.variants.set(encoding, compressed);
+          }
+        })
+        .catch(error => {
+          console.error(`Error compressing response body with ${encoding}:`, error);
+        })
+        .finally(() => {
+          this.pending.delete(encoding);
+        });
+      this.pending.set(encoding, pending);
+    }
+    return pending;
+  }
+
+  /**
+   * Build every supported variant, e.g. for assets known to be requested
+   */
+  prepareAll(): Promise<void> {
+    return Promise.all(PREFERENCE.map(encoding => this.prepare(encoding))).then(() => undefined);
+  }
+
+  /**
+   * Pick the best acceptable variant that is ready now, and start
+   * building the client's preferred one if it is not
+   */
+  select(acceptEncoding: string | string[] | undefined): ContentEncoding {
+    if (!this.compressible) return 'identity';
+
+    const acceptable = acceptableEncodings(acceptEncoding);
+    if (acceptable.length > 0 && !this.variants.has(acceptable[0])) {
+      void this.prepare(acceptable[0]);
+    }
+    return acceptable.find(encoding => this.variants.has(encoding)) ?? 'identity';
+  }
+}
+
+/**
+ * Negotiate the encoding for a request and set the matching headers,
+ * including the variant's own ETag. Returns the bytes to send.
+ */
+export function sendEncoded(
+  request: Pick<FastifyRequest, 'headers'>,
+  reply: FastifyReply,
+  body: EncodedBody,
+  contentType = 'application/json; charset=utf-8'
+): Buffer {
+  varyOn(reply, 'Accept-Encoding');
+  reply.type(contentType);
+
+  const encoding = body.select(request.headers['accept-encoding']);
+  if (encoding !== 'identity') {
+    reply.header('content-encoding', encoding);
+    const etag = reply.getHeader('etag');
+    if (typeof etag === 'string') {
+      reply.header('etag', encodedEtag(etag, encoding));
+    }
+  }
+  return body.variant(encoding)!;
+}
@@ -0,0 +1,68 @@
+import { describe, it, expect } from 'vitest';
+import type { FastifyReply } from 'fastify';
+import { computeEtag, encodedEtag, ifNoneMatch, isNotModified, varyOn } from './etag.js';
+
+/**
+ * Just enough of a reply to record headers
+ */
+function fakeReply() {
+  const headers: Record<string, string> = {};
+  const reply = {
+    headers,
+    getHeader: (name: string) => headers[name],
+    header(name: string, value: string) {
+      headers[name] = value;
+      return reply;
+    }
+  };
+  return reply as typeof reply & FastifyReply;
+}
+
+describe('ETags', () => {
+  it('should be strong, quoted and deterministic', () => {
+    const etag = computeEtag('snapshot', 'query');
+
+    expect(etag).toMatch(/^"[A-Za-z0-9_-]+"$/);
+    expect(computeEtag('snapshot', 'query')).toBe(etag);
+    expect(computeEtag('snapshot', 'other')).not.toBe(etag);
+  });
+
+  it('should match If-None-Match lists, weak validators and wildcards', () => {
+    const etag = computeEtag('a');
+
+    expect(ifNoneMatch(undefined, etag)).toBe(false);
+    expect(ifNoneMatch(etag, etag)).toBe(true);
+    expect(ifNoneMatch(`"x", ${etag}`, etag)).toBe(true);
+    expect(ifNoneMatch(`W/${etag}`, etag)).toBe(true);
+    expect(ifNoneMatch('*', etag)).toBe(true);
+    expect(ifNoneMatch('"x"', etag)).toBe(false);
+  });
+
+  it('should give each encoding its own ETag and match any of them', () => {
+    const etag = computeEtag('a');
+
+    expect(encodedEtag(etag, 'identity')).toBe(etag);
+    expect(encodedEtag(etag, 'br')).toBe(etag.replace(/"$/, '-br"'));
+    expect(ifNoneMatch(encodedEtag(etag, 'br'), etag)).toBe(true);
+    expect(ifNoneMatch(`W/${encodedEtag(etag, 'gzip')}`, etag)).toBe(true);
+    expect(ifNoneMatch(encodedEtag(computeEtag('b'), 'br'), etag)).toBe(false);
+  });
+
+  it('should vary a 304 on Accept-Encoding, like the 200 it stands for', () => {
+    const etag = computeEtag('a');
+    const reply = fakeReply();
+
+    expect(isNotModified({ headers: { 'if-none-match': etag } }, reply, etag)).toBe(true);
+    expect(reply.headers).toEqual({ vary: 'Accept-Encoding', etag });
+  });
+
+  it('should add a header to Vary only once', () => {
+    const reply = fakeReply();
+    reply.header('vary', 'Origin');
+
+    varyOn(reply, 'Accept-Encoding');
+    varyOn(reply, 'accept-encoding');
+
+    expect(reply.headers.vary).toBe('Origin, Accept-Encoding');
+  });
+});
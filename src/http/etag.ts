@@ -0,0 +1,75 @@
+/**
+ * Strong ETags and conditional GET handling
+ */
+
+import { createHash } from 'crypto';
+import type { FastifyReply, FastifyRequest } from 'fastify';
+
+/**
+ * Build a strong ETag from the values a response is derived from
+ */
+export function computeEtag(...parts: Array<string | number>): string {
+  const hash = createHash('sha1').update(parts.join('\u0000')).digest('base64url');
+  return `"${hash}"`;
+}
+
+/**
+ * The ETag of a compressed variant. Each encoding is a different
+ * representation, so it needs its own strong validator.
+ */
+export function encodedEtag(etag: string, encoding: string): string {
+  return encoding === 'identity' ? etag : etag.replace(/"$/, `-${encoding}"`);
+}
+
+const ENCODINGS = ['br', 'zstd', 'gzip'];
+
+/**
+ * The If-None-Match entry that matches the given ETag or one of its
+ * encoded variants (weak comparison, as RFC 9110 requires for
+ * If-None-Match)
+ */
+function matchingEtag(header: string | string[] | undefined, etag: string): string | undefined {
+  if (!header) return undefined;
+
+  const value = Array.isArray(header) ? header.join(',') : header;
+  if (value.trim() === '*') return etag;
+
+  const opaque = etag.replace(/^W\//, '');
+  const accepted = [opaque, ...ENCODINGS.map(encoding => encodedEtag(opaque, encoding))];
+  return value.split(',')
+    .map(candidate => candidate.trim().replace(/^W\//, ''))
+    .find(candidate => accepted.includes(candidate));
+}
+
+/**
+ * Whether an If-None-Match header matches the given ETag or one of its
+ * encoded variants
+ */
+export function ifNoneMatch(header: string | string[] | undefined, etag: string): boolean {
+  return matchingEtag(header, etag) !== undefined;
+}
+
+/**
+ * Add a request header to Vary, once
+ */
+export function varyOn(reply: FastifyReply, header: string): void {
+  const vary = reply.getHeader('vary');
+  if (!vary) {
+    reply.header('vary', header);
+  } else if (!String(vary).toLowerCase().split(/\s*,\s*/).includes(header.toLowerCase())) {
+    reply.header('vary', `${vary}, ${header}`);
+  }
+}
+
+/**
+ * Set the ETag header and report whether the client already has this
+ * representation. Callers answer 304 without building the body; the
+ * 304 carries the validator of the variant the client holds. Validators
+ * differ per encoding, so the 304 varies on Accept-Encoding like the 200.
+ */
+export function isNotModified(request: Pick<FastifyRequest, 'headers'>, reply: FastifyReply, etag: string): boolean {
+  varyOn(reply, 'Accept-Encoding');
+  const match = matchingEtag(request.headers['if-none-match'], etag);
+  reply.header('etag', match ?? etag);
+  return match !== undefined;
+}
@@ -0,0 +1,152 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { createServer, get, type IncomingMessage, type Server } from 'http';
+import type { AddressInfo } from 'net';
+import { ChangeLog } from '../catalog/changes.js';
+import { createSource } from '../catalog/loader.js';
+import { createSnapshot } from '../catalog/snapshot.js';
+import { EventStream, formatEvent, parseEventId } from './events.js';
+
+function source(directory: string) {
+  const server = { name: `ai.nimbletools/${directory}`, version: '1.0.0', description: `${directory} server` };
+  const timestamps = { publishedAt: '2025-01-01T00:00:00.000Z', updatedAt: '2025-01-01T00:00:00.000Z' };
+  return createSource(directory, Buffer.from(JSON.stringify(server)), timestamps);
+}
+
+interface Event {
+  id?: string;
+  event?: string;
+  data?: any;
+}
+
+/**
+ * Minimal SSE client: collects parsed events until `count` have arrived
+ */
+function collect(response: IncomingMessage, count: number): Promise<Event[]> {
+  return new Promise(resolve => {
+    const events: Event[] = [];
+    let buffer = '';
+    response.setEncoding('utf-8');
+    response.on('data', (chunk: string) => {
+      buffer += chunk;
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const event: Event = {};
+        for (const line of block.split('\n')) {
+          const [field, ...rest] = line.split(': ');
+          if (field === 'id' || field === 'event') event[field] = rest.join(': ');
+          if (field === 'data') event.data = JSON.parse(rest.join(': '));
+        }
+        if (event.event) events.push(event);
+        if (events.length === count) resolve(events);
+      }
+    });
+  });
+}
+
+describe('parseEventId', () => {
+  it('should split epoch and sequence', () => {
+    expect(parseEventId('abc:12')).toEqual({ epoch: 'abc', sequence: 12 });
+    expect(parseEventId('12')).toBeNull();
+    expect(parseEventId(undefined)).toBeNull();
+  });
+});
+
+describe('formatEvent', () => {
+  it('should write one data line', () => {
+    expect(formatEvent('added', { a: 'x\ny' }, 'e:1')).toBe('id: e:1\nevent: added\ndata: {"a":"x\\ny"}\n\n');
+  });
+});
+
+describe('EventStream', () => {
+  const empty = createSnapshot([]);
+  const first = createSnapshot([source('echo')]);
+  let log: ChangeLog;
+  let stream: EventStream;
+  let server: Server;
+  let url: string;
+
+  const connect = (headers: Record<string, string> = {}) =>
+    new Promise<IncomingMessage>(resolve => get(url, { headers }, resolve));
+
+  beforeEach(async () => {
+    log = new ChangeLog(100, 'epoch');
+    stream = new EventStream(log, { heartbeatMs: 20, maxReplay: 2 });
+    server = createServer((request, response) => {
+      const lastEventId = request.headers['last-event-id'];
+      stream.subscribe(response, typeof lastEventId === 'string' ? lastEventId : undefined);
+    });
+    await new Promise<void>(resolve => server.listen(0, '127.0.0.1', resolve));
+    url = `http://127.0.0.1:${(server.address() as AddressInfo).port}/`;
+  });
+
+  afterEach(async () => {
+    stream.close();
+    await new Promise(resolve => server.close(resolve));
+  });
+
+  it('should announce the current position, then push changes as they are recorded', async () => {
+    log.record(empty, first);
+    const response = await connect();
+    expect(response.headers['content-type']).toBe('text/event-stream; charset=utf-8');
+
+    const events = collect(response, 3);
+    await new Promise(resolve => setTimeout(resolve, 10));
+    log.record(first, createSnapshot([source('echo'), source('weather')]));
+    log.record(first, empty);
+
+    expect((await events).map(e => [e.id, e.event, e.data.name ?? e.data.sequence])).toEqual([
+      ['epoch:1', 'ready', 1],
+      ['epoch:2', 'added', 'ai.nimbletools/weather'],
+      ['epoch:3', 'removed', 'ai.nimbletools/echo']
+    ]);
+    expect(stream.size).toBe(1);
+    response.destroy();
+  });
+
+  it('should replay what a reconnecting client missed', async () => {
+    log.record(empty, createSnapshot([source('echo'), source('weather')]));
+    const response = await connect({ 'last-event-id': 'epoch:1' });
+
+    expect((await collect(response, 1)).map(e => [e.id, e.event])).toEqual([['epoch:2', 'added']]);
+    response.destroy();
+  });
+
+  it('should resume a stream from another process started from the same catalog', async () => {
+    const catalog = [source('echo'), source('weather')];
+    const other = new ChangeLog();
+    other.record(empty, createSnapshot(catalog));
+    stream.close();
+    log = new ChangeLog();
+    log.record(empty, createSnapshot(catalog));
+    stream = new EventStream(log, { heartbeatMs: 20, maxReplay: 2 });
+
+    const response = await connect({ 'last-event-id': `${other.epoch}:1` });
+
+    expect((await collect(response, 1)).map(e => [e.id, e.event])).toEqual([[`${other.epoch}:2`, 'added']]);
+    response.destroy();
+  });
+
+  it('should send a reset when the gap cannot be replayed', async () => {
+    log.record(empty, createSnapshot([source('a'), source('b'), source('c')]));
+
+    const stale = await connect({ 'last-event-id': 'previous:1' });
+    expect((await collect(stale, 1))[0]).toEqual({ id: 'epoch:3', event: 'reset', data: { epoch: 'epoch', sequence: 3 } });
+    stale.destroy();
+
+    // More than maxReplay entries behind
+    const behind = await connect({ 'last-event-id': 'epoch:0' });
+    expect((await collect(behind, 1))[0].event).toBe('reset');
+    behind.destroy();
+  });
+
+  it('should forget subscribers that disconnect', async () => {
+    const response = await connect();
+    await collect(response, 1);
+    response.destroy();
+    await new Promise(resolve => setTimeout(resolve, 50));
+
+    expect(stream.size).toBe(0);
+  });
+});
@@ -0,0 +1,182 @@
+/**
+ * Server-Sent Events stream of catalog changes
+ *
+ * Subscribers receive one event per change log entry as soon as a new
+ * catalog snapshot is swapped in. Each batch is serialized once and the
+ * same buffer is written to every subscriber, so an idle subscriber costs
+ * little more than its socket. A subscriber that stops reading is dropped
+ * once more than `maxBufferedBytes` are queued for it, which bounds memory
+ * per connection; a single shared heartbeat keeps proxies from closing
+ * idle streams and surfaces dead sockets.
+ *
+ * Event ids are `<epoch>:<sequence>`, so the Last-Event-ID a client sends
+ * when it reconnects resumes exactly after the last event it saw, or gets
+ * a `reset` event when the change log no longer covers that position.
+ */
+
+import type { OutgoingHttpHeaders, ServerResponse } from 'http';
+import type { ChangeLog } from '../catalog/changes.js';
+import type { ChangeEntry } from '../types/api.js';
+
+export interface EventStreamOptions {
+  /** Interval between heartbeat comments (default 15s) */
+  heartbeatMs?: number;
+  /** Concurrent subscribers accepted (default 10000) */
+  maxSubscribers?: number;
+  /** Bytes queued for one subscriber before it is dropped (default 256 KiB) */
+  maxBufferedBytes?: number;
+  /** Missed entries replayed on reconnect; a longer gap gets a reset (default 1000) */
+  maxReplay?: number;
+}
+
+const DEFAULT_HEARTBEAT = 15000;
+const DEFAULT_MAX_SUBSCRIBERS = 10000;
+const DEFAULT_MAX_BUFFERED_BYTES = 256 * 1024;
+const DEFAULT_MAX_REPLAY = 1000;
+
+// Client reconnection delay, sent once per stream
+const RETRY_MS = 5000;
+
+const HEARTBEAT = Buffer.from(':\n\n');
+
+/**
+ * Format one event. JSON never contains raw newlines, so the data always
+ * fits on a single line.
+ */
+export function formatEvent(event: string, data: unknown, id?: string): string {
+  return `${id === undefined ? '' : `id: ${id}\n`}event: ${event}\ndata: ${JSON.stringify(data)}\n\n`;
+}
+
+/**
+ * Parse an `<epoch>:<sequence>` event id; null when it is not one
+ */
+export function parseEventId(id: string | undefined): { epoch: string; sequence: number } | null {
+  const match = id ? /^(.+):(\d+)$/.exec(id.trim()) : null;
+  return match ? { epoch: match[1], sequence: Number(match[2]) } : null;
+}
+
+export class EventStream {
+  private readonly subscribers = new Set<ServerResponse>();
+  private readonly unsubscribe: () => void;
+  private heartbeat: NodeJS.Timeout | null = null;
+  private droppedCount = 0;
+
+  constructor(
+    private readonly changes: ChangeLog,
+    private readonly options: EventStreamOptions = {}
+  ) {
+    this.unsubscribe = changes.subscribe(entries => {
+      this.broadcast(Buffer.from(this.encode(entries)));
+    });
+  }
+
+  /** Number of connected subscribers */
+  get size(): number {
+    return this.subscribers.size;
+  }
+
+  /** Subscribers dropped for not keeping up */
+  get dropped(): number {
+    return this.droppedCount;
+  }
+
+  /** Whether another subscriber would exceed the limit */
+  get full(): boolean {
+    return this.subscribers.size >= (this.options.maxSubscribers ?? DEFAULT_MAX_SUBSCRIBERS);
+  }
+
+  /**
+   * Start streaming to a response whose headers have not been written yet.
+   * Extra headers (e.g. CORS) are sent along with the stream headers.
+   */
+  subscribe(response: ServerResponse, lastEventId?: string, headers: OutgoingHttpHeaders = {}): void {
+    response.writeHead(200, {
+      ...headers,
+      'content-type': 'text/event-stream; charset=utf-8',
+      'cache-control': 'no-cache, no-transform',
+      connection: 'keep-alive',
+      // Stop reverse proxies from buffering the stream
+      'x-accel-buffering': 'no'
+    });
+    response.write(`retry: ${RETRY_MS}\n\n${this.replay(lastEventId)}`);
+
+    this.subscribers.add(response);
+    response.on('close', () => this.remove(response));
+    this.startHeartbeat();
+  }
+
+  /**
+   * End every stream and stop listening for changes
+   */
+  close(): void {
+    this.unsubscribe();
+    this.stopHeartbeat();
+    for (const response of this.subscribers) {
+      response.end();
+    }
+    this.subscribers.clear();
+  }
+
+  /**
+   * Events a (re)connecting subscriber missed, or a marker telling it
+   * where the stream starts
+   */
+  private replay(lastEventId: string | undefined): string {
+    const position = `${this.changes.epoch}:${this.changes.sequence}`;
+    const marker = { epoch: this.changes.epoch, sequence: this.changes.sequence };
+
+    const last = parseEventId(lastEventId);
+    if (!last) {
+      return formatEvent('ready', marker, position);
+    }
+
+    const page = this.changes.since(last.sequence, this.options.maxReplay ?? DEFAULT_MAX_REPLAY, last.epoch);
+    if (page.reset || page.hasMore) {
+      return formatEvent('reset', marker, position);
+    }
+    return this.encode(page.changes);
+  }
+
+  private encode(entries: readonly ChangeEntry[]): string {
+    let text = '';
+    for (const { sequence, type, name, version, versionId } of entries) {
+      // Notifications only; clients fetch the definitions they care about
+      text += formatEvent(type, { sequence, name, version, versionId }, `${this.changes.epoch}:${sequence}`);
+    }
+    return text;
+  }
+
+  private broadcast(chunk: Buffer): void {
+    const limit = this.options.maxBufferedBytes ?? DEFAULT_MAX_BUFFERED_BYTES;
+    for (const response of this.subscribers) {
+      if (response.writableLength > limit) {
+        // Not reading; it can reconnect with Last-Event-ID once it catches up
+        this.droppedCount++;
+        this.remove(response);
+        response.destroy();
+        continue;
+      }
+      response.write(chunk);
+    }
+  }
+
+  private remove(response: ServerResponse): void {
+    this.subscribers.delete(response);
+    if (this.subscribers.size === 0) {
+      this.stopHeartbeat();
+    }
+  }
+
+  private startHeartbeat(): void {
+    if (this.heartbeat) return;
+    this.heartbeat = setInterval(() => this.broadcast(HEARTBEAT), this.options.heartbeatMs ?? DEFAULT_HEARTBEAT);
+    this.heartbeat.unref();
+  }
+
+  private stopHeartbeat(): void {
+    if (this.heartbeat) {
+      clearInterval(this.heartbeat);
+      this.heartbeat = null;
+    }
+  }
+}
@@ -0,0 +1,94 @@
+import { describe, it, expect } from 'vitest';
+import { metricsEnabled, MetricsRegistry, scrapeAuthorized } from './metrics.js';
+
+describe('MetricsRegistry', () => {
+  it('should render counters and gauges with help, type and labels', () => {
+    const registry = new MetricsRegistry();
+    const requests = registry.counter('requests_total', 'Requests served');
+    const servers = registry.gauge('servers', 'Servers loaded');
+
+    requests.inc({ route: '/v0.1/servers', status: 200 });
+    requests.inc({ route: '/v0.1/servers', status: 200 }, 2);
+    requests.inc({ route: '/v0.1/health', status: 200 });
+    servers.set({}, 18);
+
+    expect(registry.render()).toBe([
+      '# HELP requests_total Requests served',
+      '# TYPE requests_total counter',
+      'requests_total{route="/v0.1/servers",status="200"} 3',
+      'requests_total{route="/v0.1/health",status="200"} 1',
+      '# HELP servers Servers loaded',
+      '# TYPE servers gauge',
+      'servers 18',
+      ''
+    ].join('\n'));
+  });
+
+  it('should render cumulative histogram buckets with sum and count', () => {
+    const registry = new MetricsRegistry();
+    const latency = registry.histogram('latency_seconds', 'Latency', [0.01, 0.1]);
+
+    latency.observe({ route: '/' }, 0.005);
+    latency.observe({ route: '/' }, 0.01);
+    latency.observe({ route: '/' }, 0.05);
+    latency.observe({ route: '/' }, 2);
+
+    expect(registry.render().split('\n').slice(2)).toEqual([
+      'latency_seconds_bucket{route="/",le="0.01"} 2',
+      'latency_seconds_bucket{route="/",le="0.1"} 3',
+      'latency_seconds_bucket{route="/",le="+Inf"} 4',
+      'latency_seconds_sum{route="/"} 2.065',
+      'latency_seconds_count{route="/"} 4',
+      ''
+    ]);
+  });
+
+  it('should escape label values', () => {
+    const registry = new MetricsRegistry();
+    registry.counter('errors_total', 'Errors').inc({ message: 'bad "input"\\n' });
+
+    expect(registry.render()).toContain('errors_total{message="bad \\"input\\"\\\\n"} 1');
+  });
+
+  it('should run collectors before rendering', () => {
+    const registry = new MetricsRegistry();
+    const gauge = registry.gauge('value', 'Value');
+    let value = 1;
+    registry.collect(() => gauge.set({}, value));
+
+    expect(registry.render()).toContain('value 1');
+    value = 2;
+    expect(registry.render()).toContain('value 2');
+  });
+
+  it('should reject duplicate metric names', () => {
+    const registry = new MetricsRegistry();
+    registry.counter('requests_total', 'Requests');
+
+    expect(() => registry.gauge('requests_total', 'Requests')).toThrow();
+  });
+});
+
+describe('metricsEnabled', () => {
+  it('should serve metrics outside production by default', () => {
+    expect(metricsEnabled({})).toBe(true);
+    expect(metricsEnabled({ NODE_ENV: 'test' })).toBe(true);
+    expect(metricsEnabled({ NODE_ENV: 'production' })).toBe(false);
+  });
+
+  it('should serve metrics in production only with a token or when enabled', () => {
+    expect(metricsEnabled({ NODE_ENV: 'production', METRICS_TOKEN: 'secret' })).toBe(true);
+    expect(metricsEnabled({ NODE_ENV: 'production', METRICS_ENABLED: 'true' })).toBe(true);
+    expect(metricsEnabled({ METRICS_ENABLED: 'false', METRICS_TOKEN: 'secret' })).toBe(false);
+  });
+});
+
+describe('scrapeAuthorized', () => {
+  it('should require the bearer token when there is one', () => {
+    expect(scrapeAuthorized(undefined, undefined)).toBe(true);
+    expect(scrapeAuthorized('Bearer secret', 'secret')).toBe(true);
+    expect(scrapeAuthorized('Bearer other', 'secret')).toBe(false);
+    expect(scrapeAuthorized('secret', 'secret')).toBe(false);
+    expect(scrapeAuthorized(undefined, 'secret')).toBe(false);
+  });
+});
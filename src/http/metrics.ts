@@ -0,0 +1,270 @@
+/**
+ * Prometheus metrics
+ *
+ * A small registry of counters, gauges and histograms rendered in the
+ * Prometheus text exposition format (version 0.0.4). Request metrics are
+ * updated as responses complete; everything that already has a source of
+ * truth elsewhere (cache hit counts, catalog size, memory) is read from
+ * it by a collector when the registry is rendered.
+ */
+
+import { createHash, timingSafeEqual } from 'crypto';
+import type { FastifyInstance } from 'fastify';
+import { monitorEventLoopDelay } from 'perf_hooks';
+
+export const METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
+
+// Request latency buckets, in seconds
+export const LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5];
+// Response body size buckets, in bytes
+export const SIZE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304];
+
+export type Labels = Record<string, string | number>;
+
+function escapeLabel(value: string): string {
+  return value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+function formatLabels(labels: Labels): string {
+  const pairs = Object.entries(labels).map(([name, value]) => `${name}="${escapeLabel(String(value))}"`);
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+}
+
+function formatValue(value: number): string {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return Number.isNaN(value) ? 'NaN' : String(value);
+}
+
+abstract class Metric {
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    readonly type: 'counter' | 'gauge' | 'histogram'
+  ) {}
+
+  render(): string {
+    return `# HELP ${this.name} ${this.help.replace(/\\/g, '\\\\').replace(/\n/g, '\\n')}\n# TYPE ${this.name} ${this.type}\n${this.samples()}`;
+  }
+
+  protected abstract samples(): string;
+}
+
+class ValueMetric extends Metric {
+  protected readonly series = new Map<string, { labels: string; value: number }>();
+
+  /**
+   * Replace the value of one series
+   */
+  set(labels: Labels, value: number): void {
+    const key = formatLabels(labels);
+    const series = this.series.get(key);
+    if (series) {
+      series.value = value;
+    } else {
+      this.series.set(key, { labels: key, value });
+    }
+  }
+
+  protected samples(): string {
+    let out = '';
+    for (const series of this.series.values()) {
+      out += `${this.name}${series.labels} ${formatValue(series.value)}\n`;
+    }
+    return out;
+  }
+}
+
+export class Counter extends ValueMetric {
+  constructor(name: string, help: string) {
+    super(name, help, 'counter');
+  }
+
+  inc(labels: Labels = {}, value = 1): void {
+    const key = formatLabels(labels);
+    const series = this.series.get(key);
+    if (series) {
+      series.value += value;
+    } else {
+      this.series.set(key, { labels: key, value });
+    }
+  }
+}
+
+export class Gauge extends ValueMetric {
+  constructor(name: string, help: string) {
+    super(name, help, 'gauge');
+  }
+}
+
+interface HistogramSeries {
+  /** Label pairs without braces, for appending `le` */
+  labels: string;
+  /** Non-cumulative count per bucket; the last slot is +Inf */
+  counts: number[];
+  sum: number;
+  count: number;
+}
+
+export class Histogram extends Metric {
+  private readonly series = new Map<string, HistogramSeries>();
+
+  constructor(name: string, help: string, private readonly buckets: readonly number[]) {
+    super(name, help, 'histogram');
+  }
+
+  observe(labels: Labels, value: number): void {
+    const key = formatLabels(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels: key.slice(1, -1), counts: new Array(this.buckets.length + 1).fill(0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+
+    let bucket = 0;
+    while (bucket < this.buckets.length && value > this.buckets[bucket]) bucket++;
+    series.counts[bucket]++;
+    series.sum += value;
+    series.count++;
+  }
+
+  protected samples(): string {
+    let out = '';
+    for (const series of this.series.values()) {
+      const prefix = series.labels ? `${series.labels},` : '';
+      const labels = series.labels ? `{${series.labels}}` : '';
+      let cumulative = 0;
+      for (let i = 0; i <= this.buckets.length; i++) {
+        cumulative += series.counts[i];
+        const le = i < this.buckets.length ? formatValue(this.buckets[i]) : '+Inf';
+        out += `${this.name}_bucket{${prefix}le="${le}"} ${cumulative}\n`;
+      }
+      out += `${this.name}_sum${labels} ${formatValue(series.sum)}\n`;
+      out += `${this.name}_count${labels} ${series.count}\n`;
+    }
+    return out;
+  }
+}
+
+export class MetricsRegistry {
+  private readonly metrics = new Map<string, Metric>();
+  private readonly collectors: Array<() => void> = [];
+
+  counter(name: string, help: string): Counter {
+    return this.register(new Counter(name, help));
+  }
+
+  gauge(name: string, help: string): Gauge {
+    return this.register(new Gauge(name, help));
+  }
+
+  histogram(name: string, help: string, buckets: readonly number[]): Histogram {
+    return this.register(new Histogram(name, help, buckets));
+  }
+
+  /**
+   * Run a function before every render, to copy values from their source
+   */
+  collect(collector: () => void): void {
+    this.collectors.push(collector);
+  }
+
+  /**
+   * Every metric in the text exposition format
+   */
+  render(): string {
+    for (const collector of this.collectors) {
+      try {
+        collector();
+      } catch (error) {
+        console.error('Error collecting metrics:', error);
+      }
+    }
+    return Array.from(this.metrics.values(), metric => metric.render()).join('');
+  }
+
+  private register<T extends Metric>(metric: T): T {
+    if (this.metrics.has(metric.name)) {
+      throw new Error(`Metric ${metric.name} is already registered`);
+    }
+    this.metrics.set(metric.name, metric);
+    return metric;
+  }
+}
+
+/**
+ * Whether to serve /metrics. `METRICS_ENABLED` decides when set;
+ * otherwise metrics are served outside production, and in production
+ * only when scrapes must present `METRICS_TOKEN`.
+ */
+export function metricsEnabled(env: NodeJS.ProcessEnv): boolean {
+  if (env.METRICS_ENABLED) {
+    return env.METRICS_ENABLED !== 'false';
+  }
+  return env.NODE_ENV !== 'production' || Boolean(env.METRICS_TOKEN);
+}
+
+/**
+ * Whether a scrape's Authorization header carries the bearer token
+ * (any scrape is allowed when there is no token)
+ */
+export function scrapeAuthorized(authorization: string | undefined, token: string | undefined): boolean {
+  if (!token) return true;
+  // Hashing first gives equal lengths for a constant-time comparison
+  const digest = (value: string) => createHash('sha256').update(value).digest();
+  return timingSafeEqual(digest(authorization ?? ''), digest(`Bearer ${token}`));
+}
+
+/**
+ * Count, time and size every response by route pattern and method
+ */
+export function instrumentRequests(fastify: FastifyInstance, registry: MetricsRegistry): void {
+  const requests = registry.counter('registry_http_requests_total', 'HTTP responses sent, by route, method and status code');
+  const duration = registry.histogram('registry_http_request_duration_seconds', 'Time from request to response, by route and method', LATENCY_BUCKETS);
+  const size = registry.histogram('registry_http_response_size_bytes', 'Response body size, by route and method', SIZE_BUCKETS);
+
+  fastify.addHook('onResponse', async (request, reply) => {
+    // The route pattern rather than the URL keeps the number of series bounded
+    const labels = { route: request.routeOptions.url ?? 'unmatched', method: request.method };
+    requests.inc({ ...labels, status: reply.statusCode });
+    duration.observe(labels, reply.elapsedTime / 1000);
+
+    const length = Number(reply.getHeader('content-length'));
+    if (Number.isFinite(length)) {
+      size.observe(labels, length);
+    }
+  });
+}
+
+/**
+ * Event loop delay and memory of this process. Event loop delay covers
+ * the time since the previous render. Returns a function that stops
+ * sampling.
+ */
+export function instrumentProcess(registry: MetricsRegistry): () => void {
+  const delay = monitorEventLoopDelay({ resolution: 10 });
+  delay.enable();
+
+  const lag = registry.gauge('nodejs_eventloop_lag_seconds', 'Event loop delay since the previous scrape, by quantile');
+  const lagMax = registry.gauge('nodejs_eventloop_lag_max_seconds', 'Longest event loop delay since the previous scrape');
+  const heapUsed = registry.gauge('nodejs_heap_used_bytes', 'V8 heap in use');
+  const heapTotal = registry.gauge('nodejs_heap_total_bytes', 'V8 heap allocated');
+  const external = registry.gauge('nodejs_external_memory_bytes', 'Memory used by buffers and other objects outside the V8 heap');
+  const rss = registry.gauge('process_resident_memory_bytes', 'Resident set size');
+
+  registry.collect(() => {
+    for (const quantile of [0.5, 0.9, 0.99]) {
+      lag.set({ quantile }, delay.percentile(quantile * 100) / 1e9);
+    }
+    lagMax.set({}, delay.max / 1e9);
+    delay.reset();
+
+    const memory = process.memoryUsage();
+    heapUsed.set({}, memory.heapUsed);
+    heapTotal.set({}, memory.heapTotal);
+    external.set({}, memory.external);
+    rss.set({}, memory.rss);
+  });
+
+  return () => delay.disable();
+}
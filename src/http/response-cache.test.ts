@@ -0,0 +1,58 @@
+import { describe, it, expect } from 'vitest';
+import { EncodedBody } from './compression.js';
+import { ResponseCache, type CachedResponse } from './response-cache.js';
+
+function response(body: string): CachedResponse {
+  return { body: new EncodedBody(Buffer.from(body)), etag: `"${body}"` };
+}
+
+describe('ResponseCache', () => {
+  it('should build once per key and serve hits afterwards', () => {
+    const cache = new ResponseCache();
+    let builds = 0;
+    const build = () => {
+      builds++;
+      return response('a');
+    };
+
+    const first = cache.getOrBuild('s1', 'k', build);
+    const second = cache.getOrBuild('s1', 'k', build);
+
+    expect(second).toBe(first);
+    expect(builds).toBe(1);
+    expect(cache.stats).toEqual({ hits: 1, misses: 1, entries: 1 });
+  });
+
+  it('should drop every entry when the snapshot changes', () => {
+    const cache = new ResponseCache();
+    cache.getOrBuild('s1', 'a', () => response('a'));
+    cache.getOrBuild('s1', 'b', () => response('b'));
+
+    const rebuilt = cache.getOrBuild('s2', 'a', () => response('a2'));
+
+    expect(rebuilt.body.identity.toString()).toBe('a2');
+    expect(cache.stats.entries).toBe(1);
+  });
+
+  it('should evict the least recently used entry', () => {
+    const cache = new ResponseCache(2);
+    cache.getOrBuild('s', 'a', () => response('a'));
+    cache.getOrBuild('s', 'b', () => response('b'));
+    // Touch "a" so "b" becomes the eviction candidate
+    cache.getOrBuild('s', 'a', () => response('a'));
+    cache.getOrBuild('s', 'c', () => response('c'));
+
+    let rebuilt = false;
+    cache.getOrBuild('s', 'a', () => {
+      rebuilt = true;
+      return response('a');
+    });
+    expect(rebuilt).toBe(false);
+
+    cache.getOrBuild('s', 'b', () => {
+      rebuilt = true;
+      return response('b');
+    });
+    expect(rebuilt).toBe(true);
+  });
+});
@@ -0,0 +1,63 @@
+/**
+ * Cache of ready-to-send response bodies
+ *
+ * Entries belong to one catalog snapshot. The first lookup with a
+ * different snapshot id drops every entry, so a catalog change
+ * invalidates the whole cache at once. Within a snapshot, entries are
+ * evicted least-recently-used first.
+ */
+
+import type { EncodedBody } from './compression.js';
+
+export interface CachedResponse {
+  /** Serialized JSON body and its compressed variants */
+  readonly body: EncodedBody;
+  readonly etag: string;
+}
+
+export interface ResponseCacheStats {
+  hits: number;
+  misses: number;
+  entries: number;
+}
+
+export class ResponseCache {
+  private readonly entries = new Map<string, CachedResponse>();
+  private snapshotId = '';
+  private hits = 0;
+  private misses = 0;
+
+  constructor(private readonly maxEntries = 256) {}
+
+  get stats(): ResponseCacheStats {
+    return { hits: this.hits, misses: this.misses, entries: this.entries.size };
+  }
+
+  /**
+   * Return the cached response for a key, building and storing it on a miss
+   */
+  getOrBuild(snapshotId: string, key: string, build: () => CachedResponse): CachedResponse {
+    if (snapshotId !== this.snapshotId) {
+      this.entries.clear();
+      this.snapshotId = snapshotId;
+    }
+
+    const cached = this.entries.get(key);
+    if (cached) {
+      this.hits++;
+      // Re-insert to mark as most recently used
+      this.entries.delete(key);
+      this.entries.set(key, cached);
+      return cached;
+    }
+
+    this.misses++;
+    const entry = build();
+    this.entries.set(key, entry);
+    if (this.entries.size > this.maxEntries) {
+      // Map iteration order is insertion order: the first key is the least recently used
+      this.entries.delete(this.entries.keys().next().value!);
+    }
+    return entry;
+  }
+}
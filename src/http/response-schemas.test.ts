@@ -0,0 +1,67 @@
+import { describe, it, expect } from 'vitest';
+import { readFileSync } from 'fs';
+import { dirname, join } from 'path';
+import { fileURLToPath } from 'url';
+import { serializationSchema, serverDetailSchema } from './response-schemas.js';
+
+const __dirname = dirname(fileURLToPath(import.meta.url));
+const BUNDLED_SCHEMA = JSON.parse(readFileSync(
+  join(__dirname, '..', '..', 'schemas', '2025-12-11', 'nimbletools-server.bundled.schema.json'),
+  'utf-8'
+));
+
+describe('serializationSchema', () => {
+  it('should keep structure and drop validation keywords', () => {
+    expect(serializationSchema({
+      type: 'object',
+      required: ['name'],
+      properties: {
+        name: { type: 'string', minLength: 1, pattern: '^a' },
+        port: { type: 'integer', minimum: 1 },
+        tags: { type: 'array', items: { type: 'string' } }
+      }
+    })).toEqual({
+      type: 'object',
+      additionalProperties: true,
+      properties: {
+        name: { type: 'string' },
+        // integer would round non-integral values
+        port: { type: 'number' },
+        tags: { type: 'array', items: { type: 'string' } }
+      }
+    });
+  });
+
+  it('should leave unions and conditionals untyped', () => {
+    expect(serializationSchema({ anyOf: [{ type: 'string' }, { type: 'number' }] })).toEqual({});
+    expect(serializationSchema({ type: ['string', 'null'] })).toEqual({});
+  });
+
+  it('should merge allOf branches', () => {
+    expect(serializationSchema({
+      allOf: [
+        { type: 'object', properties: { a: { type: 'string' } } },
+        { properties: { b: { type: 'boolean' } } },
+        { if: { required: ['a'] }, then: { required: ['b'] } }
+      ]
+    })).toEqual({
+      type: 'object',
+      additionalProperties: true,
+      properties: { a: { type: 'string' }, b: { type: 'boolean' } }
+    });
+  });
+});
+
+describe('serverDetailSchema', () => {
+  it('should describe server fields and both metadata namespaces', () => {
+    const schema = serverDetailSchema(BUNDLED_SCHEMA);
+    const meta = schema.properties?._meta;
+
+    expect(schema.additionalProperties).toBe(true);
+    expect(schema.properties?.name).toEqual({ type: 'string' });
+    expect(schema.properties?.packages?.type).toBe('array');
+    expect(meta?.properties?.['ai.nimbletools.mcp/v1']?.type).toBe('object');
+    expect(meta?.properties?.['io.modelcontextprotocol.registry/official']?.properties?.isLatest)
+      .toEqual({ type: 'boolean' });
+  });
+});
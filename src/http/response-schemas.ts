@@ -0,0 +1,276 @@
+/**
+ * Response schemas for the API routes
+ *
+ * Fastify compiles these into specialized serializers (fast-json-stringify)
+ * and uses them for the OpenAPI documentation. The server detail schema is
+ * derived from the bundled NimbleTools server schema, reduced to what a
+ * serializer needs: every object keeps unknown properties and every value
+ * whose shape the schema cannot pin down (unions, conditionals) is written
+ * as-is, so serialization never drops or coerces data.
+ */
+
+export interface JsonSchema {
+  type?: string;
+  properties?: Record<string, JsonSchema>;
+  items?: JsonSchema;
+  additionalProperties?: boolean | JsonSchema;
+  required?: string[];
+  enum?: unknown[];
+  description?: string;
+  [keyword: string]: unknown;
+}
+
+const SCALAR_TYPES = new Set(['string', 'number', 'boolean']);
+
+/**
+ * Merge two reduced object schemas (used for allOf)
+ */
+function mergeSchemas(a: JsonSchema, b: JsonSchema): JsonSchema {
+  if (a.type === undefined && a.properties === undefined) return b;
+  if (b.type === undefined && b.properties === undefined) return a;
+  if (a.type !== 'object' || b.type !== 'object') {
+    return a.type === b.type ? a : {};
+  }
+
+  const properties: Record<string, JsonSchema> = { ...a.properties };
+  for (const [key, value] of Object.entries(b.properties ?? {})) {
+    properties[key] = key in properties ? mergeSchemas(properties[key], value) : value;
+  }
+  return { type: 'object', properties, additionalProperties: true };
+}
+
+/**
+ * Reduce a validation schema to a lossless serialization schema
+ */
+export function serializationSchema(schema: unknown): JsonSchema {
+  if (!schema || typeof schema !== 'object') return {};
+  const source = schema as Record<string, unknown>;
+
+  // Unions and conditionals cannot be compiled losslessly; fall back to JSON.stringify
+  if (source.anyOf || source.oneOf || source.if || Array.isArray(source.type)) {
+    return {};
+  }
+
+  let reduced: JsonSchema = {};
+  if (source.type === 'object' || source.properties) {
+    const properties: Record<string, JsonSchema> = {};
+    for (const [key, value] of Object.entries((source.properties ?? {}) as Record<string, unknown>)) {
+      properties[key] = serializationSchema(value);
+    }
+    reduced = { type: 'object', properties, additionalProperties: true };
+  } else if (source.type === 'array') {
+    reduced = { type: 'array', items: serializationSchema(source.items) };
+  } else if (source.type === 'integer') {
+    // 'integer' would round non-integral values
+    reduced = { type: 'number' };
+  } else if (typeof source.type === 'string' && SCALAR_TYPES.has(source.type)) {
+    reduced = { type: source.type };
+  }
+
+  if (Array.isArray(source.allOf)) {
+    for (const branch of source.allOf) {
+      reduced = mergeSchemas(reduced, serializationSchema(branch));
+    }
+  }
+  return reduced;
+}
+
+const registryMetadataSchema: JsonSchema = {
+  type: 'object',
+  properties: {
+    serverId: { type: 'string' },
+    versionId: { type: 'string' },
+    publishedAt: { type: 'string' },
+    updatedAt: { type: 'string' },
+    isLatest: { type: 'boolean' }
+  },
+  additionalProperties: true
+};
+
+/**
+ * Server detail schema built from the bundled NimbleTools server schema,
+ * plus the registry metadata the API attaches
+ */
+export function serverDetailSchema(bundledSchema: unknown): JsonSchema {
+  const schema = mergeSchemas(
+    serializationSchema(bundledSchema),
+    {
+      type: 'object',
+      properties: {
+        _meta: {
+          type: 'object',
+          properties: { 'io.modelcontextprotocol.registry/official': registryMetadataSchema },
+          additionalProperties: true
+        }
+      },
+      additionalProperties: true
+    }
+  );
+  return { ...schema, description: 'MCP server definition with registry metadata' };
+}
+
+// Open so Fastify's own validation errors keep their message
+export const errorResponseSchema: JsonSchema = {
+  type: 'object',
+  properties: {
+    error: { type: 'string' }
+  },
+  required: ['error'],
+  additionalProperties: true
+};
+
+export function serverListResponseSchema(serverDetail: JsonSchema): JsonSchema {
+  return {
+    type: 'object',
+    properties: {
+      servers: { type: 'array', items: serverDetail },
+      metadata: {
+        type: 'object',
+        properties: {
+          next_cursor: { type: 'string' },
+          count: { type: 'number' },
+          facets: {
+            type: 'object',
+            additionalProperties: {
+              type: 'object',
+              additionalProperties: { type: 'number' }
+            }
+          }
+        }
+      }
+    },
+    required: ['servers']
+  };
+}
+
+export function versionListResponseSchema(serverDetail: JsonSchema): JsonSchema {
+  return {
+    type: 'object',
+    properties: {
+      servers: { type: 'array', items: serverDetail },
+      metadata: {
+        type: 'object',
+        properties: {
+          count: { type: 'number' }
+        }
+      }
+    },
+    required: ['servers']
+  };
+}
+
+const serverReferenceSchema: JsonSchema = {
+  type: 'object',
+  properties: {
+    name: { type: 'string' },
+    version: { type: 'string' }
+  },
+  required: ['name']
+};
+
+export function batchGetResponseSchema(serverDetail: JsonSchema): JsonSchema {
+  return {
+    type: 'object',
+    properties: {
+      servers: { type: 'array', items: serverDetail },
+      missing: { type: 'array', items: serverReferenceSchema },
+      metadata: {
+        type: 'object',
+        properties: {
+          count: { type: 'number' }
+        }
+      }
+    },
+    required: ['servers', 'missing']
+  };
+}
+
+export function changesResponseSchema(serverDetail: JsonSchema): JsonSchema {
+  return {
+    type: 'object',
+    properties: {
+      changes: {
+        type: 'array',
+        items: {
+          type: 'object',
+          properties: {
+            sequence: { type: 'number' },
+            type: { type: 'string', enum: ['added', 'updated', 'removed'] },
+            name: { type: 'string' },
+            version: { type: 'string' },
+            versionId: { type: 'string' },
+            server: serverDetail
+          },
+          required: ['sequence', 'type', 'name', 'version']
+        }
+      },
+      metadata: {
+        type: 'object',
+        properties: {
+          count: { type: 'number' },
+          next_since: { type: 'number' },
+          epoch: { type: 'string' },
+          has_more: { type: 'boolean' },
+          reset: { type: 'boolean' }
+        }
+      }
+    },
+    required: ['changes', 'metadata']
+  };
+}
+
+export const healthResponseSchema: JsonSchema = {
+  type: 'object',
+  properties: {
+    status: { type: 'string', enum: ['healthy', 'unhealthy'] },
+    servers_loaded: { type: 'number' },
+    cache_age_ms: { type: 'number' },
+    snapshot_id: { type: 'string' },
+    reloads_coalesced: { type: 'number' },
+    event_subscribers: { type: 'number' }
+  },
+  required: ['status', 'servers_loaded']
+};
+
+export const rootResponseSchema: JsonSchema = {
+  type: 'object',
+  properties: {
+    name: { type: 'string' },
+    version: { type: 'string' },
+    endpoints: {
+      type: 'object',
+      additionalProperties: { type: 'string' }
+    },
+    documentation: { type: 'string' }
+  }
+};
+
+export const schemaListResponseSchema: JsonSchema = {
+  type: 'array',
+  items: {
+    type: 'object',
+    properties: {
+      name: { type: 'string' },
+      versions: { type: 'array', items: { type: 'string' } },
+      latest: { type: 'string' },
+      urls: {
+        type: 'object',
+        properties: {
+          latest: { type: 'string' },
+          versioned: { type: 'array', items: { type: 'string' } }
+        }
+      },
+      files: {
+        type: 'array',
+        items: {
+          type: 'object',
+          properties: {
+            version: { type: 'string' },
+            size: { type: 'number' },
+            sha256: { type: 'string' }
+          }
+        }
+      }
+    }
+  }
+};
@@ -0,0 +1,134 @@
+import { describe, it, expect, beforeAll, afterAll, beforeEach, afterEach } from 'vitest';
+import { createHash } from 'crypto';
+import { mkdtemp, mkdir, rm, writeFile } from 'fs/promises';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { SchemaAssetStore } from './schema-assets.js';
+
+describe('SchemaAssetStore', () => {
+  let schemasDir: string;
+  const large = JSON.stringify({ $schema: 'https://json-schema.org/draft-07/schema#', description: 'x'.repeat(4096) });
+
+  beforeAll(async () => {
+    schemasDir = await mkdtemp(join(tmpdir(), 'schemas-'));
+    await mkdir(join(schemasDir, '2025-01-01'));
+    await mkdir(join(schemasDir, '2025-12-11'));
+    await writeFile(join(schemasDir, '2025-01-01', 'server.schema.json'), '{}');
+    await writeFile(join(schemasDir, '2025-12-11', 'server.schema.json'), large);
+    await writeFile(join(schemasDir, '2025-12-11', 'README.md'), '# not a schema');
+  });
+
+  afterAll(async () => {
+    await rm(schemasDir, { recursive: true, force: true });
+  });
+
+  it('should load every JSON file with its hash and ETag', async () => {
+    const store = new SchemaAssetStore(schemasDir);
+    await store.load();
+    const asset = store.get('2025-12-11', 'server.schema.json')!;
+
+    expect(store.versions).toEqual(['2025-12-11', '2025-01-01']);
+    expect(asset.body.identity.toString()).toBe(large);
+    expect(asset.sha256).toBe(createHash('sha256').update(large).digest('hex'));
+    expect(asset.etag).toBe(`"${asset.sha256}"`);
+    expect(store.get('2025-12-11', 'README.md')).toBeUndefined();
+  });
+
+  it('should compress each file in the background', async () => {
+    const store = new SchemaAssetStore(schemasDir);
+    await store.load();
+    const asset = store.get('2025-12-11', 'server.schema.json')!;
+    await asset.body.prepareAll();
+
+    expect(asset.body.variant('gzip')).toBeDefined();
+  });
+
+  it('should not resolve paths outside the version directories', async () => {
+    const store = new SchemaAssetStore(schemasDir);
+    await store.load();
+
+    expect(store.get('..', 'server.schema.json')).toBeUndefined();
+    expect(store.get('2025-12-11', '../2025-01-01/server.schema.json')).toBeUndefined();
+  });
+
+  it('should be empty when the directory does not exist', async () => {
+    const store = new SchemaAssetStore(join(schemasDir, 'missing'));
+    await store.load();
+
+    expect(store.all).toEqual([]);
+    expect(store.index.entries).toEqual([]);
+  });
+
+  it('should list schema files by name, newest version first', async () => {
+    const store = new SchemaAssetStore(schemasDir);
+    await store.load();
+    const [entry] = store.index.entries;
+
+    expect(store.index.entries).toHaveLength(1);
+    expect(entry.name).toBe('server.schema.json');
+    expect(entry.latest).toBe('2025-12-11');
+    expect(entry.versions).toEqual(['2025-12-11', '2025-01-01']);
+    expect(entry.files[0]).toEqual({
+      version: '2025-12-11',
+      size: Buffer.byteLength(large),
+      sha256: store.get('2025-12-11', 'server.schema.json')!.sha256
+    });
+    expect(JSON.parse(store.index.body.identity.toString())).toEqual(store.index.entries);
+  });
+});
+
+describe('SchemaAssetStore reloading', () => {
+  let schemasDir: string;
+  let store: SchemaAssetStore;
+
+  async function waitFor(predicate: () => boolean) {
+    const deadline = Date.now() + 5000;
+    while (!predicate()) {
+      if (Date.now() > deadline) throw new Error('Timed out waiting for schemas change');
+      await new Promise(resolve => setTimeout(resolve, 10));
+    }
+  }
+
+  beforeEach(async () => {
+    schemasDir = await mkdtemp(join(tmpdir(), 'schemas-'));
+    await mkdir(join(schemasDir, '2025-12-11'));
+    await writeFile(join(schemasDir, '2025-12-11', 'server.schema.json'), '{"version":1}');
+    await writeFile(join(schemasDir, '2025-12-11', 'registry.schema.json'), '{}');
+    store = new SchemaAssetStore(schemasDir, 20);
+    await store.load();
+  });
+
+  afterEach(async () => {
+    store.close();
+    await rm(schemasDir, { recursive: true, force: true });
+  });
+
+  it('should keep unchanged files and change the index ETag on edits', async () => {
+    const unchanged = store.get('2025-12-11', 'registry.schema.json');
+    const etag = store.index.etag;
+
+    await writeFile(join(schemasDir, '2025-12-11', 'server.schema.json'), '{"version":2}');
+    await store.load();
+
+    expect(store.get('2025-12-11', 'registry.schema.json')).toBe(unchanged);
+    expect(store.get('2025-12-11', 'server.schema.json')!.body.identity.toString()).toBe('{"version":2}');
+    expect(store.index.etag).not.toBe(etag);
+  });
+
+  it('should keep the index ETag when nothing changed', async () => {
+    const etag = store.index.etag;
+    await store.load();
+
+    expect(store.index.etag).toBe(etag);
+  });
+
+  it('should reload when a file is added while watching', async () => {
+    store.watch();
+    await mkdir(join(schemasDir, '2026-01-01'));
+    await writeFile(join(schemasDir, '2026-01-01', 'server.schema.json'), '{"version":3}');
+
+    await waitFor(() => store.index.entries.find(entry => entry.name === 'server.schema.json')?.latest === '2026-01-01');
+
+    expect(store.versions).toEqual(['2026-01-01', '2025-12-11']);
+  });
+});
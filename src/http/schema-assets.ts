@@ -0,0 +1,235 @@
+/**
+ * Schema files served from memory
+ *
+ * Every file under the schemas directory is read once and hashed, and
+ * its compressed variants are built in the background (identity is
+ * served until they are ready), so a schema request is a map lookup and
+ * a write without delaying startup. Content is never parsed:
+ * the bytes on disk are the bytes served. The `/schemas` listing is
+ * derived from the same files and pre-serialized along with them.
+ *
+ * When watching, any change under the directory reloads the store after
+ * a short quiet period; files whose content is unchanged keep their
+ * compressed variants.
+ */
+
+import { createHash } from 'crypto';
+import { watch, type FSWatcher } from 'fs';
+import { readdir, readFile } from 'fs/promises';
+import { join } from 'path';
+import type { SchemaListEntry } from '../types/api.js';
+import { EncodedBody } from './compression.js';
+import { computeEtag } from './etag.js';
+
+export interface SchemaAsset {
+  /** Schema version directory, e.g. 2025-12-11 */
+  readonly version: string;
+  readonly filename: string;
+  /** File bytes and their compressed variants */
+  readonly body: EncodedBody;
+  /** Hex SHA-256 of the file bytes */
+  readonly sha256: string;
+  /** Strong ETag derived from the content hash */
+  readonly etag: string;
+}
+
+export interface SchemaIndex {
+  readonly entries: readonly SchemaListEntry[];
+  /** Serialized entries and their compressed variants */
+  readonly body: EncodedBody;
+  readonly etag: string;
+}
+
+// Only files named like this are listed (all JSON files are served)
+const SCHEMA_SUFFIX = '.schema.json';
+
+const DEFAULT_DEBOUNCE = 100;
+
+/**
+ * Whether a path segment names an entry directly inside its parent
+ */
+function isPlainSegment(segment: string): boolean {
+  return segment !== '' && !segment.includes('/') && !segment.includes('\\') && !segment.includes('..');
+}
+
+/**
+ * Group schema files by name across versions, newest version first
+ */
+function buildIndex(assets: Iterable<SchemaAsset>): SchemaIndex {
+  const byName = new Map<string, SchemaAsset[]>();
+  for (const asset of assets) {
+    if (!asset.filename.endsWith(SCHEMA_SUFFIX)) continue;
+    const versions = byName.get(asset.filename) ?? [];
+    versions.push(asset);
+    byName.set(asset.filename, versions);
+  }
+
+  const entries: SchemaListEntry[] = Array.from(byName, ([name, versions]) => {
+    versions.sort((a, b) => (a.version < b.version ? 1 : a.version > b.version ? -1 : 0));
+    return {
+      name,
+      versions: versions.map(asset => asset.version),
+      latest: versions[0].version,
+      urls: {
+        latest: `/schemas/latest/${name}`,
+        versioned: versions.map(asset => `/schemas/${asset.version}/${name}`)
+      },
+      files: versions.map(asset => ({ version: asset.version, size: asset.body.identity.length, sha256: asset.sha256 }))
+    };
+  });
+
+  return {
+    entries,
+    body: EncodedBody.fromJson(entries),
+    etag: computeEtag(...entries.flatMap(entry => entry.files.map(file => `${entry.name}@${file.version}:${file.sha256}`)))
+  };
+}
+
+export class SchemaAssetStore {
+  private assets = new Map<string, SchemaAsset>();
+  private schemaIndex: SchemaIndex = buildIndex([]);
+  private watcher: FSWatcher | null = null;
+  private debounce: NodeJS.Timeout | null = null;
+  private inflight: Promise<void> | null = null;
+
+  constructor(
+    private readonly schemasDir: string,
+    private readonly debounceMs = DEFAULT_DEBOUNCE
+  ) {}
+
+  /** Version directories, newest first */
+  get versions(): string[] {
+    return Array.from(new Set(Array.from(this.assets.values(), asset => asset.version))).sort().reverse();
+  }
+
+  /** Every loaded asset */
+  get all(): SchemaAsset[] {
+    return Array.from(this.assets.values());
+  }
+
+  /** The `/schemas` listing of the loaded files */
+  get index(): SchemaIndex {
+    return this.schemaIndex;
+  }
+
+  /**
+   * Read and hash every schema file, replacing what was loaded before,
+   * and start compressing the new ones. A missing schemas directory yields an empty store.
+   */
+  load(): Promise<void> {
+    // Concurrent callers share the running load
+    if (!this.inflight) {
+      this.inflight = this.read().finally(() => {
+        this.inflight = null;
+      });
+    }
+    return this.inflight;
+  }
+
+  /**
+   * A schema file by version and name; undefined for unknown files and
+   * for anything that is not a plain file name
+   */
+  get(version: string, filename: string): SchemaAsset | undefined {
+    if (!isPlainSegment(version) || !isPlainSegment(filename)) return undefined;
+    return this.assets.get(`${version}/${filename}`);
+  }
+
+  /**
+   * Reload whenever something under the schemas directory changes
+   */
+  watch(): void {
+    if (this.watcher) return;
+
+    try {
+      this.watcher = watch(this.schemasDir, { recursive: true, persistent: false }, () => this.scheduleReload());
+    } catch (error) {
+      console.error('Unable to watch schemas directory:', error);
+      return;
+    }
+    this.watcher.on('error', (error) => {
+      console.error('Schemas directory watcher failed:', error);
+      this.close();
+    });
+  }
+
+  /**
+   * Stop watching
+   */
+  close(): void {
+    if (this.debounce) {
+      clearTimeout(this.debounce);
+      this.debounce = null;
+    }
+    if (this.watcher) {
+      this.watcher.close();
+      this.watcher = null;
+    }
+  }
+
+  private scheduleReload(): void {
+    if (this.debounce) {
+      clearTimeout(this.debounce);
+    }
+    this.debounce = setTimeout(() => {
+      this.debounce = null;
+      // A load already running may have read the files before this change
+      if (this.inflight) {
+        this.scheduleReload();
+        return;
+      }
+      this.load().catch(error => {
+        console.error('Error reloading schemas:', error);
+      });
+    }, this.debounceMs);
+    this.debounce.unref();
+  }
+
+  private async read(): Promise<void> {
+    const assets = new Map<string, SchemaAsset>();
+
+    let versions: string[] = [];
+    try {
+      const entries = await readdir(this.schemasDir, { withFileTypes: true });
+      versions = entries.filter(entry => entry.isDirectory()).map(entry => entry.name).sort();
+    } catch (error) {
+      console.error('Error reading schemas directory:', error);
+    }
+
+    for (const version of versions) {
+      let files: string[];
+      try {
+        files = (await readdir(join(this.schemasDir, version))).filter(file => file.endsWith('.json')).sort();
+      } catch (error) {
+        console.error(`Error reading schema version ${version}:`, error);
+        continue;
+      }
+
+      for (const filename of files) {
+        const key = `${version}/${filename}`;
+        try {
+          const content = await readFile(join(this.schemasDir, version, filename));
+          const sha256 = createHash('sha256').update(content).digest('hex');
+
+          // Unchanged files keep their compressed variants
+          const previous = this.assets.get(key);
+          if (previous?.sha256 === sha256) {
+            assets.set(key, previous);
+            continue;
+          }
+
+          const body = new EncodedBody(content);
+          void body.prepareAll();
+          assets.set(key, Object.freeze({ version, filename, body, sha256, etag: `"${sha256}"` }));
+        } catch (error) {
+          console.error(`Error loading schema ${key}:`, error);
+        }
+      }
+    }
+
+    const index = buildIndex(assets.values());
+    void index.body.prepareAll();
+    this.assets = assets;
+    this.schemaIndex = index;
+  }
+}
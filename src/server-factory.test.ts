@@ -1,7 +1,9 @@
 import { describe, it, expect, beforeAll, afterAll } from 'vitest';
 import { FastifyInstance } from 'fastify';
 import { createServer } from './server-factory.js';
-import { statSync, existsSync } from 'fs';
+import { createHash } from 'crypto';
+import { readFileSync, statSync, existsSync } from 'fs';
+import { brotliDecompressSync, gunzipSync } from 'zlib';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
 import { createRequire } from 'module';
@@ -78,6 +80,72 @@ describe('Server Factory - API Endpoints', () => {
       expect(json.metadata).toHaveProperty('count');
     });
 
+    it('should walk the whole catalog with next_cursor', async () => {
+      const all = (await server.inject({ method: 'GET', url: '/v0.1/servers' })).json();
+      const names: string[] = [];
+      let cursor: string | undefined;
+
+      do {
+        const query = cursor ? `limit=5&cursor=${encodeURIComponent(cursor)}` : 'limit=5';
+        const page = (await server.inject({ method: 'GET', url: `/v0.1/servers?${query}` })).json();
+        names.push(...page.servers.map((s: any) => s.name));
+        cursor = page.metadata.next_cursor;
+      } while (cursor);
+
+      expect(names).toEqual(all.servers.map((s: any) => s.name));
+    });
+
+    it('should reject a malformed cursor', async () => {
+      const response = await server.inject({
+        method: 'GET',
+        url: '/v0.1/servers?cursor=garbage'
+      });
+
+      expect(response.statusCode).toBe(400);
+      expect(response.json()).toHaveProperty('error', 'Invalid cursor');
+    });
+
+    it('should reject a cursor issued for another sort order', async () => {
+      const first = (await server.inject({ method: 'GET', url: '/v0.1/servers?limit=1' })).json();
+      const response = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers?search=mcp&sort=relevance&cursor=${encodeURIComponent(first.metadata.next_cursor)}`
+      });
+
+      expect(response.statusCode).toBe(400);
+      expect(response.json().error).toMatch(/sort order/);
+    });
+
+    it('should return only the requested fields', async () => {
+      const full = await server.inject({ method: 'GET', url: '/v0.1/servers' });
+      const sparse = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers?fields=${encodeURIComponent('title,_meta.ai.nimbletools.mcp/v1.display.category')}`
+      });
+
+      expect(sparse.statusCode).toBe(200);
+      expect(sparse.headers.etag).not.toBe(full.headers.etag);
+      for (const entry of sparse.json().servers) {
+        expect(Object.keys(entry).filter(key => !['name', 'version', 'title', '_meta'].includes(key))).toEqual([]);
+      }
+      expect(sparse.rawPayload.length * 5).toBeLessThan(full.rawPayload.length);
+    });
+
+    it('should filter by facets and report facet counts', async () => {
+      const response = await server.inject({
+        method: 'GET',
+        url: '/v0.1/servers?category=developer-tools&capability=tools&facets=true&limit=500'
+      });
+
+      expect(response.statusCode).toBe(200);
+      const json = response.json();
+      expect(json.servers.length).toBeGreaterThan(0);
+      for (const entry of json.servers) {
+        expect(entry._meta['ai.nimbletools.mcp/v1'].display.category).toBe('developer-tools');
+      }
+      expect(json.metadata.facets.category).toEqual({ 'developer-tools': json.servers.length });
+    });
+
     it('should support search parameter', async () => {
       const response = await server.inject({
         method: 'GET',
@@ -109,6 +177,15 @@ describe('Server Factory - API Endpoints', () => {
       expect(Array.isArray(json.servers)).toBe(true);
     });
 
+    it('should serve repeated queries with identical bodies', async () => {
+      const first = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=3' });
+      const second = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=3' });
+
+      expect(second.statusCode).toBe(200);
+      expect(second.headers['content-type']).toContain('application/json');
+      expect(second.body).toBe(first.body);
+    });
+
     it('should support updated_since parameter', async () => {
       const response = await server.inject({
         method: 'GET',
@@ -148,6 +225,21 @@ describe('Server Factory - API Endpoints', () => {
       }
     });
 
+    it('should serialize every field of the server definition', async () => {
+      const definition = JSON.parse(readFileSync(join(__dirname, '..', 'servers', 'echo', 'server.json'), 'utf-8'));
+
+      const response = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers/${encodeURIComponent(definition.name)}/versions/latest`
+      });
+
+      const { _meta, ...json } = response.json();
+      const { _meta: definitionMeta, ...fields } = definition;
+      expect(json).toEqual(fields);
+      expect(_meta['ai.nimbletools.mcp/v1']).toEqual(definitionMeta['ai.nimbletools.mcp/v1']);
+      expect(_meta['io.modelcontextprotocol.registry/official']).toHaveProperty('isLatest', true);
+    });
+
     it('should support "latest" as version', async () => {
       // First get the list to find a valid server
       const listResponse = await server.inject({
@@ -171,6 +263,23 @@ describe('Server Factory - API Endpoints', () => {
       }
     });
 
+    it('should resolve a semver range to the newest matching version', async () => {
+      const latest = (await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions/latest`
+      })).json();
+
+      const response = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions/${encodeURIComponent('>=0.0.0')}`
+      });
+
+      expect(response.statusCode).toBe(200);
+      expect(response.json()).toHaveProperty('version', latest.version);
+      expect(response.headers['content-location'])
+        .toBe(`/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions/${latest.version}`);
+    });
+
     it('should return 404 for non-existent server', async () => {
       const response = await server.inject({
         method: 'GET',
@@ -206,6 +315,179 @@ describe('Server Factory - API Endpoints', () => {
     });
   });
 
+  describe('Platform selection', () => {
+    const clickhouse = `/v0.1/servers/${encodeURIComponent('ai.nimbletools/clickhouse')}/versions/latest`;
+
+    it('should return only the package for the requested platform', async () => {
+      const full = (await server.inject({ method: 'GET', url: clickhouse })).json();
+      const arm = (await server.inject({ method: 'GET', url: `${clickhouse}?platform=linux-arm64` })).json();
+
+      expect(full.packages).toHaveLength(2);
+      expect(arm.packages).toHaveLength(1);
+      expect(arm.packages[0].identifier).toMatch(/-linux-arm64\.mcpb$/);
+    });
+
+    it('should apply to the list and batch routes', async () => {
+      const list = (await server.inject({ method: 'GET', url: '/v0.1/servers?platform=linux-amd64&limit=500' })).json();
+      for (const entry of list.servers) {
+        for (const pkg of entry.packages ?? []) {
+          expect(pkg.identifier).not.toMatch(/-(linux-arm64|darwin-arm64)\.mcpb$/);
+        }
+      }
+
+      const batch = (await server.inject({
+        method: 'POST',
+        url: '/v0.1/servers/batch',
+        payload: { servers: [{ name: 'ai.nimbletools/clickhouse' }], platform: 'linux-amd64' }
+      })).json();
+      expect(batch.servers[0].packages).toHaveLength(1);
+    });
+
+    it('should reject a malformed platform', async () => {
+      const response = await server.inject({ method: 'GET', url: `${clickhouse}?platform=linux` });
+
+      expect(response.statusCode).toBe(400);
+    });
+  });
+
+  describe('Sparse fieldsets on a single server', () => {
+    it('should reduce the server to the requested fields', async () => {
+      const response = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions/latest?fields=description`
+      });
+
+      expect(response.statusCode).toBe(200);
+      expect(Object.keys(response.json()).sort()).toEqual(['description', 'name', 'version']);
+    });
+  });
+
+  describe('GET /v0.1/servers/:name/versions', () => {
+    it('should list every version of a server, latest first', async () => {
+      const response = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions`
+      });
+
+      expect(response.statusCode).toBe(200);
+      const json = response.json();
+      expect(json.metadata.count).toBe(json.servers.length);
+      expect(json.servers[0]._meta['io.modelcontextprotocol.registry/official'].isLatest).toBe(true);
+      for (const version of json.servers.slice(1)) {
+        expect(version._meta['io.modelcontextprotocol.registry/official'].isLatest).toBe(false);
+      }
+    });
+
+    it('should return 404 for non-existent server', async () => {
+      const response = await server.inject({
+        method: 'GET',
+        url: '/v0.1/servers/non-existent-server-xyz/versions'
+      });
+
+      expect(response.statusCode).toBe(404);
+      expect(response.json()).toHaveProperty('error');
+    });
+  });
+
+  describe('POST /v0.1/servers/batch', () => {
+    it('should resolve every reference in request order and list the missing ones', async () => {
+      const response = await server.inject({
+        method: 'POST',
+        url: '/v0.1/servers/batch',
+        payload: {
+          servers: [
+            { name: 'ai.nimbletools/echo' },
+            { name: 'ai.nimbletools/non-existent-server-xyz' },
+            { name: 'ai.nimbletools/clickhouse', version: '^0.1' },
+            { name: 'ai.nimbletools/echo', version: '0.0.0-nope' }
+          ]
+        }
+      });
+
+      expect(response.statusCode).toBe(200);
+      const json = response.json();
+      expect(json.servers.map((s: any) => s.name)).toEqual(['ai.nimbletools/echo', 'ai.nimbletools/clickhouse']);
+      expect(json.servers[1].version).toMatch(/^0\.1\./);
+      expect(json.missing).toEqual([
+        { name: 'ai.nimbletools/non-existent-server-xyz', version: 'latest' },
+        { name: 'ai.nimbletools/echo', version: '0.0.0-nope' }
+      ]);
+      expect(json.metadata.count).toBe(2);
+    });
+
+    it('should return the same definitions as the single-server route', async () => {
+      const single = await server.inject({
+        method: 'GET',
+        url: `/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions/latest`
+      });
+      const batch = await server.inject({
+        method: 'POST',
+        url: '/v0.1/servers/batch',
+        payload: { servers: [{ name: 'ai.nimbletools/echo' }] }
+      });
+
+      expect(batch.json().servers[0]).toEqual(single.json());
+    });
+
+    it('should send an ETag that follows the resolved servers', async () => {
+      const request = (servers: Array<{ name: string }>) =>
+        server.inject({ method: 'POST', url: '/v0.1/servers/batch', payload: { servers } });
+      const first = await request([{ name: 'ai.nimbletools/echo' }]);
+      const again = await request([{ name: 'ai.nimbletools/echo' }]);
+      const other = await request([{ name: 'ai.nimbletools/echo' }, { name: 'ai.nimbletools/non-existent-server-xyz' }]);
+
+      expect(first.headers.etag).toMatch(/^"[^"]+"$/);
+      expect(again.headers.etag).toBe(first.headers.etag);
+      expect(other.headers.etag).not.toBe(first.headers.etag);
+    });
+
+    it('should reject empty and oversized batches', async () => {
+      const empty = await server.inject({ method: 'POST', url: '/v0.1/servers/batch', payload: { servers: [] } });
+      const oversized = await server.inject({
+        method: 'POST',
+        url: '/v0.1/servers/batch',
+        payload: { servers: Array.from({ length: 101 }, (_, i) => ({ name: `server-${i}` })) }
+      });
+
+      expect(empty.statusCode).toBe(400);
+      expect(oversized.statusCode).toBe(400);
+    });
+  });
+
+  describe('GET /v0.1/changes', () => {
+    it('should replay the initial catalog as added entries, page by page', async () => {
+      const list = (await server.inject({ method: 'GET', url: '/v0.1/servers?limit=100' })).json();
+      const first = (await server.inject({ method: 'GET', url: '/v0.1/changes?limit=2' })).json();
+
+      expect(first.changes.map((change: any) => change.sequence)).toEqual([1, 2]);
+      expect(first.changes[0].type).toBe('added');
+      expect(first.changes[0].server.name).toBe(first.changes[0].name);
+      expect(first.metadata.next_since).toBe(2);
+      expect(first.metadata.has_more).toBe(list.servers.length > 2);
+
+      const next = (await server.inject({
+        method: 'GET',
+        url: `/v0.1/changes?since=${first.metadata.next_since}&epoch=${first.metadata.epoch}`
+      })).json();
+      expect(next.changes[0].sequence).toBe(3);
+      expect(next.metadata.reset).toBeUndefined();
+    });
+
+    it('should ask for a resync when the epoch does not match', async () => {
+      const response = await server.inject({ method: 'GET', url: '/v0.1/changes?since=1&epoch=stale' });
+
+      expect(response.statusCode).toBe(200);
+      expect(response.json().metadata.reset).toBe(true);
+      expect(response.json().changes).toEqual([]);
+    });
+
+    it('should reject a non-numeric since', async () => {
+      const response = await server.inject({ method: 'GET', url: '/v0.1/changes?since=abc' });
+
+      expect(response.statusCode).toBe(400);
+    });
+  });
+
   describe('GET /v0.1/servers/:server_id (legacy)', () => {
     it('should return a specific server by ID for backwards compatibility', async () => {
       // First get the list to find a valid server ID
@@ -255,6 +537,29 @@ describe('Server Factory - API Endpoints', () => {
       const json = response.json();
       expect(Array.isArray(json)).toBe(true);
     });
+
+    it('should list each file with its size and hash', async () => {
+      const response = await server.inject({ method: 'GET', url: '/schemas' });
+      const entry = response.json().find((e: { name: string }) => e.name === 'nimbletools-server.schema.json');
+      const file = readFileSync(join(__dirname, '..', 'schemas', '2025-12-11', 'nimbletools-server.schema.json'));
+
+      expect(entry.files).toContainEqual({
+        version: '2025-12-11',
+        size: file.length,
+        sha256: createHash('sha256').update(file).digest('hex')
+      });
+    });
+
+    it('should return 304 when the listing is unchanged', async () => {
+      const first = await server.inject({ method: 'GET', url: '/schemas' });
+      const second = await server.inject({
+        method: 'GET',
+        url: '/schemas',
+        headers: { 'if-none-match': first.headers.etag as string }
+      });
+
+      expect(second.statusCode).toBe(304);
+    });
   });
 
   describe('GET /schemas/:version/:filename', () => {
@@ -269,6 +574,18 @@ describe('Server Factory - API Endpoints', () => {
       expect(json).toHaveProperty('$schema');
     });
 
+    it('should serve the file bytes as immutable with a content-hash ETag', async () => {
+      const response = await server.inject({
+        method: 'GET',
+        url: '/schemas/2025-12-11/nimbletools-server.schema.json'
+      });
+      const file = readFileSync(join(__dirname, '..', 'schemas', '2025-12-11', 'nimbletools-server.schema.json'));
+
+      expect(response.rawPayload.equals(file)).toBe(true);
+      expect(response.headers['cache-control']).toBe('public, max-age=31536000, immutable');
+      expect(response.headers.etag).toBe(`"${createHash('sha256').update(file).digest('hex')}"`);
+    });
+
     it('should return the bundled schema with no external refs', async () => {
       const response = await server.inject({
         method: 'GET',
@@ -317,6 +634,8 @@ describe('Server Factory - API Endpoints', () => {
       expect(response.statusCode).toBe(200);
       const json = response.json();
       expect(json).toHaveProperty('$schema');
+      // The alias moves when a new schema version is published
+      expect(response.headers['cache-control']).not.toContain('immutable');
     });
 
     it('should reject paths with directory traversal', async () => {
@@ -331,6 +650,145 @@ describe('Server Factory - API Endpoints', () => {
     });
   });
 
+  describe('Conditional requests', () => {
+    it('should return an ETag and answer 304 for a matching If-None-Match on the list', async () => {
+      const first = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=5' });
+      const etag = first.headers.etag as string;
+
+      expect(etag).toMatch(/^"[^"]+"$/);
+
+      const second = await server.inject({
+        method: 'GET',
+        url: '/v0.1/servers?limit=5',
+        headers: { 'if-none-match': etag }
+      });
+
+      expect(second.statusCode).toBe(304);
+      expect(second.body).toBe('');
+      expect(second.headers.etag).toBe(etag);
+    });
+
+    it('should use a different ETag for different query parameters', async () => {
+      const a = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=5' });
+      const b = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=6' });
+
+      expect(a.headers.etag).not.toBe(b.headers.etag);
+    });
+
+    it('should answer 304 for an unchanged server', async () => {
+      const url = `/v0.1/servers/${encodeURIComponent('ai.nimbletools/echo')}/versions/latest`;
+      const first = await server.inject({ method: 'GET', url });
+
+      const second = await server.inject({
+        method: 'GET',
+        url,
+        headers: { 'if-none-match': `W/${first.headers.etag}, "other"` }
+      });
+
+      expect(second.statusCode).toBe(304);
+      expect(second.headers.vary).toBe('Accept-Encoding');
+    });
+
+    it('should answer 304 for an unchanged schema', async () => {
+      const url = '/schemas/2025-12-11/nimbletools-server.schema.json';
+      const first = await server.inject({ method: 'GET', url });
+
+      const second = await server.inject({
+        method: 'GET',
+        url,
+        headers: { 'if-none-match': first.headers.etag }
+      });
+
+      expect(second.statusCode).toBe(304);
+      expect(second.headers.vary).toBe('Accept-Encoding');
+    });
+  });
+
+  describe('Compression', () => {
+    // Variants are built in the background; identity is served until ready
+    async function injectUntilEncoded(url: string, acceptEncoding: string) {
+      for (let attempt = 0; attempt < 50; attempt++) {
+        const response = await server.inject({ method: 'GET', url, headers: { 'accept-encoding': acceptEncoding } });
+        if (response.headers['content-encoding']) return response;
+        await new Promise(resolve => setTimeout(resolve, 20));
+      }
+      throw new Error(`No encoded response for ${url}`);
+    }
+
+    it('should serve a gzip variant of the server list', async () => {
+      const identity = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=50' });
+      const response = await injectUntilEncoded('/v0.1/servers?limit=50', 'gzip');
+
+      expect(response.headers['content-encoding']).toBe('gzip');
+      expect(response.headers.vary).toContain('Accept-Encoding');
+      expect(response.headers.etag).toBe((identity.headers.etag as string).replace(/"$/, '-gzip"'));
+      expect(gunzipSync(response.rawPayload).toString()).toBe(identity.body);
+    });
+
+    it('should answer 304 for the ETag of a compressed variant', async () => {
+      const url = '/v0.1/servers?limit=50';
+      const encoded = await injectUntilEncoded(url, 'gzip');
+
+      const response = await server.inject({
+        method: 'GET',
+        url,
+        headers: { 'accept-encoding': 'gzip', 'if-none-match': encoded.headers.etag as string }
+      });
+
+      expect(response.statusCode).toBe(304);
+      expect(response.headers.etag).toBe(encoded.headers.etag);
+      expect(response.headers.vary).toBe(encoded.headers.vary);
+    });
+
+    it('should prefer brotli and serve it for the bundled schema', async () => {
+      const url = '/schemas/2025-12-11/nimbletools-server.bundled.schema.json';
+      const identity = await server.inject({ method: 'GET', url });
+      const response = await injectUntilEncoded(url, 'gzip, deflate, br');
+
+      expect(response.headers['content-encoding']).toBe('br');
+      expect(brotliDecompressSync(response.rawPayload).toString()).toBe(identity.body);
+    });
+
+    it('should not compress when the client does not ask for it', async () => {
+      await injectUntilEncoded('/v0.1/servers?limit=50', 'gzip');
+      const response = await server.inject({ method: 'GET', url: '/v0.1/servers?limit=50' });
+
+      expect(response.headers['content-encoding']).toBeUndefined();
+      expect(response.json()).toHaveProperty('servers');
+    });
+  });
+
+  describe('GET /metrics', () => {
+    it('should expose request, cache and catalog metrics in Prometheus format', async () => {
+      await server.inject({ method: 'GET', url: '/v0.1/servers' });
+      await server.inject({ method: 'GET', url: '/v0.1/servers' });
+      await server.inject({ method: 'GET', url: '/v0.1/changes' });
+
+      const response = await server.inject({ method: 'GET', url: '/metrics' });
+
+      expect(response.statusCode).toBe(200);
+      expect(response.headers['content-type']).toContain('text/plain; version=0.0.4');
+      expect(response.body).toMatch(/^registry_http_requests_total\{route="\/v0.1\/servers",method="GET",status="200"\} \d+$/m);
+      expect(response.body).toContain('# TYPE registry_http_request_duration_seconds histogram');
+      expect(response.body).toMatch(/^registry_http_response_size_bytes_count\{route="\/v0.1\/servers",method="GET"\} \d+$/m);
+      expect(response.body).toMatch(/^registry_response_cache_hits_total\{cache="list"\} [1-9]\d*$/m);
+      expect(response.body).toMatch(/^registry_response_cache_entries\{cache="changes"\} [1-9]\d*$/m);
+      expect(response.body).toMatch(/^registry_catalog_servers [1-9]\d*$/m);
+      expect(response.body).toMatch(/^registry_catalog_reloads_total [1-9]\d*$/m);
+      expect(response.body).toMatch(/^nodejs_eventloop_lag_seconds\{quantile="0.99"\} /m);
+      expect(response.body).toMatch(/^nodejs_heap_used_bytes \d+$/m);
+    });
+
+    it('should label unknown routes without their URL', async () => {
+      await server.inject({ method: 'GET', url: '/no-such-route-123' });
+
+      const response = await server.inject({ method: 'GET', url: '/metrics' });
+
+      expect(response.body).toContain('route="unmatched",method="GET",status="404"');
+      expect(response.body).not.toContain('no-such-route-123');
+    });
+  });
+
   describe('GET /v0.1/health', () => {
     it('should return health status', async () => {
       const response = await server.inject({
@@ -343,6 +801,8 @@ describe('Server Factory - API Endpoints', () => {
       expect(json).toHaveProperty('status');
       expect(json).toHaveProperty('servers_loaded');
       expect(json).toHaveProperty('cache_age_ms');
+      expect(json).toHaveProperty('snapshot_id');
+      expect(json).toHaveProperty('reloads_coalesced');
     });
 
     it('should report healthy status when servers are loaded', async () => {
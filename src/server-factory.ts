@@ -6,21 +6,43 @@
 import cors from '@fastify/cors';
 import swagger from '@fastify/swagger';
 import swaggerUi from '@fastify/swagger-ui';
-import Fastify, { FastifyInstance } from 'fastify';
-import { readdir, readFile } from 'fs/promises';
+import Fastify, { FastifyInstance, FastifyReply, FastifyRequest } from 'fastify';
 import { dirname, join } from 'path';
 import { fileURLToPath } from 'url';
-import { v4 as uuidv4 } from 'uuid';
 import { createRequire } from 'module';
+import { versionFingerprint } from './catalog/changes.js';
+import { normalizePlatform } from './catalog/platforms.js';
+import { parseFields, projector } from './catalog/projection.js';
+import { cursorProblem, decodeCursor, listQueryKey, listServers, resolveVersion, type ListServersQuery } from './catalog/query.js';
+import { CatalogStore, type CatalogHandoff } from './catalog/store.js';
+import { EncodedBody, sendEncoded } from './http/compression.js';
+import { computeEtag, isNotModified } from './http/etag.js';
+import { EventStream } from './http/events.js';
+import { instrumentProcess, instrumentRequests, METRICS_CONTENT_TYPE, metricsEnabled, MetricsRegistry, scrapeAuthorized } from './http/metrics.js';
+import { SchemaAssetStore, type SchemaAsset } from './http/schema-assets.js';
+import { ResponseCache } from './http/response-cache.js';
+import {
+  batchGetResponseSchema,
+  changesResponseSchema,
+  errorResponseSchema,
+  healthResponseSchema,
+  rootResponseSchema,
+  schemaListResponseSchema,
+  serverDetailSchema,
+  serverListResponseSchema,
+  versionListResponseSchema,
+  type JsonSchema
+} from './http/response-schemas.js';
 
 const require = createRequire(import.meta.url);
 const pkg = require('../package.json');
 const REGISTRY_VERSION = `v${pkg.version}`;
 import type {
-  ErrorResponse,
+  BatchGetRequest,
+  ChangesResponse,
+  HealthResponse,
   MCPServerDetail,
-  RegistryMetadata,
-  ServerListResponse
+  VersionListResponse
 } from './types/api.js';
 
 const __filename = fileURLToPath(import.meta.url);
@@ -28,87 +50,261 @@ const __dirname = dirname(__filename);
 
 // Constants
 const SERVERS_DIR = join(__dirname, '..', 'servers');
+// Serve other definitions, e.g. a generated catalog (scripts/generate-catalog.ts)
+const SERVERS_DIR_OVERRIDE = process.env.SERVERS_DIR || undefined;
+// Written next to the compiled server by `npm run compile-catalog`
+const CATALOG_FILE = process.env.CATALOG_FILE || join(__dirname, 'catalog.json');
 const SCHEMAS_DIR = join(__dirname, '..', 'schemas');
 const LATEST_SCHEMA_VERSION = '2025-12-11';
-
-// Server cache
-let serversCache: Map<string, MCPServerDetail> = new Map();
-let lastCacheUpdate = 0;
-const CACHE_TTL = 60000; // 1 minute cache
+const BUNDLED_SCHEMA_FILE = 'nimbletools-server.bundled.schema.json';
+// Dated schema versions never change once published
+const VERSIONED_SCHEMA_CACHE_CONTROL = 'public, max-age=31536000, immutable';
+const LATEST_SCHEMA_CACHE_CONTROL = 'public, max-age=300';
+// Reload schema files when they change on disk
+const SCHEMAS_WATCH = process.env.SCHEMAS_WATCH !== 'false';
+
+// Catalog change detection: watch servers/ by default, poll as a fallback
+const CATALOG_WATCH = process.env.CATALOG_WATCH !== 'false';
+const CATALOG_REFRESH_INTERVAL = parseInt(process.env.CATALOG_REFRESH_INTERVAL_MS || '60000', 10);
+
+// Number of distinct list queries kept pre-serialized per catalog snapshot
+const LIST_CACHE_SIZE = parseInt(process.env.LIST_CACHE_SIZE || '256', 10);
+// Change log entries retained for /v0.1/changes
+const CHANGE_LOG_SIZE = parseInt(process.env.CHANGE_LOG_SIZE || '10000', 10);
+const DEFAULT_CHANGES_LIMIT = 100;
+const MAX_CHANGES_LIMIT = 500;
+// Distinct change feed pages kept pre-serialized per catalog snapshot
+const CHANGES_CACHE_SIZE = 64;
+
+// Live change notifications (/v0.1/events)
+const EVENTS_HEARTBEAT_INTERVAL = parseInt(process.env.EVENTS_HEARTBEAT_INTERVAL_MS || '15000', 10);
+const EVENTS_MAX_SUBSCRIBERS = parseInt(process.env.EVENTS_MAX_SUBSCRIBERS || '10000', 10);
+
+// Prometheus metrics at /metrics: off in production unless enabled or
+// protected by a bearer token
+const METRICS_ENABLED = metricsEnabled(process.env);
+const METRICS_TOKEN = process.env.METRICS_TOKEN || undefined;
+
+// Pre-serialized server detail bodies kept per catalog snapshot
+const DETAIL_CACHE_SIZE = 1024;
+// Distinct batch requests kept assembled per catalog snapshot
+const BATCH_CACHE_SIZE = 256;
+const MAX_BATCH_SIZE = 100;
 
 /**
- * Load all server definitions from JSON files
+ * A server's ETag follows its content-derived versionId and its latest
+ * flag, so it survives catalog changes that do not touch this server but
+ * not a newer version being published
  */
-async function loadServers(): Promise<Map<string, MCPServerDetail>> {
-  const now = Date.now();
-
-  // Return cached data if still valid
-  if (serversCache.size > 0 && (now - lastCacheUpdate) < CACHE_TTL) {
-    return serversCache;
-  }
-
-  const servers = new Map<string, MCPServerDetail>();
-
-  try {
-    const dirs = await readdir(SERVERS_DIR, { withFileTypes: true });
-
-    for (const dir of dirs) {
-      if (!dir.isDirectory()) continue;
-
-      const serverJsonPath = join(SERVERS_DIR, dir.name, 'server.json');
+function serverEtag(server: MCPServerDetail): string {
+  return computeEtag(server.name, server.version, versionFingerprint(server));
+}
 
-      try {
-        const content = await readFile(serverJsonPath, 'utf-8');
-        const serverData = JSON.parse(content) as MCPServerDetail;
+/**
+ * How server definitions are presented: narrowed to one platform's
+ * packages and/or reduced to a field set
+ */
+interface ServerView {
+  platform: string | null;
+  fields: string[] | null;
+}
 
-        // Use server name as the ID
-        const serverId = serverData.name;
+// Query parameters selecting a view, shared by the routes returning servers
+const VIEW_QUERY_PROPERTIES = {
+  platform: { type: 'string', pattern: '^[A-Za-z0-9]+-[A-Za-z0-9_]+$', description: 'Keep only the packages for this platform (e.g. linux-arm64) and platform-independent ones' },
+  fields: { type: 'string', maxLength: 2048, description: 'Comma-separated paths to include in each server, e.g. title,_meta.ai.nimbletools.mcp/v1.display (name and version are always included)' }
+};
 
-        // Add registry metadata if not present
-        if (!serverData._meta) {
-          serverData._meta = {
-            'ai.nimbletools.mcp/v1': {}
-          };
-        }
+const FULL_VIEW: ServerView = { platform: null, fields: null };
 
-        const registryMeta: RegistryMetadata = {
-          serverId,
-          versionId: uuidv4(),
-          publishedAt: new Date().toISOString(),
-          updatedAt: new Date().toISOString(),
-          isLatest: true
-        };
+function parseView(query: { platform?: string; fields?: string }): ServerView {
+  return { platform: normalizePlatform(query.platform), fields: parseFields(query.fields) };
+}
 
-        serverData._meta['io.modelcontextprotocol.registry/official'] = registryMeta;
+/**
+ * Cache key and ETag component of a view; empty for the full definition
+ */
+function viewKey(view: ServerView): string {
+  return view.platform || view.fields ? `platform=${view.platform ?? ''}&fields=${view.fields?.join(',') ?? ''}` : '';
+}
 
-        servers.set(serverId, serverData);
-      } catch (error) {
-        console.error(`Error loading ${serverJsonPath}:`, error);
-      }
+/**
+ * Response schema for a server definition, derived from the bundled
+ * server schema. Falls back to an open object so responses are never
+ * trimmed when the schema is unavailable.
+ */
+function loadServerDetailSchema(schemas: SchemaAssetStore): JsonSchema {
+  try {
+    const asset = schemas.get(LATEST_SCHEMA_VERSION, BUNDLED_SCHEMA_FILE);
+    if (!asset) {
+      throw new Error(`${LATEST_SCHEMA_VERSION}/${BUNDLED_SCHEMA_FILE} not found`);
     }
+    return serverDetailSchema(JSON.parse(asset.body.identity.toString('utf-8')));
   } catch (error) {
-    console.error('Error reading servers directory:', error);
+    console.error('Error loading bundled server schema for response serialization:', error);
+    return { type: 'object', additionalProperties: true };
   }
+}
 
-  // Update cache
-  serversCache = servers;
-  lastCacheUpdate = Date.now();
+export interface ServerOptions {
+  /** Override the directory server definitions are loaded from */
+  serversDir?: string;
+  /** Serve a catalog loaded by another process instead of loading one */
+  handoff?: CatalogHandoff;
+}
 
-  return servers;
+/**
+ * The catalog store for a server (or cluster primary), configured from the
+ * environment. An explicit servers directory (option or SERVERS_DIR)
+ * always wins over the precompiled artifact.
+ */
+export function createCatalogStore(options: ServerOptions = {}): CatalogStore {
+  const explicitDir = options.serversDir ?? SERVERS_DIR_OVERRIDE;
+  return new CatalogStore({
+    serversDir: explicitDir ?? SERVERS_DIR,
+    catalogFile: explicitDir ? undefined : CATALOG_FILE,
+    refreshIntervalMs: CATALOG_REFRESH_INTERVAL,
+    watch: CATALOG_WATCH,
+    changeLogSize: CHANGE_LOG_SIZE,
+    handoff: options.handoff
+  });
 }
 
 /**
  * Create and configure Fastify server instance
  */
-export async function createServer(): Promise<FastifyInstance> {
+export async function createServer(options: ServerOptions = {}): Promise<FastifyInstance> {
   const fastify = Fastify({
     logger: process.env.NODE_ENV !== 'test'  // Enable logging except in test environment
   });
 
+  // Build the catalog snapshot once at boot; routes read it without I/O
+  const catalog = createCatalogStore(options);
+  await catalog.load();
+  catalog.start();
+  fastify.addHook('onClose', async () => {
+    catalog.close();
+  });
+
+  const events = new EventStream(catalog.changes, {
+    heartbeatMs: EVENTS_HEARTBEAT_INTERVAL,
+    maxSubscribers: EVENTS_MAX_SUBSCRIBERS
+  });
+  // Open streams would otherwise keep the server from closing
+  fastify.addHook('preClose', async () => {
+    events.close();
+  });
+
+  // Schema files are served from memory, compressed ahead of time
+  const schemas = new SchemaAssetStore(SCHEMAS_DIR);
+  await schemas.load();
+  if (SCHEMAS_WATCH) {
+    schemas.watch();
+  }
+  fastify.addHook('onClose', async () => {
+    schemas.close();
+  });
+
+  const serverDetail = loadServerDetailSchema(schemas);
+  const listCache = new ResponseCache(LIST_CACHE_SIZE);
+  const detailCache = new ResponseCache(DETAIL_CACHE_SIZE);
+  const batchCache = new ResponseCache(BATCH_CACHE_SIZE);
+  const changesCache = new ResponseCache(CHANGES_CACHE_SIZE);
+
+  // Prometheus metrics, served at /metrics
+  const metrics = new MetricsRegistry();
+  if (METRICS_ENABLED) {
+    instrumentRequests(fastify, metrics);
+    const stopSampling = instrumentProcess(metrics);
+    fastify.addHook('onClose', async () => {
+      stopSampling();
+    });
+
+    const caches = { list: listCache, detail: detailCache, batch: batchCache, changes: changesCache };
+    const cacheHits = metrics.counter('registry_response_cache_hits_total', 'Responses served from a pre-serialized body, by cache');
+    const cacheMisses = metrics.counter('registry_response_cache_misses_total', 'Responses that had to be serialized, by cache');
+    const cacheEntries = metrics.gauge('registry_response_cache_entries', 'Pre-serialized bodies held, by cache');
+    const catalogServers = metrics.gauge('registry_catalog_servers', 'Servers in the current catalog snapshot');
+    const catalogAge = metrics.gauge('registry_catalog_age_seconds', 'Time since the current catalog snapshot was built');
+    const catalogReloads = metrics.counter('registry_catalog_reloads_total', 'Completed catalog rebuilds');
+    const catalogReloadTime = metrics.counter('registry_catalog_reload_seconds_total', 'Time spent rebuilding the catalog');
+    const catalogLastReload = metrics.gauge('registry_catalog_last_reload_seconds', 'Duration of the most recent catalog rebuild');
+    const catalogCoalesced = metrics.counter('registry_catalog_reloads_coalesced_total', 'Reload requests that joined a running reload');
+    const changeSequence = metrics.gauge('registry_change_sequence', 'Sequence number of the latest catalog change');
+    const eventSubscribers = metrics.gauge('registry_event_subscribers', 'Connected /v0.1/events subscribers');
+    const eventsDropped = metrics.counter('registry_event_subscribers_dropped_total', 'Event subscribers disconnected for not keeping up');
+
+    metrics.collect(() => {
+      for (const [cache, responseCache] of Object.entries(caches)) {
+        const stats = responseCache.stats;
+        cacheHits.set({ cache }, stats.hits);
+        cacheMisses.set({ cache }, stats.misses);
+        cacheEntries.set({ cache }, stats.entries);
+      }
+
+      const snapshot = catalog.snapshot;
+      const stats = catalog.stats;
+      catalogServers.set({}, snapshot.list.length);
+      catalogAge.set({}, (Date.now() - snapshot.builtAt) / 1000);
+      catalogReloads.set({}, stats.reloads);
+      catalogReloadTime.set({}, stats.reloadTimeMs / 1000);
+      catalogLastReload.set({}, stats.lastReloadMs / 1000);
+      catalogCoalesced.set({}, stats.coalescedReloads);
+      changeSequence.set({}, catalog.changes.sequence);
+      eventSubscribers.set({}, events.size);
+      eventsDropped.set({}, events.dropped);
+    });
+  }
+
+  /**
+   * A server definition as presented in a view
+   */
+  const applyView = (server: MCPServerDetail, view: ServerView) => {
+    const selected = view.platform ? catalog.snapshot.platforms.select(server, view.platform) : server;
+    return view.fields ? projector(view.fields)(selected) : selected;
+  };
+
+  const viewEtag = (server: MCPServerDetail, view: ServerView) => {
+    const key = viewKey(view);
+    return key ? computeEtag(serverEtag(server), key) : serverEtag(server);
+  };
+
+  /**
+   * A server definition's pre-serialized (and pre-compressed) body,
+   * serialized with the compiled server detail serializer
+   */
+  const serverBody = (reply: FastifyReply, server: MCPServerDetail, view: ServerView) =>
+    detailCache.getOrBuild(catalog.snapshot.id, `${server.name}@${server.version}?${viewKey(view)}`, () => ({
+      body: new EncodedBody(Buffer.from(reply.compileSerializationSchema(serverDetail)(applyView(server, view)))),
+      etag: viewEtag(server, view)
+    }));
+
+  /**
+   * Send a server definition from its pre-serialized body
+   */
+  const sendServer = (request: Pick<FastifyRequest, 'headers'>, reply: FastifyReply, server: MCPServerDetail, view: ServerView) => {
+    if (isNotModified(request, reply, viewEtag(server, view))) {
+      return reply.code(304).send();
+    }
+    return sendEncoded(request, reply, serverBody(reply, server, view).body);
+  };
+
+  /**
+   * Send a schema file from memory
+   */
+  const sendSchema = (request: Pick<FastifyRequest, 'headers'>, reply: FastifyReply, asset: SchemaAsset, cacheControl: string) => {
+    reply.header('cache-control', cacheControl);
+    if (isNotModified(request, reply, asset.etag)) {
+      return reply.code(304).send();
+    }
+    return sendEncoded(request, reply, asset.body, 'application/json');
+  };
+
   // Register CORS
   await fastify.register(cors, {
     origin: true,
-    credentials: true
+    credentials: true,
+    exposedHeaders: ['ETag', 'Content-Encoding', 'Content-Location']
   });
 
   // Register Swagger for API documentation
@@ -142,14 +338,23 @@ export async function createServer(): Promise<FastifyInstance> {
   }
 
   // Root endpoint
-  fastify.get('/', async () => {
+  fastify.get('/', {
+    schema: {
+      response: { 200: rootResponseSchema }
+    }
+  }, async () => {
     return {
       name: 'NimbleTools MCP Registry API',
       version: REGISTRY_VERSION,
       endpoints: {
         listServers: '/v0.1/servers',
         getServer: '/v0.1/servers/{name}/versions/{version}',
+        getServerVersions: '/v0.1/servers/{name}/versions',
+        batchGetServers: '/v0.1/servers/batch',
+        changes: '/v0.1/changes',
+        events: '/v0.1/events',
         health: '/v0.1/health',
+        ...(METRICS_ENABLED ? { metrics: '/metrics' } : {}),
         schemas: '/schemas',
         schemaByVersion: '/schemas/{version}/{filename}',
         latestSchema: '/schemas/latest/{filename}'
@@ -160,121 +365,226 @@ export async function createServer(): Promise<FastifyInstance> {
 
   // List servers endpoint
   fastify.get<{
-    Querystring: {
-      cursor?: string;
-      limit?: string;
-      search?: string;
-      version?: string;
-      updated_since?: string;
-    };
-    Reply: ServerListResponse | ErrorResponse;
+    Querystring: ListServersQuery;
   }>('/v0.1/servers', {
     schema: {
       querystring: {
         type: 'object',
         properties: {
-          cursor: { type: 'string', description: 'Pagination cursor' },
+          cursor: { type: 'string', description: 'Opaque pagination cursor from metadata.next_cursor' },
           limit: { type: 'string', description: 'Maximum number of results (default 100, max 500)' },
-          search: { type: 'string', description: 'Case-insensitive search on server name' },
+          search: { type: 'string', description: 'Full-text search on name, title, description, tags and environment variable names (every term must match, as a word or word prefix)' },
           version: { type: 'string', enum: ['latest'], description: 'Filter to latest versions only' },
-          updated_since: { type: 'string', description: 'RFC3339 timestamp to filter recently updated servers' }
+          updated_since: { type: 'string', description: 'RFC3339 timestamp to filter recently updated servers' },
+          sort: { type: 'string', enum: ['name', 'relevance'], description: 'Result order when searching (default name)' },
+          category: { type: 'string', description: 'Display category; comma-separated values match any' },
+          tag: { type: 'string', description: 'Display tag; comma-separated values match any' },
+          status: { type: 'string', description: 'Server status (active, beta, deprecated, archived); comma-separated values match any' },
+          registry_type: { type: 'string', description: 'Package registry type (e.g. mcpb, npm); comma-separated values match any' },
+          capability: { type: 'string', description: 'Declared capability (tools, resources, prompts); comma-separated values match any' },
+          facets: { type: 'string', enum: ['true', 'false'], description: 'Include per-value counts of each facet over the matching servers' },
+          ...VIEW_QUERY_PROPERTIES
         }
+      },
+      response: {
+        200: serverListResponseSchema(serverDetail),
+        400: errorResponseSchema
       }
     }
-  }, async (request) => {
-    const servers = await loadServers();
-    let serverList = Array.from(servers.values());
-
-    // Apply search filter (case-insensitive substring match on name)
-    if (request.query.search) {
-      const searchLower = request.query.search.toLowerCase();
-      serverList = serverList.filter(s =>
-        s.name.toLowerCase().includes(searchLower) ||
-        (s.title && s.title.toLowerCase().includes(searchLower)) ||
-        s.description.toLowerCase().includes(searchLower)
-      );
-    }
-
-    // Apply updated_since filter
-    if (request.query.updated_since) {
-      const sinceDate = new Date(request.query.updated_since);
-      if (!isNaN(sinceDate.getTime())) {
-        serverList = serverList.filter(s => {
-          const meta = s._meta?.['io.modelcontextprotocol.registry/official'];
-          if (meta?.updatedAt) {
-            return new Date(meta.updatedAt) >= sinceDate;
-          }
-          return true; // Include servers without update timestamp
-        });
-      }
+  }, async (request, reply) => {
+    const snapshot = catalog.snapshot;
+    const cursor = request.query.cursor ? decodeCursor(request.query.cursor) : null;
+    if (request.query.cursor && !cursor) {
+      reply.code(400);
+      return { error: 'Invalid cursor' };
+    }
+    const problem = cursor && cursorProblem(cursor, snapshot, request.query);
+    if (problem) {
+      reply.code(400);
+      return { error: problem };
     }
 
-    // Note: version=latest is a no-op for us since we only serve latest versions
+    const key = listQueryKey(request.query);
+    const etag = computeEtag(snapshot.id, key);
+
+    if (isNotModified(request, reply, etag)) {
+      return reply.code(304).send();
+    }
 
-    // Parse pagination parameters
-    const limit = Math.min(parseInt(request.query.limit || '100', 10), 500);
-    const startIdx = request.query.cursor ? parseInt(request.query.cursor, 10) : 0;
-    const endIdx = startIdx + limit;
+    // Serialize (and compress) each distinct query once per snapshot
+    const cached = listCache.getOrBuild(snapshot.id, key, () => ({
+      body: new EncodedBody(Buffer.from(reply.serialize(listServers(snapshot, request.query)))),
+      etag
+    }));
 
-    // Paginate results
-    const paginated = serverList.slice(startIdx, endIdx);
+    return sendEncoded(request, reply, cached.body);
+  });
 
-    const response: ServerListResponse = {
-      servers: paginated,
-      metadata: {
-        count: paginated.length
+  // List every version of a server, newest first
+  fastify.get<{
+    Params: { name: string };
+    Querystring: { platform?: string; fields?: string };
+  }>('/v0.1/servers/:name/versions', {
+    schema: {
+      params: {
+        type: 'object',
+        properties: {
+          name: { type: 'string', description: 'Server name (URL-encoded, e.g., ai.nimbletools%2Fecho)' }
+        },
+        required: ['name']
+      },
+      querystring: {
+        type: 'object',
+        properties: VIEW_QUERY_PROPERTIES
+      },
+      response: {
+        200: versionListResponseSchema(serverDetail),
+        404: errorResponseSchema
       }
-    };
+    }
+  }, async (request, reply) => {
+    const decodedName = decodeURIComponent(request.params.name);
+    const snapshot = catalog.snapshot;
+    const versions = snapshot.versions.get(decodedName);
 
-    // Add next cursor if there are more results
-    if (endIdx < serverList.length && response.metadata) {
-      response.metadata.next_cursor = String(endIdx);
+    if (!versions) {
+      reply.code(404);
+      return { error: `Server '${decodedName}' not found` };
     }
 
-    return response;
+    const view = parseView(request.query);
+    const etag = computeEtag(decodedName, viewKey(view), ...versions.list.map(serverEtag));
+    if (isNotModified(request, reply, etag)) {
+      return reply.code(304).send();
+    }
+
+    const cached = detailCache.getOrBuild(snapshot.id, `${decodedName}/versions?${viewKey(view)}`, () => {
+      const response: VersionListResponse = {
+        servers: versions.list.map(server => applyView(server, view)),
+        metadata: { count: versions.list.length }
+      };
+      return { body: new EncodedBody(Buffer.from(reply.serialize(response))), etag };
+    });
+    return sendEncoded(request, reply, cached.body);
   });
 
   // Get server by name and version endpoint (official spec format)
   fastify.get<{
     Params: { name: string; version: string };
-    Reply: MCPServerDetail | ErrorResponse;
+    Querystring: { platform?: string; fields?: string };
   }>('/v0.1/servers/:name/versions/:version', {
     schema: {
       params: {
         type: 'object',
         properties: {
           name: { type: 'string', description: 'Server name (URL-encoded, e.g., ai.nimbletools%2Fecho)' },
-          version: { type: 'string', description: 'Server version (e.g., 1.0.0) or "latest"' }
+          version: { type: 'string', description: 'Server version (e.g., 1.0.0), "latest", or a semver range resolved to the newest match (e.g., ^0.1, URL-encoded)' }
         },
         required: ['name', 'version']
+      },
+      querystring: {
+        type: 'object',
+        properties: VIEW_QUERY_PROPERTIES
+      },
+      response: {
+        200: serverDetail,
+        404: errorResponseSchema
       }
     }
   }, async (request, reply) => {
-    const servers = await loadServers();
-
     // Decode the server name
     const decodedName = decodeURIComponent(request.params.name);
-    const server = servers.get(decodedName);
+    const versions = catalog.snapshot.versions.get(decodedName);
 
-    if (!server) {
+    if (!versions) {
       reply.code(404);
       return { error: `Server '${decodedName}' not found` };
     }
 
-    // Check version (support "latest" as alias for current version)
+    // Exact version, "latest", or the newest version matching a semver range
     const requestedVersion = request.params.version;
-    if (requestedVersion !== 'latest' && server.version !== requestedVersion) {
+    const server = resolveVersion(versions, requestedVersion);
+    if (!server) {
       reply.code(404);
       return { error: `Version '${requestedVersion}' not found for server '${decodedName}'` };
     }
 
-    return server;
+    if (server.version !== requestedVersion) {
+      // Point at the exact version the alias or range resolved to
+      reply.header('content-location', `/v0.1/servers/${encodeURIComponent(server.name)}/versions/${encodeURIComponent(server.version)}`);
+    }
+    return sendServer(request, reply, server, parseView(request.query));
+  });
+
+  // Resolve many servers in one round trip
+  fastify.post<{
+    Body: BatchGetRequest;
+  }>('/v0.1/servers/batch', {
+    schema: {
+      description: `Get up to ${MAX_BATCH_SIZE} servers by name and version (exact, "latest" or a semver range) in one request`,
+      body: {
+        type: 'object',
+        properties: {
+          servers: {
+            type: 'array',
+            minItems: 1,
+            maxItems: MAX_BATCH_SIZE,
+            items: {
+              type: 'object',
+              properties: {
+                name: { type: 'string' },
+                version: { type: 'string', description: 'Defaults to "latest"' }
+              },
+              required: ['name']
+            }
+          },
+          ...VIEW_QUERY_PROPERTIES
+        },
+        required: ['servers']
+      },
+      response: {
+        200: batchGetResponseSchema(serverDetail),
+        400: errorResponseSchema
+      }
+    }
+  }, async (request, reply) => {
+    const references = request.body.servers.map(({ name, version }) => ({ name, version: version ?? 'latest' }));
+    const view = parseView(request.body);
+    const snapshot = catalog.snapshot;
+
+    const cached = batchCache.getOrBuild(snapshot.id, JSON.stringify([viewKey(view), references]), () => {
+      const parts: Buffer[] = [];
+      const etags: string[] = [];
+      const missing: BatchGetRequest['servers'] = [];
+      for (const reference of references) {
+        const versions = snapshot.versions.get(reference.name);
+        const server = versions && resolveVersion(versions, reference.version);
+        if (!server) {
+          missing.push(reference);
+          continue;
+        }
+        const detail = serverBody(reply, server, view);
+        parts.push(detail.body.identity);
+        etags.push(detail.etag);
+      }
+
+      // Splice the cached detail bodies together instead of serializing them again
+      const body = Buffer.concat([
+        Buffer.from('{"servers":['),
+        ...parts.flatMap((part, i) => (i === 0 ? [part] : [Buffer.from(','), part])),
+        Buffer.from(`],"missing":${JSON.stringify(missing)},"metadata":{"count":${parts.length}}}`)
+      ]);
+      return { body: new EncodedBody(body), etag: computeEtag(JSON.stringify(missing), ...etags) };
+    });
+    // A POST is not answered with 304, but the ETag tells a client whether
+    // the result changed since it last asked
+    reply.header('etag', cached.etag);
+    return sendEncoded(request, reply, cached.body);
   });
 
   // Legacy endpoint for backwards compatibility (deprecated)
   fastify.get<{
     Params: { server_id: string };
-    Reply: MCPServerDetail | ErrorResponse;
   }>('/v0.1/servers/:server_id', {
     schema: {
       params: {
@@ -283,73 +593,121 @@ export async function createServer(): Promise<FastifyInstance> {
           server_id: { type: 'string' }
         },
         required: ['server_id']
+      },
+      response: {
+        200: serverDetail,
+        404: errorResponseSchema
       }
     }
   }, async (request, reply) => {
-    const servers = await loadServers();
-
     // Decode the server ID (which is the server name)
     const decodedName = decodeURIComponent(request.params.server_id);
-    const server = servers.get(decodedName);
+    const server = catalog.snapshot.servers.get(decodedName);
 
     if (!server) {
       reply.code(404);
       return { error: `Server '${request.params.server_id}' not found` };
     }
 
-    return server;
+    return sendServer(request, reply, server, FULL_VIEW);
   });
 
-  // List schemas endpoint
-  fastify.get('/schemas', async () => {
-    try {
-      const versions = await readdir(SCHEMAS_DIR, { withFileTypes: true });
-      const schemaVersions = versions
-        .filter(d => d.isDirectory())
-        .map(d => d.name)
-        .sort()
-        .reverse();
-
-      // Get all unique schema filenames across all versions
-      const schemaFilesMap = new Map<string, Set<string>>();
-
-      for (const version of schemaVersions) {
-        const versionDir = join(SCHEMAS_DIR, version);
-        const files = await readdir(versionDir);
-        const schemaFiles = files.filter(f => f.endsWith('.schema.json'));
-
-        for (const file of schemaFiles) {
-          if (!schemaFilesMap.has(file)) {
-            schemaFilesMap.set(file, new Set());
-          }
-          schemaFilesMap.get(file)!.add(version);
+  // Incremental sync: server versions added, updated or removed after a sequence number
+  fastify.get<{
+    Querystring: { since?: string; limit?: string; epoch?: string };
+  }>('/v0.1/changes', {
+    schema: {
+      querystring: {
+        type: 'object',
+        properties: {
+          since: { type: 'string', pattern: '^\\d+$', description: 'Return changes after this sequence number (default 0: everything retained)' },
+          limit: { type: 'string', description: `Maximum number of changes (default ${DEFAULT_CHANGES_LIMIT}, max ${MAX_CHANGES_LIMIT})` },
+          epoch: { type: 'string', description: 'Epoch from the previous response; a mismatch means the log restarted' }
+        }
+      },
+      response: {
+        200: changesResponseSchema(serverDetail)
+      }
+    }
+  }, async (request, reply) => {
+    const { since, limit, epoch } = request.query;
+    const snapshot = catalog.snapshot;
+    const key = JSON.stringify([since ?? '0', limit ?? '', epoch ?? '']);
+    const etag = computeEtag(snapshot.id, catalog.changes.epoch, catalog.changes.sequence, key);
+
+    if (isNotModified(request, reply, etag)) {
+      return reply.code(304).send();
+    }
+
+    const cached = changesCache.getOrBuild(snapshot.id, key, () => {
+      const pageSize = Math.min(parseInt(limit || String(DEFAULT_CHANGES_LIMIT), 10) || DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT);
+      const page = catalog.changes.since(parseInt(since || '0', 10), pageSize, epoch);
+      const response: ChangesResponse = {
+        changes: page.changes,
+        metadata: {
+          count: page.changes.length,
+          next_since: page.nextSince,
+          epoch: catalog.changes.epoch,
+          has_more: page.hasMore
+        }
+      };
+      if (page.reset) {
+        response.metadata.reset = true;
+      }
+      return { body: new EncodedBody(Buffer.from(reply.serialize(response))), etag };
+    });
+    return sendEncoded(request, reply, cached.body);
+  });
+
+  // Live catalog change notifications as Server-Sent Events
+  fastify.get<{
+    Querystring: { last_event_id?: string };
+  }>('/v0.1/events', {
+    schema: {
+      description: 'Server-Sent Events stream with one event (added, updated or removed) per catalog change',
+      querystring: {
+        type: 'object',
+        properties: {
+          last_event_id: { type: 'string', description: 'Resume after this event id (the Last-Event-ID header takes precedence)' }
         }
+      },
+      response: {
+        503: errorResponseSchema
       }
+    }
+  }, async (request, reply) => {
+    if (events.full) {
+      return reply.code(503).header('retry-after', '5').send({ error: 'Too many event subscribers' });
+    }
 
-      // Build response array
-      const schemas = Array.from(schemaFilesMap.entries()).map(([filename, versions]) => {
-        const versionList = Array.from(versions).sort().reverse();
-        return {
-          name: filename,
-          versions: versionList,
-          latest: versionList[0],
-          urls: {
-            latest: `/schemas/latest/${filename}`,
-            versioned: versionList.map(v => `/schemas/${v}/${filename}`)
-          }
-        };
-      });
-
-      return schemas;
-    } catch (error) {
-      return [];
+    // The stream outlives the handler; write it directly, keeping headers set by hooks (CORS)
+    const header = request.headers['last-event-id'];
+    reply.hijack();
+    events.subscribe(reply.raw, typeof header === 'string' ? header : request.query.last_event_id, reply.getHeaders());
+    return reply;
+  });
+
+  // List schemas endpoint
+  fastify.get('/schemas', {
+    schema: {
+      response: { 200: schemaListResponseSchema }
     }
+  }, async (request, reply) => {
+    const { body, etag } = schemas.index;
+    if (isNotModified(request, reply, etag)) {
+      return reply.code(304).send();
+    }
+    return sendEncoded(request, reply, body);
   });
 
   // Get schema by version
   fastify.get<{
     Params: { version: string; filename: string };
-  }>('/schemas/:version/:filename', async (request, reply) => {
+  }>('/schemas/:version/:filename', {
+    schema: {
+      response: { 400: errorResponseSchema, 404: errorResponseSchema }
+    }
+  }, async (request, reply) => {
     const { version, filename } = request.params;
 
     // Validate version and filename to prevent directory traversal
@@ -358,21 +716,22 @@ export async function createServer(): Promise<FastifyInstance> {
       return { error: 'Invalid version or filename' };
     }
 
-    try {
-      const schemaPath = join(SCHEMAS_DIR, version, filename);
-      const content = await readFile(schemaPath, 'utf-8');
-      reply.type('application/json');
-      return JSON.parse(content);
-    } catch (error) {
+    const asset = schemas.get(version, filename);
+    if (!asset) {
       reply.code(404);
       return { error: 'Schema not found' };
     }
+    return sendSchema(request, reply, asset, VERSIONED_SCHEMA_CACHE_CONTROL);
   });
 
   // Get latest schema
   fastify.get<{
     Params: { filename: string };
-  }>('/schemas/latest/:filename', async (request, reply) => {
+  }>('/schemas/latest/:filename', {
+    schema: {
+      response: { 400: errorResponseSchema, 404: errorResponseSchema }
+    }
+  }, async (request, reply) => {
     const { filename } = request.params;
 
     // Validate filename
@@ -381,25 +740,43 @@ export async function createServer(): Promise<FastifyInstance> {
       return { error: 'Invalid filename' };
     }
 
-    try {
-      const schemaPath = join(SCHEMAS_DIR, LATEST_SCHEMA_VERSION, filename);
-      const content = await readFile(schemaPath, 'utf-8');
-      reply.type('application/json');
-      return JSON.parse(content);
-    } catch (error) {
+    const asset = schemas.get(LATEST_SCHEMA_VERSION, filename);
+    if (!asset) {
       reply.code(404);
       return { error: 'Schema not found' };
     }
+    return sendSchema(request, reply, asset, LATEST_SCHEMA_CACHE_CONTROL);
   });
 
+  // Prometheus metrics, kept out of the OpenAPI docs
+  if (METRICS_ENABLED) {
+    fastify.get('/metrics', {
+      schema: { hide: true }
+    }, async (request, reply) => {
+      if (!scrapeAuthorized(request.headers.authorization, METRICS_TOKEN)) {
+        reply.code(401).header('www-authenticate', 'Bearer');
+        return { error: 'Unauthorized' };
+      }
+      reply.type(METRICS_CONTENT_TYPE);
+      return metrics.render();
+    });
+  }
+
   // Health check endpoint (versioned path per official spec)
-  fastify.get('/v0.1/health', async () => {
-    const servers = await loadServers();
+  fastify.get('/v0.1/health', {
+    schema: {
+      response: { 200: healthResponseSchema }
+    }
+  }, async (): Promise<HealthResponse> => {
+    const snapshot = catalog.snapshot;
 
     return {
-      status: servers.size > 0 ? 'healthy' : 'unhealthy',
-      servers_loaded: servers.size,
-      cache_age_ms: Date.now() - lastCacheUpdate
+      status: snapshot.list.length > 0 ? 'healthy' : 'unhealthy',
+      servers_loaded: snapshot.list.length,
+      cache_age_ms: Date.now() - snapshot.builtAt,
+      snapshot_id: snapshot.id,
+      reloads_coalesced: catalog.stats.coalescedReloads,
+      event_subscribers: events.size
     };
   });
 
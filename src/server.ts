@@ -4,28 +4,50 @@
  */
 
 import 'dotenv/config';
+import cluster from 'cluster';
+import { exitOnShutdown, requestCatalog, startPrimary, workerCount } from './cluster.js';
 import { createServer } from './server-factory.js';
 
 const PORT = parseInt(process.env.PORT || '8080', 10);
 const HOST = process.env.HOST || '0.0.0.0';
+// Worker processes sharing the port; 1 serves from this process
+const WORKERS = workerCount(process.env.REGISTRY_WORKERS || process.env.WEB_CONCURRENCY);
 
-async function start() {
-  try {
-    const fastify = await createServer();
-
-    await fastify.listen({ port: PORT, host: HOST });
-
-    console.log(`
+function announce() {
+  console.log(`
 🚀 NimbleTools MCP Registry API is running!
 
    API:     http://${HOST === '0.0.0.0' ? 'localhost' : HOST}:${PORT}
    Docs:    http://${HOST === '0.0.0.0' ? 'localhost' : HOST}:${PORT}/docs
    Health:  http://${HOST === '0.0.0.0' ? 'localhost' : HOST}:${PORT}/v0.1/health
+   Workers: ${WORKERS}
     `);
+}
+
+async function start() {
+  try {
+    if (WORKERS > 1 && cluster.isPrimary) {
+      await startPrimary(WORKERS);
+      announce();
+      return;
+    }
+
+    // Workers serve the catalog loaded by the primary
+    const handoff = cluster.isWorker ? await requestCatalog() : undefined;
+    const fastify = await createServer({ handoff });
+    if (cluster.isWorker) {
+      exitOnShutdown(fastify);
+    }
+
+    await fastify.listen({ port: PORT, host: HOST });
+
+    if (!cluster.isWorker) {
+      announce();
+    }
   } catch (err) {
     console.error('Failed to start server:', err);
     process.exit(1);
   }
 }
 
-start();
\ No newline at end of file
+start();
@@ -19,6 +19,8 @@ export interface ServerListResponse {
   metadata?: {
     next_cursor?: string;
     count?: number;
+    /** Servers per value of each facet, over every page of the result */
+    facets?: Record<string, Record<string, number>>;
   };
 }
 
@@ -33,10 +35,82 @@ export interface VersionListResponse {
   };
 }
 
+export interface ChangeEntry {
+  sequence: number;
+  type: 'added' | 'updated' | 'removed';
+  name: string;
+  version: string;
+  versionId?: string;
+  /** The new definition; absent for removals */
+  server?: MCPServerDetail;
+}
+
+export interface ChangesResponse {
+  changes: ChangeEntry[];
+  metadata: {
+    count: number;
+    /** Pass as `since` on the next request */
+    next_since: number;
+    /** Identifies the change log; pass it back as `epoch` */
+    epoch: string;
+    has_more: boolean;
+    /** The log no longer covers `since`; re-list the catalog, then continue from next_since */
+    reset?: boolean;
+  };
+}
+
+export interface ServerReference {
+  name: string;
+  /** Exact version, "latest" (default) or a semver range */
+  version?: string;
+}
+
+export interface BatchGetRequest {
+  servers: ServerReference[];
+  /** Keep only the packages for this platform, e.g. linux-arm64 */
+  platform?: string;
+  /** Comma-separated paths to include in each server */
+  fields?: string;
+}
+
+export interface BatchGetResponse {
+  /** Resolved servers, in request order */
+  servers: MCPServerDetail[];
+  /** References that matched no server or version */
+  missing: ServerReference[];
+  metadata: {
+    count: number;
+  };
+}
+
 export interface HealthResponse {
   status: 'healthy' | 'unhealthy';
   servers_loaded: number;
   cache_age_ms?: number;
+  snapshot_id?: string;
+  reloads_coalesced?: number;
+  event_subscribers?: number;
+}
+
+export interface SchemaFile {
+  version: string;
+  /** Size in bytes, uncompressed */
+  size: number;
+  /** Hex SHA-256 of the file; also its ETag */
+  sha256: string;
+}
+
+export interface SchemaListEntry {
+  name: string;
+  /** Versions that contain this file, newest first */
+  versions: string[];
+  latest: string;
+  urls: {
+    latest: string;
+    versioned: string[];
+  };
+  /** Per-version size and hash, in the order of `versions` */
+  files: SchemaFile[];
 }
 
 export interface RootResponse {